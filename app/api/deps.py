@@ -1,9 +1,6 @@
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Optional
+from urllib.parse import parse_qs
+
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import LATENCY_BUCKETS, LIVE_SUM
+from app.core.security import is_admin_token
+from app.db.query_timing import current_request, finish_request, start_request
+from app.services.profiling import RequestProfiler, trace_store
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+requests_total = Counter(
+    "http_requests_total", "Requests served, by method, route template and status.",
+    ["method", "route", "status"])
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time until the response was sent, by route template.",
+    ["method", "route"], buckets=LATENCY_BUCKETS)
+requests_in_progress = Gauge(
+    "http_requests_in_progress", "Requests being served.", ["method"],
+    multiprocess_mode=LIVE_SUM)
+
+
+class MetricsMiddleware:
+    """Records latency, status and database time of every HTTP request.
+
+    Requests are labelled with their route template (``/words/{word_id}``),
+    so the number of series stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        queries = start_request(scope)
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = requests_in_progress.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            route = queries.route
+            request_duration.labels(method, route).observe(time.perf_counter() - started)
+            requests_total.labels(method, route, str(status)).inc()
+            finish_request(queries)
+
+
+class ProfilingMiddleware:
+    """Profiles single requests and stores the traces in ``trace_store``.
+
+    A request is profiled when an admin sends ``X-Profile: 1`` or
+    ``?profile=1``, or when it is picked at PROFILING_SAMPLE_RATE. Its trace
+    id is returned in X-Profile-Id. One request per worker is profiled at a
+    time; triggers arriving meanwhile are served unprofiled. Only installed
+    when PROFILING_ENABLED is set.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._busy = False
+
+    async def _trigger(self, scope: Scope) -> Optional[str]:
+        headers = Headers(scope=scope)
+        requested = headers.get(PROFILE_HEADER) == "1"
+        if not requested and f"{PROFILE_QUERY_PARAM}=".encode() in scope["query_string"]:
+            query = parse_qs(scope["query_string"].decode("latin-1"))
+            requested = query.get(PROFILE_QUERY_PARAM) == ["1"]
+        if requested:
+            scheme, _, token = headers.get("authorization", "").partition(" ")
+            if scheme.lower() == "bearer" and await is_admin_token(token):
+                return "requested"
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._busy:
+            await self.app(scope, receive, send)
+            return
+        trigger = await self._trigger(scope)
+        if trigger is None or self._busy:
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        trace_id = trace_store.new_id()
+        status = 500
+        queries = current_request() or start_request(scope)
+        queries.timeline = []
+        queries.timeline_origin = started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", []).append(
+                    (PROFILE_ID_HEADER.lower().encode(), trace_id.encode()))
+            await send(message)
+
+        profiler = RequestProfiler()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            duration = time.perf_counter() - started
+            self._busy = False
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope["query_string"].decode("latin-1"),
+                "route": queries.route,
+                "status": status,
+                "trigger": trigger,
+                "profiler": profiler.kind,
+                "created_at": datetime.utcnow().isoformat(),
+                "duration_ms": round(duration * 1000, 3),
+                "db_ms": round(sum(query["duration_ms"] for query in queries.timeline), 3),
+                "queries": len(queries.timeline),
+                "sql": queries.timeline,
+            }
+            queries.timeline = None
+            try:
+                await asyncio.to_thread(trace_store.store, trace_id, meta, profiler)
+            except Exception:
+                logger.exception("Failed to store profile %s", trace_id)
@@ -0,0 +1,53 @@
+from typing import Dict, Optional
+
+import orjson
+from fastapi import FastAPI, Request, Response
+from starlette.routing import Route
+
+from app.core.compression import brotli_available, choose_encoding, compress
+from app.core.conditional import etag_for, is_not_modified
+
+CACHE_CONTROL = "public, max-age=300"
+
+
+class OpenAPICache:
+    """The app's OpenAPI schema, encoded and compressed once.
+
+    The schema only changes with a deploy, so it is built on the first
+    request and kept in every encoding a client may ask for.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self.etag: Optional[str] = None
+        self.bodies: Dict[Optional[str], bytes] = {}
+
+    def _build(self) -> None:
+        schema = self.app.openapi()
+        body = orjson.dumps(schema)
+        bodies = {None: body, "gzip": compress(body, "gzip")}
+        if brotli_available():
+            bodies["br"] = compress(body, "br")
+        self.etag = etag_for(schema)
+        self.bodies = bodies
+
+    async def respond(self, request: Request) -> Response:
+        if not self.bodies:
+            self._build()
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        if is_not_modified(request, self.etag, None):
+            return Response(status_code=304, headers=headers)
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(self.bodies[encoding], media_type="application/json", headers=headers)
+
+
+def install_openapi_cache(app: FastAPI) -> None:
+    """Replace FastAPI's /openapi.json route, which re-encodes the schema
+    on every request, with an OpenAPICache."""
+    app.router.routes = [
+        route for route in app.router.routes
+        if not (isinstance(route, Route) and route.path == app.openapi_url)
+    ]
+    app.add_route(app.openapi_url, OpenAPICache(app).respond, include_in_schema=False)
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+import tempfile
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from app.core.security import Principal, get_current_admin
+from app.services.autocomplete import autocomplete_index
+from app.services.dictionary_cache import dictionary_cache
+from app.services.profiling import trace_store
+from app.services.dictionary_import import (
+    IMPORT_BATCH_SIZE,
+    ConflictAction,
+    ImportFormat,
+    import_dictionary,
+    open_text,
+)
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"]
+)
+
+# Uploads larger than this are spooled to a temporary file
+UPLOAD_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@router.post("/dictionary/import")
+async def import_dictionary_entries(
+    request: Request,
+    format: ImportFormat = ImportFormat.CSV,
+    on_conflict: ConflictAction = ConflictAction.UPDATE,
+    language: Optional[str] = Query(
+        None, description="Language for records that do not name one"),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=100, le=50000),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """Bulk upsert dictionary entries from the raw request body.
+
+    The body is CSV (header with text, meaning, language and optionally
+    example, pronunciation, difficulty), JSONL with the same keys, or a
+    wiktextract/kaikki.org Wiktionary dump; it may be gzipped. Entries are
+    matched on (text, language). Progress is streamed as NDJSON, one line
+    per batch, ending with the full report.
+    """
+    upload = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+    async for chunk in request.stream():
+        # Past UPLOAD_SPOOL_BYTES every write goes to disk
+        await asyncio.to_thread(upload.write, chunk)
+    upload.seek(0)
+
+    async def progress():
+        with open_text(upload) as source:
+            async for report in import_dictionary(
+                    source, format, on_conflict, language, batch_size):
+                if report.done:
+                    await dictionary_cache.invalidate()
+                    await autocomplete_index.load()
+                    yield json.dumps(report.as_dict()).encode() + b"\n"
+                else:
+                    # Rejected row samples are only sent with the final report
+                    summary = {
+                        key: value
+                        for key, value in report.as_dict().items()
+                        if key != "rejected_rows"
+                    }
+                    yield json.dumps(summary).encode() + b"\n"
+
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
+
+@router.get("/profiles")
+def list_profiles(current_user: Principal = Depends(get_current_admin)) -> List[dict]:
+    """List the stored request profiles, newest first.
+
+    Requests are profiled when PROFILING_ENABLED is set and an admin sends
+    `X-Profile: 1` (or `?profile=1`), or when sampled.
+    """
+    return trace_store.list()
+
+
+@router.get("/profiles/{trace_id}")
+def get_profile_trace(trace_id: str, current_user: Principal = Depends(get_current_admin)):
+    """Get a profile's request details, SQL timeline and text summary."""
+    meta = trace_store.get(trace_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return meta
+
+
+@router.get("/profiles/{trace_id}/download")
+def download_profile(trace_id: str, current_user: Principal = Depends(get_current_admin)):
+    """Download the profile: pyinstrument HTML, or cProfile stats for
+    pstats/snakeviz."""
+    path = trace_store.profile_path(trace_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "text/html" if path.endswith(".html") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
@@ -1,11 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.db.models.user import User
+from app.db.models.profile import Profile
 from app.db.schemas.user import UserCreate, UserRead, Token
-from app.core.security import get_password_hash, verify_password, create_access_token, get_current_user
+from app.core.security import (
+    Principal,
+    create_access_token,
+    get_current_user,
+    hash_password_async,
+    invalidate_principal,
+    principal_claims,
+    verify_and_update_password,
+)
 
 router = APIRouter(
     prefix="/auth",
@@ -19,8 +29,8 @@ router = APIRouter(
 
 
 @router.post("/signup", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def signup(data: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == data.email).first()
+async def signup(data: UserCreate, db: AsyncSession = Depends(get_db)):
+    existing = await db.scalar(select(User).where(User.email == data.email))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -29,18 +39,34 @@ def signup(data: UserCreate, db: Session = Depends(get_db)):
                 "field": "email"
             }
         )
+    # Return the connection to the pool while the password is being hashed
+    await db.commit()
+
     user = User(email=data.email,
-                hashed_password=get_password_hash(data.password))
+                hashed_password=await hash_password_async(data.password))
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_principal(user.id)
     return UserRead(id=user.id, email=user.email)
 
 
 @router.post("/signin", response_model=Token)
-def signin(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def signin(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    row = (await db.execute(
+        select(User, Profile.id)
+        .outerjoin(Profile, Profile.user_id == User.id)
+        .where(User.email == form_data.username)
+    )).first()
+    user, profile_id = row if row else (None, None)
+    # Return the connection to the pool while the hash is being checked
+    await db.commit()
+
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await verify_and_update_password(
+            form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={
@@ -48,10 +74,16 @@ def signin(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depen
                 "field": "password" if user else "email"
             }
         )
-    token = create_access_token(str(user.id))
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS; upgrade it
+        user.hashed_password = new_hash
+        await db.commit()
+
+    token = create_access_token(
+        str(user.id), claims=principal_claims(user.email, profile_id))
     return Token(access_token=token)
 
 
 @router.get("/profile", response_model=UserRead)
-def get_profile(current_user: User = Depends(get_current_user)):
+async def get_profile(current_user: Principal = Depends(get_current_user)):
     return UserRead(id=current_user.id, email=current_user.email)
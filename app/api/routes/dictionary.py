@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.core.security import get_current_user
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Literal, Optional
+from app.core.conditional import (
+    etag_for, http_date, is_not_modified, not_modified_response, validator_headers)
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER, Keyset
+from app.core.security import Principal, get_current_user
+from app.core.serialization import FIELDS_QUERY, fields_key, parse_fields
+from app.db.query_counter import query_budget
 from app.db.session import get_db
 from app.db.models.dictionary import Dictionary
-from app.db.models.user import User
-from app.db.schemas.word import DictionaryCreate, DictionaryRead
+from app.db.models.word import Word
+from app.db.schemas.word import AutocompleteItem, DictionaryCreate, DictionaryRead, SearchResults
+from app.services.autocomplete import MAX_LIMIT, autocomplete_index, prefix_query
+from app.services.dictionary_cache import DictionaryCache, dictionary_cache
+from app.services.search import SearchMode, contains, search_dictionary
 
 router = APIRouter(
     prefix="/dictionary",
@@ -13,17 +25,38 @@ router = APIRouter(
 )
 
 
+def _cacheable(body: Any, last_modified: Optional[datetime], **extra) -> dict:
+    return {
+        "body": body,
+        "etag": etag_for(body),
+        "last_modified": http_date(last_modified),
+        **extra,
+    }
+
+
+def _conditional_response(request: Request, cached: dict, **headers: str) -> Response:
+    """Send ``cached``, or 304 when the client's copy is still current."""
+    headers = {
+        **validator_headers(cached["etag"], cached["last_modified"],
+                            settings.DICTIONARY_HTTP_MAX_AGE),
+        **headers,
+    }
+    if is_not_modified(request, cached["etag"], cached["last_modified"]):
+        return not_modified_response(headers)
+    return ORJSONResponse(content=cached["body"], headers=headers)
+
+
 @router.post("", response_model=DictionaryRead, status_code=status.HTTP_201_CREATED)
-def create_dictionary_entry(
+async def create_dictionary_entry(
     entry: DictionaryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new dictionary entry."""
-    existing = db.query(Dictionary).filter(
+    existing = await db.scalar(select(Dictionary).where(
         Dictionary.text == entry.text,
         Dictionary.language == entry.language
-    ).first()
+    ))
 
     if existing:
         raise HTTPException(
@@ -33,65 +66,161 @@ def create_dictionary_entry(
 
     db_entry = Dictionary(**entry.model_dump())
     db.add(db_entry)
-    db.commit()
-    db.refresh(db_entry)
+    await db.commit()
+    await db.refresh(db_entry)
+    autocomplete_index.upsert(
+        db_entry.id, db_entry.text, db_entry.language, db_entry.difficulty)
+    await dictionary_cache.invalidate(db_entry.id)
     return db_entry
 
 
-@router.get("", response_model=List[DictionaryRead])
-def list_dictionary_entries(
-    skip: int = Query(0, ge=0),
+@router.get("", response_model=List[DictionaryRead],
+            dependencies=[Depends(query_budget(1))])
+async def list_dictionary_entries(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Legacy offset paging; prefer `cursor`"),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor/X-Prev-Cursor headers"),
+    sort: Literal["text", "id"] = "text",
+    descending: bool = False,
     language: Optional[str] = None,
     search: Optional[str] = None,
     difficulty: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_db)
+):
+    """List dictionary entries with filtering and pagination.
+
+    Cursors for the neighbouring pages are returned in the X-Next-Cursor and
+    X-Prev-Cursor headers. Responses carry an ETag and are cached; send
+    If-None-Match to get 304 when the page is unchanged. `fields` limits the
+    response to the listed fields.
+    """
+    include = parse_fields(fields, DictionaryRead)
+    sort_column = Dictionary.text if sort == "text" else Dictionary.id
+    keyset = Keyset(sort, sort_column, Dictionary.id, descending=descending)
+    page_cursor = keyset.decode(cursor)
+
+    async def load():
+        query = select(Dictionary)
+        if language:
+            query = query.where(Dictionary.language == language)
+        if search:
+            query = query.where(contains(Dictionary.text, search))
+        if difficulty:
+            query = query.where(Dictionary.difficulty == difficulty)
+
+        query = keyset.apply(query, page_cursor, limit)
+        if skip and not page_cursor:
+            query = query.offset(skip)
+        result = await db.scalars(query)
+        entries, next_cursor, prev_cursor = keyset.page(
+            result.all(), page_cursor, limit, has_previous=skip > 0)
+        return _cacheable(
+            [DictionaryRead.model_validate(entry).model_dump(mode="json", include=include)
+             for entry in entries],
+            # No Last-Modified: deleting an entry changes the page without
+            # raising the newest updated_at, so only the ETag is reliable
+            None,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    key = DictionaryCache.list_key({
+        "skip": skip, "limit": limit, "cursor": cursor, "sort": sort,
+        "descending": descending, "language": language, "search": search,
+        "difficulty": difficulty, "fields": fields_key(include),
+    })
+    cached = await dictionary_cache.get(key, load, versioned=True)
+    headers = {}
+    if cached["next_cursor"]:
+        headers[NEXT_CURSOR_HEADER] = cached["next_cursor"]
+    if cached["prev_cursor"]:
+        headers[PREV_CURSOR_HEADER] = cached["prev_cursor"]
+    return _conditional_response(request, cached, **headers)
+
+
+@router.get("/search", response_model=SearchResults)
+async def search_dictionary_entries(
+    q: str = Query(..., min_length=1, max_length=200),
+    mode: SearchMode = Query(
+        SearchMode.FULLTEXT,
+        description="fulltext: ranked match over text, meaning and example; "
+                    "substring: text contains q; fuzzy: typo-tolerant match on text"),
+    language: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
 ):
-    """List dictionary entries with filtering and pagination."""
-    query = db.query(Dictionary)
+    """Search dictionary entries by relevance.
+
+    When nothing matches, `suggestions` lists close spellings ("did you mean").
+    """
+    return await search_dictionary(db, q, mode=mode, language=language, limit=limit)
 
-    if language:
-        query = query.filter(Dictionary.language == language)
-    if search:
-        query = query.filter(Dictionary.text.ilike(f"%{search}%"))
-    if difficulty:
-        query = query.filter(Dictionary.difficulty == difficulty)
 
-    return query.offset(skip).limit(limit).all()
+@router.get("/autocomplete", response_model=List[AutocompleteItem])
+async def autocomplete_dictionary(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    language: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_db)
+):
+    """Suggest dictionary entries starting with `prefix`.
+
+    Easier and shorter words come first. Served from memory; the database is
+    only queried while the index is still loading.
+    """
+    if autocomplete_index.ready:
+        return autocomplete_index.search(prefix, language=language, limit=limit)
+
+    return (await db.scalars(prefix_query(prefix, language, limit))).all()
 
 
 @router.get("/{entry_id}", response_model=DictionaryRead)
-def get_dictionary_entry(
+async def get_dictionary_entry(
     entry_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get a specific dictionary entry by ID."""
-    entry = db.query(Dictionary).filter(Dictionary.id == entry_id).first()
-    if not entry:
+    """Get a specific dictionary entry by ID.
+
+    Supports conditional requests via If-None-Match/If-Modified-Since.
+    """
+    async def load():
+        entry = await db.get(Dictionary, entry_id)
+        if not entry:
+            return None
+        return _cacheable(
+            DictionaryRead.model_validate(entry).model_dump(mode="json"),
+            entry.updated_at)
+
+    cached = await dictionary_cache.get(DictionaryCache.entry_key(entry_id), load)
+    if cached is None:
         raise HTTPException(
             status_code=404, detail="Dictionary entry not found")
-    return entry
+    return _conditional_response(request, cached)
 
 
 @router.put("/{entry_id}", response_model=DictionaryRead)
-def update_dictionary_entry(
+async def update_dictionary_entry(
     entry_id: int,
     entry_update: DictionaryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update a dictionary entry."""
-    entry = db.query(Dictionary).filter(Dictionary.id == entry_id).first()
+    entry = await db.get(Dictionary, entry_id)
     if not entry:
         raise HTTPException(
             status_code=404, detail="Dictionary entry not found")
 
     # Check if the update would create a duplicate
-    existing = db.query(Dictionary).filter(
+    existing = await db.scalar(select(Dictionary).where(
         Dictionary.text == entry_update.text,
         Dictionary.language == entry_update.language,
         Dictionary.id != entry_id
-    ).first()
+    ))
 
     if existing:
         raise HTTPException(
@@ -102,29 +231,33 @@ def update_dictionary_entry(
     for field, value in entry_update.model_dump().items():
         setattr(entry, field, value)
 
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
+    autocomplete_index.upsert(entry.id, entry.text, entry.language, entry.difficulty)
+    await dictionary_cache.invalidate(entry_id)
     return entry
 
 
 @router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_dictionary_entry(
+async def delete_dictionary_entry(
     entry_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a dictionary entry."""
-    entry = db.query(Dictionary).filter(Dictionary.id == entry_id).first()
+    entry = await db.get(Dictionary, entry_id)
     if not entry:
         raise HTTPException(
             status_code=404, detail="Dictionary entry not found")
 
     # Check if any words are using this dictionary entry
-    if db.query(Word).filter(Word.dictionary_id == entry_id).first():
+    if await db.scalar(select(Word.id).where(Word.dictionary_id == entry_id).limit(1)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete dictionary entry that is being used by users"
         )
 
-    db.delete(entry)
-    db.commit()
+    await db.delete(entry)
+    await db.commit()
+    autocomplete_index.remove(entry_id)
+    await dictionary_cache.invalidate(entry_id)
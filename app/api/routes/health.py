@@ -1,5 +1,9 @@
 from fastapi import APIRouter, status
 from fastapi.responses import JSONResponse
+from app.core.security import hashing_pool
+from app.db.session import get_pool_stats
+from app.services.dictionary_cache import dictionary_cache
+from app.services.practice_buffer import practice_buffer
 
 router = APIRouter(
     prefix="/health",
@@ -21,3 +25,67 @@ def health_check():
     Used for monitoring or confirming if the API is responsive.
     """
     return JSONResponse(content={"status": "OK"})
+
+
+@router.get(
+    "/pool",
+    summary="Connection pool statistics",
+    description="Returns checkout, wait and occupancy counters for the database connection pools.",
+    status_code=status.HTTP_200_OK,
+)
+def pool_stats():
+    """
+    **Connection Pool Statistics**
+
+    Used to spot pool saturation: a rising `wait_seconds_max` or any
+    `timeouts` means requests are queueing for a database connection.
+    """
+    return JSONResponse(content=get_pool_stats())
+
+
+@router.get(
+    "/hashing",
+    summary="Password hashing pool statistics",
+    description="Returns queue depth and throughput counters for the password hashing pool.",
+    status_code=status.HTTP_200_OK,
+)
+def hashing_stats():
+    """
+    **Password Hashing Statistics**
+
+    A growing `queued` or any `rejected` means sign-in traffic exceeds
+    `PASSWORD_HASH_WORKERS`.
+    """
+    return JSONResponse(content=hashing_pool.stats())
+
+
+@router.get(
+    "/cache",
+    summary="Dictionary cache statistics",
+    description="Returns hit, miss and size counters for the dictionary read cache.",
+    status_code=status.HTTP_200_OK,
+)
+def cache_stats():
+    """
+    **Dictionary Cache Statistics**
+
+    Hits and misses are per worker; `remote_errors` counts failed calls to
+    the shared tier.
+    """
+    return JSONResponse(content=dictionary_cache.stats())
+
+
+@router.get(
+    "/practice-buffer",
+    summary="Practice write-behind buffer statistics",
+    description="Returns the backlog and flush counters of the practice write-behind buffer.",
+    status_code=status.HTTP_200_OK,
+)
+def practice_buffer_stats():
+    """
+    **Practice Buffer Statistics**
+
+    `pending` counts answers on this host not yet recorded; a growing value
+    or rising `errors` means flushes are failing or falling behind.
+    """
+    return JSONResponse(content=practice_buffer.stats())
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import Response
+from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, render
+
+router = APIRouter(
+    tags=["Health"]
+)
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description="Returns request, database and pool metrics of all workers in the Prometheus text format.",
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+)
+def metrics():
+    """
+    **Prometheus Metrics**
+
+    Scraped by Prometheus. With several workers, set
+    `PROMETHEUS_MULTIPROC_DIR` so that any worker answers with the values
+    of all of them; otherwise each reports only its own.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=render(), media_type=CONTENT_TYPE)
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.security import get_current_user
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import Principal, get_current_user, invalidate_principal
 from app.db.session import get_db
 from app.db.models.profile import Profile
-from app.db.models.user import User
 from app.db.schemas.profile import ProfileCreate, ProfileRead, ProfileUpdate
 
 router = APIRouter(
@@ -13,14 +13,14 @@ router = APIRouter(
 
 
 @router.post("", response_model=ProfileRead, status_code=status.HTTP_201_CREATED)
-def create_profile(
+async def create_profile(
     profile: ProfileCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a profile for the current user."""
-    existing = db.query(Profile).filter(
-        Profile.user_id == current_user.id).first()
+    existing = await db.scalar(select(Profile).where(
+        Profile.user_id == current_user.id))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -32,19 +32,20 @@ def create_profile(
         user_id=current_user.id
     )
     db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
+    await db.commit()
+    await db.refresh(db_profile)
+    invalidate_principal(current_user.id)
     return db_profile
 
 
 @router.get("", response_model=ProfileRead)
-def get_profile(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_profile(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get the current user's profile."""
-    profile = db.query(Profile).filter(
-        Profile.user_id == current_user.id).first()
+    profile = await db.scalar(select(Profile).where(
+        Profile.user_id == current_user.id))
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,14 +55,14 @@ def get_profile(
 
 
 @router.put("", response_model=ProfileRead)
-def update_profile(
+async def update_profile(
     profile_update: ProfileUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update the current user's profile."""
-    profile = db.query(Profile).filter(
-        Profile.user_id == current_user.id).first()
+    profile = await db.scalar(select(Profile).where(
+        Profile.user_id == current_user.id))
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,6 +72,7 @@ def update_profile(
     for field, value in profile_update.model_dump(exclude_unset=True).items():
         setattr(profile, field, value)
 
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
+    invalidate_principal(current_user.id)
     return profile
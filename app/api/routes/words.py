@@ -1,172 +1,455 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 from typing import List, Optional
 from datetime import datetime
+import uuid
 
-from app.core.security import get_current_user
+from app.core.config import settings
+from app.core.pagination import Keyset, set_cursor_headers
+from app.core.serialization import FIELDS_QUERY, adapter_response, parse_fields
+from app.core.security import get_current_profile_id
+from app.db.query_counter import query_budget
 from app.db.session import get_db
+from app.db.models.dictionary import Dictionary
 from app.db.models.word import Word, DifficultyLevel
+from app.db.models.practice_rollup import PracticeDailyRollup
 from app.db.models.practice_session import PracticeSession
-from app.db.models.user import User
-from app.db.schemas.word import WordCreate, WordRead, WordUpdate, WordStats
+from app.db.schemas.word import (
+    PracticeBatch,
+    PracticeBatchResult,
+    PracticeQueued,
+    PracticeResult,
+    ProfileStatsSummary,
+    WordBulkCreateResult,
+    WordBulkDeleteResult,
+    WordBulkRequest,
+    DictionaryRead,
+    WordCreate,
+    WordRead,
+    WordStats,
+    WordStatsItem,
+    WordUpdate,
+)
+from app.services.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    arrow_available,
+    export_stream,
+    needs_arrow,
+)
+from app.services.practice import PracticeAnswer, record_practice
+from app.services.practice_buffer import practice_buffer
+from app.services.vocabulary import add_words, remove_words
+from app.services.search import contains
+from app.services.stats import (
+    profile_summary,
+    stream_word_stats_ndjson,
+    to_word_stats_item,
+    word_stats_query,
+)
 
 router = APIRouter(
     prefix="/words",
     tags=["Words"]
 )
 
+# Principal/profile lookups plus the listing itself
+LIST_QUERY_BUDGET = 4
+
+# Returned instead of the result when PRACTICE_WRITE_BEHIND is on
+QUEUED_RESPONSE = {
+    status.HTTP_202_ACCEPTED: {
+        "model": PracticeQueued,
+        "description": "Answers buffered; recorded within PRACTICE_FLUSH_INTERVAL_MS",
+    }
+}
+
+
+async def queue_practice(profile_id: uuid.UUID, answers: List[PracticeAnswer]) -> JSONResponse:
+    """Hand answers to the write-behind buffer and acknowledge them with 202.
+
+    Ownership of the words is checked when the buffer is flushed; answers
+    for unknown words are dropped then.
+    """
+    queued = await practice_buffer.enqueue(profile_id, answers)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=PracticeQueued(queued=queued).model_dump()
+    )
+
+
+WORD_LIST = TypeAdapter(List[WordRead])
+WORD_STATS_LIST = TypeAdapter(List[WordStatsItem])
+
+# Plain columns for list endpoints, named after the WordRead fields; the
+# dictionary entry's are prefixed with "entry_"
+WORD_FIELDS = [name for name in WordRead.model_fields if name != "dictionary_entry"]
+ENTRY_FIELDS = list(DictionaryRead.model_fields)
+
+
+def select_word_rows():
+    """Select the WordRead columns of words and their entries as plain rows.
+
+    Skips ORM object loading; turn the rows into payloads with word_payloads.
+    """
+    return (
+        select(
+            *(getattr(Word, name) for name in WORD_FIELDS),
+            *(getattr(Dictionary, name).label(f"entry_{name}") for name in ENTRY_FIELDS),
+        )
+        .join(Word.dictionary_entry)
+    )
+
+
+def word_payloads(rows) -> List[dict]:
+    """WordRead-shaped dicts from select_word_rows rows, for WORD_LIST."""
+    return [
+        {
+            **{name: getattr(row, name) for name in WORD_FIELDS},
+            "dictionary_entry": {name: getattr(row, f"entry_{name}") for name in ENTRY_FIELDS},
+        }
+        for row in rows
+    ]
+
+
+def select_words_with_entry():
+    """Select words together with their dictionary entry in a single JOIN."""
+    return (
+        select(Word)
+        .join(Word.dictionary_entry)
+        .options(contains_eager(Word.dictionary_entry))
+    )
+
+
+async def get_owned_word(db: AsyncSession, word_id: int, profile_id: uuid.UUID) -> Word:
+    """Load a word owned by the given profile, or raise 404."""
+    word = await db.scalar(
+        select_words_with_entry()
+        .where(Word.id == word_id, Word.profile_id == profile_id)
+        .execution_options(populate_existing=True)
+    )
+    if not word:
+        raise HTTPException(status_code=404, detail="Word not found")
+    return word
+
 
 @router.post("", response_model=WordRead, status_code=status.HTTP_201_CREATED)
-def create_word(
+async def create_word(
     word: WordCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
 ):
     """Create a new word for the current user."""
+    async def already_added() -> bool:
+        return bool(await db.scalar(select(Word.id).where(
+            Word.profile_id == profile_id,
+            Word.dictionary_id == word.dictionary_id)))
+
+    duplicate = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Word is already in your vocabulary"
+    )
+    if await already_added():
+        raise duplicate
+
     db_word = Word(
         **word.model_dump(),
-        user_id=current_user.id
+        profile_id=profile_id
     )
     db.add(db_word)
-    db.commit()
-    db.refresh(db_word)
-    return db_word
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request added the same word after the check above
+        await db.rollback()
+        if await already_added():
+            raise duplicate
+        raise
+    return await get_owned_word(db, db_word.id, profile_id)
 
 
-@router.get("", response_model=List[WordRead])
-def list_words(
-    skip: int = Query(0, ge=0),
+@router.get("", response_model=List[WordRead],
+            dependencies=[Depends(query_budget(LIST_QUERY_BUDGET))])
+async def list_words(
+    skip: int = Query(0, ge=0, description="Legacy offset paging; prefer `cursor`"),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor/X-Prev-Cursor headers"),
+    descending: bool = False,
     difficulty: Optional[DifficultyLevel] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
 ):
-    """List words for the current user with filtering and pagination."""
-    query = db.query(Word).filter(Word.user_id == current_user.id)
+    """List words for the current user with filtering and pagination.
+
+    Ordered by creation time; cursors for the neighbouring pages are
+    returned in the X-Next-Cursor and X-Prev-Cursor headers. `fields`
+    limits the response to the listed fields.
+    """
+    include = parse_fields(fields, WordRead)
+    keyset = Keyset(
+        "created_at", Word.created_at, Word.id,
+        descending=descending, parse_key=datetime.fromisoformat)
+    page_cursor = keyset.decode(cursor)
+    query = select_word_rows().where(Word.profile_id == profile_id)
 
     if difficulty:
-        query = query.filter(Word.difficulty == difficulty)
+        query = query.where(Dictionary.difficulty == difficulty)
     if search:
-        query = query.filter(Word.text.ilike(f"%{search}%"))
+        query = query.where(contains(Dictionary.text, search))
+
+    query = keyset.apply(query, page_cursor, limit)
+    if skip and not page_cursor:
+        query = query.offset(skip)
+    result = await db.execute(query)
+    rows, next_cursor, prev_cursor = keyset.page(
+        result.all(), page_cursor, limit, has_previous=skip > 0)
+    response = adapter_response(WORD_LIST, word_payloads(rows), include=include)
+    set_cursor_headers(response, next_cursor, prev_cursor)
+    return response
+
+
+@router.get("/due", response_model=List[WordRead],
+            dependencies=[Depends(query_budget(LIST_QUERY_BUDGET))])
+async def list_due_words(
+    limit: int = Query(20, ge=1, le=100),
+    due_before: Optional[datetime] = Query(
+        None, description="Defaults to now; pass a future time to review ahead"),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
+):
+    """List the next words due for review, most overdue first."""
+    include = parse_fields(fields, WordRead)
+    query = (
+        select_word_rows()
+        .where(
+            Word.profile_id == profile_id,
+            Word.due_at <= (due_before or datetime.utcnow())
+        )
+        .order_by(Word.due_at, Word.id)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return adapter_response(WORD_LIST, word_payloads(result), include=include)
+
+
+@router.get("/stats", response_model=List[WordStatsItem],
+            dependencies=[Depends(query_budget(LIST_QUERY_BUDGET))])
+async def list_word_stats(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    difficulty: Optional[DifficultyLevel] = None,
+    stream: bool = Query(
+        False, description="Stream every matching word as NDJSON, ignoring skip/limit"),
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
+):
+    """Get practice statistics for many words in one query."""
+    if stream:
+        return StreamingResponse(
+            stream_word_stats_ndjson(profile_id, difficulty),
+            media_type="application/x-ndjson"
+        )
+
+    rows = await db.execute(
+        word_stats_query(profile_id, difficulty).offset(skip).limit(limit))
+    return adapter_response(
+        WORD_STATS_LIST, [to_word_stats_item(row) for row in rows], validate=False)
+
+
+@router.get("/stats/summary", response_model=ProfileStatsSummary)
+async def get_stats_summary(
+    days: int = Query(30, ge=1, le=366, description="Length of the daily activity histogram"),
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
+):
+    """Get profile-level practice rollups for dashboards."""
+    return await profile_summary(db, profile_id, days)
+
+
+@router.get("/export")
+async def export_words(
+    format: ExportFormat = ExportFormat.NDJSON,
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
+):
+    """Export every word with its practice history.
+
+    NDJSON nests the practice sessions in each word; CSV, Parquet and Arrow
+    are flat with one row per practice session. The export is streamed from
+    a single read-only snapshot, so it is consistent however long it takes.
+    """
+    if needs_arrow(format) and not arrow_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{format.value} export requires the pyarrow package"
+        )
+    filename = f"words-{datetime.utcnow():%Y%m%d}.{format.value}"
+    return StreamingResponse(
+        export_stream(profile_id, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/practice/batch", response_model=PracticeBatchResult, responses=QUEUED_RESPONSE)
+async def practice_words_batch(
+    batch: PracticeBatch,
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
+):
+    """Record many practice answers in one transaction.
+
+    Meant for clients that queue answers offline. Answers for unknown words
+    are skipped and returned in `rejected_word_ids`.
+    """
+    answers = [PracticeAnswer(**item.model_dump()) for item in batch.items]
+    if settings.PRACTICE_WRITE_BEHIND:
+        return await queue_practice(profile_id, answers)
+    outcome = await record_practice(db, profile_id, answers)
+    await db.commit()
+    return PracticeBatchResult(
+        recorded=outcome.recorded,
+        rejected_word_ids=outcome.rejected_word_ids
+    )
 
-    return query.offset(skip).limit(limit).all()
+
+@router.post("/bulk", response_model=WordBulkCreateResult)
+async def create_words_bulk(
+    request: WordBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
+):
+    """Add many dictionary entries to the vocabulary at once.
+
+    Entries already in the vocabulary are skipped, unknown ones reported.
+    """
+    outcome = await add_words(db, profile_id, request.dictionary_ids)
+    await db.commit()
+    return WordBulkCreateResult(
+        created=outcome.created,
+        skipped=outcome.skipped,
+        not_found=outcome.not_found
+    )
+
+
+@router.delete("/bulk", response_model=WordBulkDeleteResult)
+async def delete_words_bulk(
+    request: WordBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
+):
+    """Remove many dictionary entries, and their practice history, from the vocabulary."""
+    outcome = await remove_words(db, profile_id, request.dictionary_ids)
+    await db.commit()
+    return WordBulkDeleteResult(
+        deleted=outcome.deleted,
+        skipped=outcome.skipped
+    )
 
 
 @router.get("/{word_id}", response_model=WordRead)
-def get_word(
+async def get_word(
     word_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
 ):
     """Get a specific word by ID."""
-    word = db.query(Word).filter(
-        Word.id == word_id,
-        Word.user_id == current_user.id
-    ).first()
-    if not word:
-        raise HTTPException(status_code=404, detail="Word not found")
-    return word
+    return await get_owned_word(db, word_id, profile_id)
 
 
 @router.put("/{word_id}", response_model=WordRead)
-def update_word(
+async def update_word(
     word_id: int,
     word_update: WordUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
 ):
     """Update a word."""
-    word = db.query(Word).filter(
-        Word.id == word_id,
-        Word.user_id == current_user.id
-    ).first()
-    if not word:
-        raise HTTPException(status_code=404, detail="Word not found")
+    word = await get_owned_word(db, word_id, profile_id)
 
     for field, value in word_update.model_dump(exclude_unset=True).items():
         setattr(word, field, value)
 
-    db.commit()
-    db.refresh(word)
-    return word
+    await db.commit()
+    return await get_owned_word(db, word_id, profile_id)
 
 
 @router.delete("/{word_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_word(
+async def delete_word(
     word_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
 ):
     """Delete a word."""
-    word = db.query(Word).filter(
-        Word.id == word_id,
-        Word.user_id == current_user.id
-    ).first()
-    if not word:
-        raise HTTPException(status_code=404, detail="Word not found")
+    word = await get_owned_word(db, word_id, profile_id)
 
-    db.delete(word)
-    db.commit()
+    await db.execute(delete(PracticeSession).where(PracticeSession.word_id == word.id))
+    await db.execute(delete(PracticeDailyRollup).where(PracticeDailyRollup.word_id == word.id))
+    await db.execute(delete(Word).where(Word.id == word.id))
+    await db.commit()
 
 
 @router.get("/{word_id}/stats", response_model=WordStats)
-def get_word_stats(
+async def get_word_stats(
     word_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
 ):
     """Get practice statistics for a word."""
-    word = db.query(Word).filter(
+    stats = (await db.execute(select(
+        Word.total_practices,
+        Word.correct_answers,
+        Word.last_practiced_at,
+        Word.streak
+    ).where(
         Word.id == word_id,
-        Word.user_id == current_user.id
-    ).first()
-    if not word:
+        Word.profile_id == profile_id
+    ))).first()
+    if not stats:
         raise HTTPException(status_code=404, detail="Word not found")
 
-    stats = db.query(
-        func.count(PracticeSession.id).label("total_practices"),
-        func.sum(func.cast(PracticeSession.correct, Integer)
-                 ).label("correct_answers"),
-        func.max(PracticeSession.created_at).label("last_practiced")
-    ).filter(
-        PracticeSession.word_id == word_id,
-        PracticeSession.user_id == current_user.id
-    ).first()
-
-    total = stats[0] or 0
-    correct = stats[1] or 0
+    total = stats.total_practices
+    correct = stats.correct_answers
     success_rate = (correct / total * 100) if total > 0 else 0.0
 
     return WordStats(
         total_practices=total,
         correct_answers=correct,
         success_rate=success_rate,
-        last_practiced=stats[2]
+        last_practiced=stats.last_practiced_at,
+        streak=stats.streak
     )
 
 
-@router.post("/{word_id}/practice")
-def practice_word(
+@router.post("/{word_id}/practice", response_model=PracticeResult, responses=QUEUED_RESPONSE)
+async def practice_word(
     word_id: int,
     correct: bool,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    quality: Optional[int] = Query(
+        None, ge=0, le=5, description="SM-2 answer grade; derived from `correct` when omitted"),
+    db: AsyncSession = Depends(get_db),
+    profile_id: uuid.UUID = Depends(get_current_profile_id)
 ):
-    """Record a practice session for a word."""
-    word = db.query(Word).filter(
-        Word.id == word_id,
-        Word.user_id == current_user.id
-    ).first()
-    if not word:
+    """Record a practice session for a word and reschedule its next review."""
+    answers = [PracticeAnswer(word_id=word_id, correct=correct, quality=quality)]
+    if settings.PRACTICE_WRITE_BEHIND:
+        return await queue_practice(profile_id, answers)
+    outcome = await record_practice(db, profile_id, answers)
+    if not outcome.recorded:
         raise HTTPException(status_code=404, detail="Word not found")
+    await db.commit()
 
-    practice = PracticeSession(
-        word_id=word_id,
-        user_id=current_user.id,
-        correct=correct
+    word = outcome.words[word_id]
+    return PracticeResult(
+        due_at=word.due_at,
+        interval_days=word.interval_days,
+        ease_factor=word.ease_factor
     )
-    db.add(practice)
-    db.commit()
-    return {"status": "success"}
@@ -0,0 +1,104 @@
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency; gzip only without it
+    brotli = None
+
+
+def brotli_available() -> bool:
+    return brotli is not None and settings.COMPRESSION_BROTLI
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick ``br`` or ``gzip`` from an Accept-Encoding header, preferring
+    brotli when it is available; None means send the body as is."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        name, _, value = params.strip().partition("=")
+        try:
+            quality = float(value) if name.strip() == "q" else 1.0
+        except ValueError:
+            quality = 1.0
+        # "gzip;q=0" explicitly refuses gzip
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    if "br" in accepted and brotli_available():
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+class GZipResponder(IdentityResponder):
+    content_encoding = "gzip"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, compresslevel: int):
+        super().__init__(app, minimum_size)
+        # wbits=31: a deflate stream wrapped in a gzip header and trailer
+        self.compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if not more_body:
+            return self.compressor.compress(body) + self.compressor.flush()
+        # Starlette's GZipResponder holds streamed chunks back in the
+        # compressor until the stream ends; a sync flush sends each one now
+        return self.compressor.compress(body) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if not more_body:
+            return self.compressor.process(body) + self.compressor.finish()
+        # Flushed so each streamed chunk reaches the client right away
+        return self.compressor.process(body) + self.compressor.flush()
+
+
+class CompressionMiddleware:
+    """Compresses responses of at least ``minimum_size`` bytes with brotli
+    or gzip, whichever the client accepts (brotli needs the optional
+    ``brotli`` package). Each chunk of a streaming response is flushed to
+    the client as soon as it is sent; responses that already carry a
+    Content-Encoding are left alone.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding == "br":
+            responder = BrotliResponder(
+                self.app, self.minimum_size, settings.COMPRESSION_BROTLI_QUALITY)
+        elif encoding == "gzip":
+            responder = GZipResponder(
+                self.app, self.minimum_size, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
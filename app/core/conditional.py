@@ -0,0 +1,61 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response, status
+
+
+def etag_for(payload: Any) -> str:
+    """Weak validator derived from the JSON representation of ``payload``."""
+    raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    return f'W/"{hashlib.blake2b(raw, digest_size=12).hexdigest()}"'
+
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are the same validator
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since (RFC 9110)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[str], max_age: int) -> dict:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from prometheus_client import Counter, Gauge
+
+from app.core.metrics import LIVE_SUM
+
+T = TypeVar("T")
+
+hash_queued = Gauge(
+    "password_hash_queued", "Password hashing jobs waiting for a thread.",
+    multiprocess_mode=LIVE_SUM)
+hash_in_flight = Gauge(
+    "password_hash_in_flight", "Password hashing jobs running.", multiprocess_mode=LIVE_SUM)
+hash_rejected = Counter("password_hash_rejected_total", "Password hashing jobs rejected.")
+
+
+class HashingPoolFull(Exception):
+    """Raised when too many password hashing jobs are already waiting."""
+
+
+class HashingPool:
+    """Bounded thread pool for CPU-heavy password hashing.
+
+    bcrypt releases the GIL while it works, so running it on a few threads
+    keeps the event loop serving other requests during a login burst.
+    ``workers`` caps how many hashes run at once and ``max_queue`` caps how
+    many may wait; beyond that callers are rejected instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = self._new_executor()
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+    def _run(self, submitted_at: float, fn: Callable[..., T], args: tuple) -> T:
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+            self.queue_seconds_max = max(
+                self.queue_seconds_max, started - submitted_at)
+        hash_queued.dec()
+        hash_in_flight.inc()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.hash_seconds_total += time.perf_counter() - started
+            hash_in_flight.dec()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                hash_rejected.inc()
+                raise HashingPoolFull()
+            self.queued += 1
+        hash_queued.inc()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._run, time.perf_counter(), fn, args)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_seconds_max": round(self.queue_seconds_max, 6),
+                "hash_seconds_avg": round(self.hash_seconds_total / self.completed, 6)
+                if self.completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Wait for the queued and running hashes to finish.
+
+        Blocks; call it from a thread. Jobs submitted later get a new
+        executor, so the pool can serve another app lifespan.
+        """
+        executor, self._executor = self._executor, self._new_executor()
+        executor.shutdown(wait=True)
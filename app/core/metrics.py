@@ -0,0 +1,36 @@
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client import multiprocess
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Seconds; covers cached reads (~1 ms) up to requests near the statement timeout
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+# Gauges of a worker count until it stops; /metrics reports their sum
+LIVE_SUM = "livesum"
+
+
+def multiprocess_dir() -> str:
+    """The directory workers share their values through, or "" when each
+    process reports only its own. prometheus_client reads the variable when
+    it is imported, so it must be set before the workers start."""
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+
+def render() -> bytes:
+    """Metrics in the Prometheus text format, summed over every worker in
+    multiprocess mode."""
+    if not multiprocess_dir():
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def worker_stopped() -> None:
+    """Drop the live gauges of this worker when it shuts down."""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
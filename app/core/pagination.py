@@ -0,0 +1,140 @@
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+
+@dataclass
+class Cursor:
+    sort: str
+    descending: bool
+    key: Any
+    id: int
+    backwards: bool
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload = [cursor.sort, cursor.descending, cursor.key, cursor.id, cursor.backwards]
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        sort, descending, key, id_, backwards = json.loads(raw)
+        return Cursor(sort, bool(descending), key, int(id_), bool(backwards))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+class Keyset:
+    """Cursor pagination over a ``(sort_column, id_column)`` ordering.
+
+    Pages are fetched with a row comparison on the composite key, so with a
+    matching index every page costs the same as the first one. Cursors are
+    opaque to clients and are returned in the X-Next-Cursor and
+    X-Prev-Cursor response headers.
+    """
+
+    def __init__(
+        self,
+        sort: str,
+        sort_column,
+        id_column,
+        descending: bool = False,
+        parse_key: Callable[[Any], Any] = lambda value: value,
+        row_key: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.sort = sort
+        self.sort_column = sort_column
+        self.id_column = id_column
+        self.descending = descending
+        self.parse_key = parse_key
+        self.row_key = row_key or (lambda row: getattr(row, sort_column.key))
+
+    def decode(self, value: Optional[str]) -> Optional[Cursor]:
+        if not value:
+            return None
+        cursor = decode_cursor(value)
+        if cursor.sort != self.sort or cursor.descending != self.descending:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the requested sort order"
+            )
+        try:
+            cursor.key = self.parse_key(cursor.key)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        return cursor
+
+    def apply(self, query: Select, cursor: Optional[Cursor], limit: int) -> Select:
+        """Order, seek and limit ``query``; fetches one extra row to detect more pages."""
+        # Walking backwards reverses the scan and flips the page afterwards
+        reverse = cursor.backwards if cursor else False
+        scan_descending = self.descending != reverse
+
+        if cursor:
+            key = tuple_(self.sort_column, self.id_column)
+            bound = tuple_(cursor.key, cursor.id)
+            query = query.where(key < bound if scan_descending else key > bound)
+
+        if scan_descending:
+            query = query.order_by(self.sort_column.desc(), self.id_column.desc())
+        else:
+            query = query.order_by(self.sort_column.asc(), self.id_column.asc())
+        return query.limit(limit + 1)
+
+    def _cursor_for(self, row, backwards: bool) -> str:
+        return encode_cursor(Cursor(
+            sort=self.sort,
+            descending=self.descending,
+            key=self.row_key(row),
+            id=row.id,
+            backwards=backwards,
+        ))
+
+    def page(
+        self,
+        rows: Sequence[Any],
+        cursor: Optional[Cursor],
+        limit: int,
+        has_previous: bool = False,
+    ) -> Tuple[List[Any], Optional[str], Optional[str]]:
+        """Trim the look-ahead row and build ``(items, next_cursor, prev_cursor)``."""
+        rows = list(rows)
+        has_more = len(rows) > limit
+        items = rows[:limit]
+        backwards = cursor.backwards if cursor else False
+        if backwards:
+            items.reverse()
+        if not items:
+            return items, None, None
+
+        if backwards:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, cursor is not None or has_previous
+        next_cursor = self._cursor_for(items[-1], backwards=False) if has_next else None
+        prev_cursor = self._cursor_for(items[0], backwards=True) if has_prev else None
+        return items, next_cursor, prev_cursor
+
+
+def set_cursor_headers(response: Response, next_cursor: Optional[str], prev_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if prev_cursor:
+        response.headers[PREV_CURSOR_HEADER] = prev_cursor
@@ -3,18 +3,52 @@ from datetime import datetime, timedelta
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.hashing import HashingPool, HashingPoolFull
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
 from app.db.models.user import User
-from typing import Optional
+from app.db.models.profile import Profile
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import uuid
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with a different cost than BCRYPT_ROUNDS report needs_update,
+# so they are re-hashed on the next successful sign-in.
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+hashing_pool = HashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
 ALGORITHM = "HS256"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/signin")
 
 
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, resolved from a token without ORM state."""
+    id: uuid.UUID
+    email: str
+    profile_id: Optional[uuid.UUID] = None
+    is_admin: bool = False
+
+
+# user id -> Principal
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    """Drop a cached principal after its user or profile changed."""
+    principal_cache.invalidate(user_id)
+
+
 def get_password_hash(password: str) -> str:
     """Generate password hash using bcrypt."""
     return pwd_context.hash(password)
@@ -25,19 +59,64 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
-def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent sign-in requests, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hashing pool instead of the event loop."""
+    try:
+        return await hashing_pool.run(get_password_hash, password)
+    except HashingPoolFull:
+        raise _hashing_busy()
+
+
+async def verify_and_update_password(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password on the hashing pool.
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is set when the stored hash
+    was made with outdated settings and should be replaced.
+    """
+    try:
+        return await hashing_pool.run(pwd_context.verify_and_update, plain, hashed)
+    except HashingPoolFull:
+        raise _hashing_busy()
+
+
+def create_access_token(
+    subject: str,
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None
+) -> str:
     """Create JWT access token."""
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode = {"sub": subject, "exp": expire, "type": "access"}
+    to_encode = {**(claims or {}), "sub": subject, "exp": expire, "type": "access"}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 
+def principal_claims(email: str, profile_id: Optional[uuid.UUID]) -> Dict[str, Any]:
+    """Extra token claims that let get_current_user skip the users lookup."""
+    claims = {"email": email}
+    if profile_id:
+        claims["pid"] = str(profile_id)
+    return claims
+
+
 def decode_token(token: str) -> str:
     """Decode and verify JWT token."""
+    return decode_token_payload(token)["sub"]
+
+
+def decode_token_payload(token: str) -> Dict[str, Any]:
+    """Decode and verify JWT token, returning all of its claims."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY,
                              algorithms=[ALGORITHM])
@@ -47,14 +126,14 @@ def decode_token(token: str) -> str:
                 detail="Invalid token type",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return payload["sub"]
+        return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except jwt.JWTError:
+    except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -62,17 +141,105 @@ def decode_token(token: str) -> str:
         )
 
 
+def _credentials_exception(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def _load_principal(db: AsyncSession, user_id: uuid.UUID) -> Optional[Principal]:
+    row = (await db.execute(
+        select(User.id, User.email, Profile.id, User.is_admin)
+        .outerjoin(Profile, Profile.user_id == User.id)
+        .where(User.id == user_id)
+    )).first()
+    if not row:
+        return None
+    principal = Principal(id=row[0], email=row[1], profile_id=row[2], is_admin=row[3])
+    principal_cache.set(user_id, principal)
+    return principal
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user."""
-    user_id = decode_token(token)
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Get current authenticated user.
+
+    Served from signed token claims when AUTH_TRUST_TOKEN_CLAIMS is set,
+    otherwise from the principal cache, and only then from the database.
+    """
+    payload = decode_token_payload(token)
+    try:
+        user_id = uuid.UUID(payload["sub"])
+    except (KeyError, ValueError):
+        raise _credentials_exception("Could not validate credentials")
+
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and payload.get("email") and payload.get("pid"):
+        return Principal(
+            id=user_id,
+            email=payload["email"],
+            profile_id=uuid.UUID(payload["pid"]),
+        )
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = await _load_principal(db, user_id)
+    if principal is None:
+        raise _credentials_exception("User not found")
+    return principal
+
+
+async def get_current_profile_id(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> uuid.UUID:
+    """Get the profile id of the current authenticated user."""
+    profile_id = current_user.profile_id
+    if not profile_id:
+        # The profile may have been created since this principal was cached
+        # (possibly by another worker), so re-check before giving up.
+        principal = await _load_principal(db, current_user.id)
+        profile_id = principal.profile_id if principal else None
+    if not profile_id:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile_id
+
+
+async def get_current_admin(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """Get the current user, requiring admin rights.
+
+    Admin rights are never taken from token claims, so a principal built
+    from AUTH_TRUST_TOKEN_CLAIMS is re-resolved first.
+    """
+    principal = principal_cache.get(current_user.id)
+    if principal is None:
+        principal = await _load_principal(db, current_user.id)
+    if principal is None or not principal.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
         )
-    return user
+    return principal
+
+
+async def is_admin_token(token: str) -> bool:
+    """Whether a bearer token belongs to an admin, for checks made outside
+    route dependencies. Never raises; invalid tokens are not admins."""
+    try:
+        user_id = uuid.UUID(decode_token_payload(token)["sub"])
+    except (HTTPException, KeyError, ValueError):
+        return False
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        async with AsyncSessionLocal() as db:
+            principal = await _load_principal(db, user_id)
+    return principal is not None and principal.is_admin
@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional, Type
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+# Pydantic include for sparse fieldsets: {"id": True, "entry": {"text": True}}
+Include = Dict[str, Any]
+
+FIELDS_QUERY = Query(
+    None, description="Comma-separated fields to return, e.g. `id,dictionary_entry.text`")
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Include]:
+    """Turn a ``fields`` query value into a pydantic ``include`` for ``model``.
+
+    Nested fields are addressed with dots. Returns None (everything) when
+    ``fields`` is empty; unknown fields are rejected with 400.
+    """
+    if not fields:
+        return None
+    include: Include = {}
+    for path in filter(None, (part.strip() for part in fields.split(","))):
+        node, current = include, model
+        names = path.split(".")
+        for depth, name in enumerate(names):
+            field = current.model_fields.get(name) if current else None
+            if field is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown field: {path}"
+                )
+            if depth == len(names) - 1:
+                node[name] = True
+                break
+            if node.get(name) is True:
+                # The whole object is already included
+                break
+            annotation = field.annotation
+            current = annotation if isinstance(annotation, type) and issubclass(
+                annotation, BaseModel) else None
+            node = node.setdefault(name, {})
+    return include or None
+
+
+def fields_key(include: Optional[Include]) -> str:
+    """Canonical form of a parsed ``fields`` value for cache keys: the sorted
+    dotted paths, so requests for the same fields in any order share it."""
+    def paths(node: Include, prefix: str = ""):
+        for name, value in node.items():
+            if value is True:
+                yield prefix + name
+            else:
+                yield from paths(value, f"{prefix}{name}.")
+
+    return ",".join(sorted(paths(include or {})))
+
+
+def adapter_response(
+    adapter: TypeAdapter,
+    payload: Any,
+    validate: bool = True,
+    include: Optional[Include] = None,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Encode ``payload`` with ``adapter`` in one pass of pydantic-core.
+
+    Returning a Response skips FastAPI's response_model handling, which
+    would validate and serialize the result a second time; the route's
+    response_model still documents the schema. Pass ``validate=False`` when
+    ``payload`` already consists of model instances. ``include`` applies to
+    each item of a list payload.
+    """
+    if validate:
+        payload = adapter.validate_python(payload)
+    if include is not None:
+        include = {"__all__": include}
+    return Response(
+        content=adapter.dump_json(payload, include=include),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
@@ -0,0 +1,40 @@
+import logging
+
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.db.session import on_async_engine
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+except ImportError:  # optional dependency, only needed with OTEL_EXPORTER_OTLP_ENDPOINT
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+
+def setup_tracing(app: FastAPI) -> None:
+    """Export request and SQL spans to the OTLP collector, if one is configured."""
+    if not settings.OTEL_EXPORTER_OTLP_ENDPOINT:
+        return
+    if trace is None:
+        logger.warning("OTEL_EXPORTER_OTLP_ENDPOINT is set but the opentelemetry packages "
+                       "are not installed; tracing is disabled")
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(
+        # Plain gRPC: the collector is expected to run next to the API
+        OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT, insecure=True)))
+    trace.set_tracer_provider(provider)
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=provider, excluded_urls="metrics,health")
+
+    @on_async_engine
+    def instrument_engine(async_engine):
+        SQLAlchemyInstrumentor().instrument(engine=async_engine.sync_engine, tracer_provider=provider)
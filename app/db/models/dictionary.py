@@ -1,4 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, Enum
+from datetime import datetime
+from sqlalchemy import Column, Computed, DateTime, DDL, Integer, String, Text, Enum, Index, UniqueConstraint, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.db.session import Base
 from app.db.models.word import DifficultyLevel
 
@@ -6,13 +9,50 @@ from app.db.models.word import DifficultyLevel
 class Dictionary(Base):
     __tablename__ = "dictionary"
 
-    id = Column(Integer, primary_key=True, index=True)
-    text = Column(String, unique=True, index=True)
+    id = Column(Integer, primary_key=True)
+    text = Column(String)
     meaning = Column(Text)
     example = Column(Text, nullable=True)
     pronunciation = Column(String, nullable=True)
     difficulty = Column(Enum(DifficultyLevel), default=DifficultyLevel.MEDIUM)
-    language = Column(String, index=True)  # e.g., "en", "es", "fr"
+    language = Column(String)  # e.g., "en", "es", "fr"
+    # Last-Modified of cached dictionary responses
+    updated_at = Column(DateTime, default=datetime.utcnow,
+                        onupdate=datetime.utcnow)
+
+    # Full-text document, maintained by Postgres. Uses the language-agnostic
+    # 'simple' configuration because rows of every language share the column.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple'::regconfig, coalesce(text, '')), 'A') || "
+            "setweight(to_tsvector('simple'::regconfig, coalesce(meaning, '')), 'B') || "
+            "setweight(to_tsvector('simple'::regconfig, coalesce(example, '')), 'C')",
+            persisted=True,
+        ),
+    ), raiseload=True)
+
+    __table_args__ = (
+        # The same spelling may exist in several languages; also the
+        # conflict target of bulk imports
+        UniqueConstraint("text", "language", name="uq_dictionary_text_language"),
+        # Keyset pagination of list_dictionary_entries, with and without a
+        # language filter. They also serve plain text/language lookups, so
+        # neither column has an index of its own.
+        Index("ix_dictionary_text_id", "text", "id"),
+        Index("ix_dictionary_language_text_id", "language", "text", "id"),
+        # Substring (ILIKE '%...%') and fuzzy (%, similarity) matching
+        Index("ix_dictionary_text_trgm", "text", postgresql_using="gin",
+              postgresql_ops={"text": "gin_trgm_ops"}),
+        Index("ix_dictionary_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     def __repr__(self):
         return f"<Dictionary(text={self.text}, language={self.language})>"
+
+
+event.listen(
+    Dictionary.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
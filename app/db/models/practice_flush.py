@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.db.session import Base
+
+
+# One row per batch flushed from the practice write-behind buffer, committed
+# with the batch so a flusher that crashed before acknowledging it locally
+# does not record it twice (see app/services/practice_buffer.py)
+class PracticeFlush(Base):
+    __tablename__ = "practice_flushes"
+
+    token = Column(UUID(as_uuid=True), primary_key=True)
+    flushed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_practice_flushes_flushed_at", "flushed_at"),
+    )
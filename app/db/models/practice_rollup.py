@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.session import Base
+
+
+# Practice of one word on one day, compacted from practice_sessions once the
+# raw rows leave the retention window
+class PracticeDailyRollup(Base):
+    __tablename__ = "practice_daily_rollups"
+
+    # Leads with profile_id for the daily activity of a profile
+    profile_id = Column(UUID(as_uuid=True), ForeignKey("profiles.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    word_id = Column(Integer, ForeignKey("words.id"), primary_key=True)
+    total_practices = Column(Integer, nullable=False)
+    correct_answers = Column(Integer, nullable=False)
+    last_practiced_at = Column(DateTime, nullable=False)
+    last_miss_at = Column(DateTime, nullable=True)
+    # Correct answers after the day's last miss, so streaks survive compaction
+    trailing_correct = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # History of a word: deletes and the stats rebuild
+        Index("ix_practice_daily_rollups_word_day", "word_id", "day"),
+    )
@@ -1,19 +1,44 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import DDL, Column, Integer, DateTime, ForeignKey, Boolean, Index, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
 
+DEFAULT_PARTITION = "practice_sessions_default"
 
+
+# Range partitioned by month on created_at. The monthly partitions are
+# created, compacted into rollups and dropped by app.services.practice_history.
 class PracticeSession(Base):
     __tablename__ = "practice_sessions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # The partition key has to be part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     word_id = Column(Integer, ForeignKey("words.id"))
     profile_id = Column(UUID(as_uuid=True), ForeignKey("profiles.id"))
     correct = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
 
     # Relationships
-    word = relationship("Word", back_populates="practice_sessions")
-    profile = relationship("Profile", back_populates="practice_sessions")
+    word = relationship("Word", back_populates="practice_sessions", lazy="raise_on_sql")
+    profile = relationship("Profile", back_populates="practice_sessions", lazy="raise_on_sql")
+
+    __table_args__ = (
+        # History of a word: deletes, exports and the stats rebuild
+        Index("ix_practice_sessions_word_created", "word_id", "created_at"),
+        # Daily activity of a profile, answered by an index-only scan
+        Index("ix_practice_sessions_profile_created", "profile_id", "created_at",
+              postgresql_include=["correct"]),
+        # Last miss per word, for streaks (scripts/rebuild_word_stats.py)
+        Index("ix_practice_sessions_word_misses", "word_id", "created_at",
+              postgresql_where=text("NOT correct")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+# Catches answers outside the monthly partitions so that inserts never fail
+event.listen(
+    PracticeSession.__table__,
+    "after_create",
+    DDL(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF practice_sessions DEFAULT"),
+)
@@ -19,7 +19,7 @@ class Profile(Base):
                         onupdate=datetime.utcnow)
 
     # Relationships
-    user = relationship("User", back_populates="profile")
-    words = relationship("Word", back_populates="profile")
+    user = relationship("User", back_populates="profile", lazy="raise_on_sql")
+    words = relationship("Word", back_populates="profile", lazy="raise_on_sql")
     practice_sessions = relationship(
-        "PracticeSession", back_populates="profile")
+        "PracticeSession", back_populates="profile", lazy="raise_on_sql")
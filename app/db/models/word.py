@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Float, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -15,7 +15,7 @@ class DifficultyLevel(str, enum.Enum):
 class Word(Base):
     __tablename__ = "words"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     dictionary_id = Column(Integer, ForeignKey(
         "dictionary.id"), nullable=False)
     profile_id = Column(UUID(as_uuid=True), ForeignKey(
@@ -25,7 +25,35 @@ class Word(Base):
     updated_at = Column(DateTime, default=datetime.utcnow,
                         onupdate=datetime.utcnow)
 
-    # Relationships
-    profile = relationship("Profile", back_populates="words")
-    dictionary_entry = relationship("Dictionary")
-    practice_sessions = relationship("PracticeSession", back_populates="word")
+    # Spaced-repetition state (see app/services/scheduler.py)
+    ease_factor = Column(Float, default=2.5, nullable=False)
+    interval_days = Column(Float, default=0.0, nullable=False)
+    repetitions = Column(Integer, default=0, nullable=False)
+    lapses = Column(Integer, default=0, nullable=False)
+    due_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_reviewed_at = Column(DateTime, nullable=True)
+
+    # Running practice counters, maintained by app/services/practice.py and
+    # rebuilt by scripts/rebuild_word_stats.py
+    total_practices = Column(Integer, default=0, nullable=False)
+    correct_answers = Column(Integer, default=0, nullable=False)
+    streak = Column(Integer, default=0, nullable=False)
+    last_practiced_at = Column(DateTime, nullable=True)
+
+    # Relationships. Lazy loading raises everywhere in the models: load what
+    # a response needs up front (e.g. joinedload/contains_eager) so
+    # serialization can never fall into an N+1.
+    profile = relationship("Profile", back_populates="words", lazy="raise_on_sql")
+    dictionary_entry = relationship("Dictionary", lazy="raise_on_sql")
+    practice_sessions = relationship("PracticeSession", back_populates="word", lazy="raise_on_sql")
+
+    # Every index leads with profile_id, which also makes them serve plain
+    # "words of a profile" scans.
+    __table_args__ = (
+        # A dictionary entry is in a vocabulary at most once
+        UniqueConstraint("profile_id", "dictionary_id", name="uq_words_profile_dictionary"),
+        # Review queue: next due cards for a profile
+        Index("ix_words_profile_due", "profile_id", "due_at"),
+        # Keyset pagination of list_words
+        Index("ix_words_profile_created", "profile_id", "created_at", "id"),
+    )
@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Any, Dict
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.metrics import LIVE_SUM
+
+# Updated as connections move, so every worker's values reach /metrics
+pool_size = Gauge(
+    "db_pool_size", "Connections the pool keeps open.", ["engine"], multiprocess_mode=LIVE_SUM)
+pool_checked_out = Gauge(
+    "db_pool_checked_out", "Connections in use.", ["engine"], multiprocess_mode=LIVE_SUM)
+pool_overflow = Gauge(
+    "db_pool_overflow", "Connections opened beyond the pool size.", ["engine"],
+    multiprocess_mode=LIVE_SUM)
+pool_checkouts = Counter("db_pool_checkouts_total", "Connection checkouts.", ["engine"])
+pool_timeouts = Counter("db_pool_timeouts_total", "Checkouts that timed out waiting.", ["engine"])
+pool_wait_seconds = Counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for a connection.", ["engine"])
+
+
+class PoolStats:
+    """Running checkout/wait counters for a connection pool, also exported
+    as Prometheus metrics labelled with ``engine``."""
+
+    def __init__(self, engine: str):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        pool_checkouts.labels(self.engine).inc()
+        pool_wait_seconds.labels(self.engine).inc(waited)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        pool_timeouts.labels(self.engine).inc()
+
+    def record_occupancy(self, pool: Pool) -> None:
+        if isinstance(pool, QueuePool):
+            pool_size.labels(self.engine).set(pool.size())
+            pool_checked_out.labels(self.engine).set(pool.checkedout())
+            pool_overflow.labels(self.engine).set(pool.overflow())
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """Counters plus the pool's current occupancy."""
+        data: Dict[str, Any] = {
+            "pool_class": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6)
+            if self.checkouts else 0.0,
+        }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return data
+
+
+class _InstrumentedPoolMixin:
+    """Times how long callers wait for a pooled connection.
+
+    ``_do_get`` is where QueuePool blocks on its queue (or opens an overflow
+    connection), so the elapsed time is the checkout wait seen by a request.
+    """
+
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(time.perf_counter() - started)
+        self.stats.record_occupancy(self)
+        return conn
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self.stats.record_occupancy(self)
+
+
+def instrumented_pool_class(base: type, stats: PoolStats) -> type:
+    """Build a QueuePool subclass of ``base`` that reports into ``stats``."""
+    return type(
+        f"Instrumented{base.__name__}",
+        (_InstrumentedPoolMixin, base),
+        {"stats": stats},
+    )
+
@@ -0,0 +1,83 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.session import on_async_engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    def __init__(self, parent: Optional["QueryCounter"] = None):
+        self.parent = parent
+        self.count = 0
+        self.statements: List[str] = []
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block issues more queries than its budget allows."""
+
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "query_counter", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    # Nested blocks count towards every enclosing counter too
+    while counter is not None:
+        counter.count += 1
+        counter.statements.append(statement)
+        counter = counter.parent
+
+
+@on_async_engine
+def _listen(async_engine):
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _count_query)
+
+
+@contextmanager
+def count_queries(budget: Optional[int] = None) -> Iterator[QueryCounter]:
+    """Count SQL statements issued by the API engine inside the block.
+
+    With a ``budget``, raise QueryBudgetExceeded if the block issued more
+    statements than that, which is how tests catch N+1 regressions.
+    """
+    counter = QueryCounter(parent=_current_counter.get())
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+    if budget is not None and counter.count > budget:
+        raise QueryBudgetExceeded(
+            f"{counter.count} queries issued, budget is {budget}:\n"
+            + "\n".join(counter.statements)
+        )
+
+
+def query_budget(budget: int):
+    """Route dependency bounding the queries a request may issue.
+
+    Use on list endpoints so the query count stays constant regardless of
+    page size. Overruns fail the request when DB_QUERY_BUDGET_ENFORCE is set
+    (dev and test) and are logged otherwise.
+    """
+    async def dependency():
+        with count_queries() as counter:
+            yield counter
+        if counter.count > budget:
+            message = f"{counter.count} queries issued, budget is {budget}"
+            if settings.DB_QUERY_BUDGET_ENFORCE:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Query budget exceeded: {message}"
+                )
+            logger.warning("Query budget exceeded: %s", message)
+
+    return dependency
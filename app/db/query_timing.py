@@ -0,0 +1,99 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import COUNT_BUCKETS, LATENCY_BUCKETS
+from app.db.session import on_async_engine
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text written to the slow query log
+SLOW_QUERY_MAX_LENGTH = 2000
+
+query_duration = Histogram(
+    "db_query_duration_seconds", "Duration of SQL statements issued by the API engine.",
+    buckets=LATENCY_BUCKETS)
+slow_queries = Counter(
+    "db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_MS, by route.", ["route"])
+request_db_time = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request.", ["route"],
+    buckets=LATENCY_BUCKETS)
+request_queries = Histogram(
+    "http_request_db_queries", "SQL statements issued per request.", ["route"],
+    buckets=COUNT_BUCKETS)
+
+
+class RequestQueries:
+    """Statements and database time of the request being served."""
+
+    def __init__(self, scope: dict):
+        # The route is only known once the router has matched the scope
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        # Set while the request is profiled: every statement with its start
+        # offset and duration in milliseconds
+        self.timeline: Optional[List[dict]] = None
+        self.timeline_origin = 0.0
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "<unmatched>"
+
+
+_current_request: ContextVar[Optional[RequestQueries]] = ContextVar(
+    "request_queries", default=None)
+
+
+def start_request(scope: dict) -> RequestQueries:
+    queries = RequestQueries(scope)
+    _current_request.set(queries)
+    return queries
+
+
+def current_request() -> Optional[RequestQueries]:
+    return _current_request.get()
+
+
+def finish_request(queries: RequestQueries) -> None:
+    request_db_time.labels(queries.route).observe(queries.seconds)
+    request_queries.labels(queries.route).observe(queries.count)
+
+
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    query_duration.observe(elapsed)
+    queries = _current_request.get()
+    if queries is not None:
+        queries.count += 1
+        queries.seconds += elapsed
+        if queries.timeline is not None:
+            queries.timeline.append({
+                "start_ms": round((context._query_started - queries.timeline_origin) * 1000, 3),
+                "duration_ms": round(elapsed * 1000, 3),
+                "statement": statement,
+            })
+
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        route = queries.route if queries is not None else "<background>"
+        slow_queries.labels(route).inc()
+        source = f"{queries.scope['method']} {route}" if queries is not None else route
+        # Parameters are left out: they can hold personal data
+        logger.warning("Slow query (%.0f ms) in %s: %s", elapsed * 1000, source,
+                       " ".join(statement.split())[:SLOW_QUERY_MAX_LENGTH])
+
+
+@on_async_engine
+def _listen(async_engine):
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _start_timer)
+    event.listen(async_engine.sync_engine, "after_cursor_execute", _stop_timer)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime
 from app.db.models.word import DifficultyLevel
 import uuid
 
@@ -30,6 +30,27 @@ class DictionaryRead(DictionaryBase):
         from_attributes = True
 
 
+class SearchHit(DictionaryRead):
+    score: float
+
+
+class SearchResults(BaseModel):
+    mode: str
+    items: List[SearchHit]
+    suggestions: List[str] = Field(
+        default_factory=list, description="Close spellings when nothing matched")
+
+
+class AutocompleteItem(BaseModel):
+    id: int
+    text: str
+    language: str
+    difficulty: DifficultyLevel
+
+    class Config:
+        from_attributes = True
+
+
 class WordBase(BaseModel):
     dictionary_id: int = Field(...,
                                description="Reference to the dictionary entry")
@@ -41,6 +62,23 @@ class WordCreate(WordBase):
     pass
 
 
+class WordBulkRequest(BaseModel):
+    dictionary_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class WordBulkCreateResult(BaseModel):
+    created: List[int]
+    skipped: List[int] = Field(
+        ..., description="Dictionary ids already in the vocabulary")
+    not_found: List[int]
+
+
+class WordBulkDeleteResult(BaseModel):
+    deleted: List[int]
+    skipped: List[int] = Field(
+        ..., description="Dictionary ids not in the vocabulary")
+
+
 class WordUpdate(BaseModel):
     personal_note: Optional[str] = None
 
@@ -51,13 +89,80 @@ class WordRead(WordBase):
     updated_at: datetime
     profile_id: uuid.UUID
     dictionary_entry: DictionaryRead
+    ease_factor: float
+    interval_days: float
+    repetitions: int
+    lapses: int
+    due_at: datetime
+    last_reviewed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 
+class PracticeResult(BaseModel):
+    status: str = "success"
+    due_at: datetime
+    interval_days: float
+    ease_factor: float
+
+
+class PracticeItem(BaseModel):
+    word_id: int
+    correct: bool
+    answered_at: Optional[datetime] = Field(
+        None, description="When the answer was given; defaults to receipt time")
+    quality: Optional[int] = Field(
+        None, ge=0, le=5, description="SM-2 answer grade; derived from `correct` when omitted")
+
+
+class PracticeBatch(BaseModel):
+    items: List[PracticeItem] = Field(..., min_length=1, max_length=500)
+
+
+class PracticeBatchResult(BaseModel):
+    recorded: int
+    rejected_word_ids: List[int]
+
+
+class PracticeQueued(BaseModel):
+    # Answers accepted into the write-behind buffer; recorded asynchronously
+    queued: int
+
+
 class WordStats(BaseModel):
     total_practices: int
     correct_answers: int
     success_rate: float
     last_practiced: Optional[datetime]
+    streak: int = 0
+
+
+class WordStatsItem(WordStats):
+    word_id: int
+    dictionary_id: int
+    text: str
+    difficulty: DifficultyLevel
+
+
+class DifficultyStats(BaseModel):
+    difficulty: DifficultyLevel
+    words: int
+    total_practices: int
+    correct_answers: int
+    success_rate: float
+
+
+class DailyActivity(BaseModel):
+    day: date
+    total_practices: int
+    correct_answers: int
+
+
+class ProfileStatsSummary(BaseModel):
+    total_words: int
+    total_practices: int
+    correct_answers: int
+    success_rate: float
+    by_difficulty: List[DifficultyStats]
+    daily_activity: List[DailyActivity]
@@ -1,28 +1,225 @@
+import asyncio
+import logging
 import os
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+import uuid
+from typing import Callable, List, Optional
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from app.core.config import settings
+from app.db.pool import PoolStats, instrumented_pool_class
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-DB_USER = os.getenv("DATABASE_USER")
-DB_PASSWORD = os.getenv("DATABASE_PASSWORD")
-DB_HOST = os.getenv("DATABASE_HOST")
-DB_PORT = os.getenv("DATABASE_PORT", "5432")
-DB_NAME = os.getenv("DATABASE_NAME")
 
-if not all([DB_USER, DB_PASSWORD, DB_HOST, DB_NAME]):
-    raise ValueError("Missing required DB environment variables")
+def database_url(driver: str = "postgresql") -> str:
+    """Connection URL built from the DATABASE_* environment variables."""
+    user = os.getenv("DATABASE_USER")
+    password = os.getenv("DATABASE_PASSWORD")
+    host = os.getenv("DATABASE_HOST")
+    port = os.getenv("DATABASE_PORT", "5432")
+    name = os.getenv("DATABASE_NAME")
+    if not all([user, password, host, name]):
+        raise ValueError("Missing required DB environment variables")
+    return f"{driver}://{user}:{password}@{host}:{port}/{name}"
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _engine_options(pool_base: type, stats: PoolStats, connect_args: dict) -> dict:
+    """Pool/echo keyword arguments shared by the sync and async engines."""
+    if settings.DB_EXTERNAL_POOLER:
+        # pgbouncer owns pooling; keeping our own pool would pin server
+        # connections and defeat transaction pooling.
+        return {"echo": settings.DB_ECHO, "poolclass": NullPool, "connect_args": connect_args}
+    return {
+        "echo": settings.DB_ECHO,
+        "poolclass": instrumented_pool_class(pool_base, stats),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def _sync_connect_args() -> dict:
+    if settings.DB_STATEMENT_TIMEOUT_MS and not settings.DB_EXTERNAL_POOLER:
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def _async_connect_args() -> dict:
+    if settings.DB_EXTERNAL_POOLER:
+        # Transaction-pooled server connections are shared between clients, so
+        # named prepared statements cannot be cached on them. Startup
+        # parameters such as statement_timeout are rejected by pgbouncer; set
+        # them on the database role instead.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return {}
+
+
+sync_pool_stats = PoolStats("sync")
+async_pool_stats = PoolStats("async")
+
+# Engines are created on first use (the API creates its engine in the app's
+# lifespan), so importing this module neither needs the DATABASE_* variables
+# nor loads the database drivers.
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+# Called with the API engine once it exists, e.g. to attach event listeners
+_async_engine_hooks: List[Callable[[AsyncEngine], None]] = []
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw) -> Session:
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    def __call__(self, **local_kw) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            get_async_engine()
+        return super().__call__(**local_kw)
+
+
+# Sync engine (psycopg2): used by the scripts and Alembic.
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+
+# Async engine (asyncpg): used by the API request handlers.
+AsyncSessionLocal = _LazyAsyncSessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 
-def get_db():
+def _count_sync_connect(dbapi_connection, connection_record):
+    sync_pool_stats.record_connect()
+
+
+def _count_async_connect(dbapi_connection, connection_record):
+    async_pool_stats.record_connect()
+
+
+def get_engine() -> Engine:
+    """The sync engine, created on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            database_url(),
+            **_engine_options(QueuePool, sync_pool_stats, _sync_connect_args()),
+        )
+        event.listen(_engine, "connect", _count_sync_connect)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """The API engine, created on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            database_url("postgresql+asyncpg"),
+            **_engine_options(AsyncAdaptedQueuePool, async_pool_stats, _async_connect_args()),
+        )
+        event.listen(_async_engine.sync_engine, "connect", _count_async_connect)
+        AsyncSessionLocal.configure(bind=_async_engine)
+        for hook in _async_engine_hooks:
+            hook(_async_engine)
+    return _async_engine
+
+
+def on_async_engine(hook: Callable[[AsyncEngine], None]) -> Callable[[AsyncEngine], None]:
+    """Decorator: call ``hook`` with the API engine when it is created, or
+    right away if it already exists."""
+    _async_engine_hooks.append(hook)
+    if _async_engine is not None:
+        hook(_async_engine)
+    return hook
+
+
+async def warm_pool(connections: int) -> int:
+    """Open up to ``connections`` pooled connections of the API engine, so
+    the first requests do not pay for connecting. Returns how many opened."""
+    async_engine = get_async_engine()
+    if settings.DB_EXTERNAL_POOLER or connections <= 0:
+        return 0
+    pending = min(connections, settings.DB_POOL_SIZE)
+    all_tried = asyncio.Event()
+
+    def tried():
+        nonlocal pending
+        pending -= 1
+        if not pending:
+            all_tried.set()
+
+    async def connect():
+        counted = False
+        try:
+            async with async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                counted = True
+                tried()
+                # Held until every task has tried; released earlier, the
+                # pool would hand the same connection out again
+                await all_tried.wait()
+        finally:
+            if not counted:
+                tried()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(connect() for _ in range(pending)), return_exceptions=True),
+        timeout=settings.DB_POOL_TIMEOUT)
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures:
+        logger.warning("%d of %d pool connections failed to open: %r",
+                       len(failures), len(results), failures[0])
+    return len(results) - len(failures)
+
+
+async def dispose_engines() -> None:
+    """Close the engines' pooled connections; they are recreated on next use."""
+    global _engine, _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        AsyncSessionLocal.configure(bind=None)
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+        SessionLocal.configure(bind=None)
+
+
+def get_pool_stats() -> dict:
+    """Checkout/wait statistics for the connection pools of the engines
+    created so far."""
+    stats = {}
+    if _async_engine is not None:
+        stats["async"] = async_pool_stats.snapshot(_async_engine.pool)
+    if _engine is not None:
+        stats["sync"] = sync_pool_stats.snapshot(_engine.pool)
+    return stats
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
@@ -1,57 +1,155 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import Optional
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
+from app.api.middleware import PROFILE_ID_HEADER, MetricsMiddleware, ProfilingMiddleware
+from app.api.openapi import install_openapi_cache
 from app.api.routes import router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-import uvicorn
-
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    description="Backend API for English Word Trainer",
-    version="1.0.0",
-    docs_url="/docs",           # Swagger UI
-    redoc_url="/redoc",         # ReDoc UI
-    openapi_url="/openapi.json"  # OpenAPI schema
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        # Frontend URL for local development (React default)
-        "http://localhost:3000",
-        "http://localhost:5173",  # Frontend URL for Vite.js development
-        "https://d1xzzbrpkkcgr.cloudfront.net"  # Production frontend URL
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Global error handler for validation errors
-
-
-@app.exception_handler(RequestValidationError)
-async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(
-        status_code=422,
-        content={
-            "detail": exc.errors(),
-            "body": exc.body
-        }
+from app.core.metrics import worker_stopped
+from app.core.pagination import NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER
+from app.core.security import hashing_pool
+from app.core.tracing import setup_tracing
+from app.db.session import dispose_engines, get_async_engine, warm_pool
+from app.services.autocomplete import autocomplete_index, refresh_periodically
+from app.services.practice_buffer import practice_buffer
+from app.services.practice_history import maintain_periodically
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Raises here, not at import, when the DATABASE_* variables are missing
+    get_async_engine()
+    # Uvicorn only accepts requests once this returns, so the first ones
+    # find open connections
+    try:
+        opened = await warm_pool(settings.DB_POOL_WARM_SIZE)
+        logger.info("Opened %d pooled database connections", opened)
+    except Exception:
+        logger.exception("Connection pool failed to warm up")
+    # Autocomplete falls back to the database until the index is loaded
+    try:
+        await autocomplete_index.load()
+    except Exception:
+        logger.exception("Autocomplete index failed to load")
+    tasks = []
+    if settings.AUTOCOMPLETE_REFRESH_SECONDS > 0:
+        tasks.append(asyncio.create_task(refresh_periodically(
+            autocomplete_index, settings.AUTOCOMPLETE_REFRESH_SECONDS)))
+    if settings.PRACTICE_MAINTENANCE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(maintain_periodically(
+            settings.PRACTICE_MAINTENANCE_INTERVAL_SECONDS)))
+    if settings.PRACTICE_WRITE_BEHIND:
+        # Answers left by a previous run are flushed by the first iteration
+        practice_buffer.open()
+        tasks.append(asyncio.create_task(practice_buffer.run()))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    if settings.PRACTICE_WRITE_BEHIND:
+        try:
+            await practice_buffer.drain()
+        except Exception:
+            logger.exception("Practice buffer failed to flush on shutdown")
+        practice_buffer.close()
+    # Requests have finished by now; let their hashing jobs complete
+    await asyncio.to_thread(hashing_pool.shutdown)
+    await dispose_engines()
+    worker_stopped()
+
+
+def create_app() -> FastAPI:
+    """Build the API; database engines are created by its lifespan.
+
+    Run with ``uvicorn --factory app.main:create_app``.
+    """
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        description="Backend API for English Word Trainer",
+        version="1.0.0",
+        docs_url="/docs" if settings.DOCS_ENABLED else None,  # Swagger UI
+        redoc_url="/redoc" if settings.DOCS_ENABLED else None,  # ReDoc UI
+        openapi_url="/openapi.json" if settings.DOCS_ENABLED else None,  # OpenAPI schema
+        # orjson encodes responses several times faster than the stdlib json
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
+    )
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            # Frontend URL for local development (React default)
+            "http://localhost:3000",
+            "http://localhost:5173",  # Frontend URL for Vite.js development
+            "https://d1xzzbrpkkcgr.cloudfront.net"  # Production frontend URL
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER, PROFILE_ID_HEADER],
     )
 
-# Health check endpoint
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+    # Not installed at all unless enabled, so it costs nothing when off
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+    # Added last so it is the outermost middleware and times the whole request
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+    setup_tracing(app)
 
+    # Global error handler for validation errors
 
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
+    @app.exception_handler(RequestValidationError)
+    async def validation_exception_handler(request: Request, exc: RequestValidationError):
+        return JSONResponse(
+            status_code=422,
+            content={
+                "detail": exc.errors(),
+                "body": exc.body
+            }
+        )
+
+    # Health check endpoint
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    app.include_router(router)
+    if settings.OPENAPI_PRECOMPRESSED and settings.DOCS_ENABLED:
+        install_openapi_cache(app)
+    return app
+
+
+_app: Optional[FastAPI] = None
+
+
+def __getattr__(name: str):
+    # `app.main:app` is built on first access, so importing this module for
+    # create_app does not build a second app
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-app.include_router(router)
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "main:app",
         host=settings.HOST,
@@ -0,0 +1,231 @@
+import asyncio
+import heapq
+import logging
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.db.models.dictionary import Dictionary
+from app.db.models.word import DifficultyLevel
+from app.db.session import AsyncSessionLocal
+from app.services.search import escape_like
+
+logger = logging.getLogger(__name__)
+
+# Easier (more common) words rank first
+DIFFICULTY_RANK = {
+    DifficultyLevel.EASY: 0,
+    DifficultyLevel.MEDIUM: 1,
+    DifficultyLevel.HARD: 2,
+}
+MAX_LIMIT = 20
+# Prefix ranges wider than this get their top results memoized
+SCAN_LIMIT = 256
+_KEY_END = "\U0010ffff"
+
+# (casefolded text, id, original text, difficulty rank), sorted
+_Entry = Tuple[str, int, str, int]
+
+
+@dataclass
+class Suggestion:
+    id: int
+    text: str
+    language: str
+    difficulty: DifficultyLevel
+
+
+def _rank(entry: _Entry) -> Tuple[int, int, str, int]:
+    key, entry_id, _, difficulty = entry
+    return difficulty, len(key), key, entry_id
+
+
+class _LanguageIndex:
+    def __init__(self, entries: List[_Entry]):
+        self.entries = sorted(entries)
+        self._top: Dict[str, List[_Entry]] = {}
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self.entries, (prefix,))
+        hi = bisect_left(self.entries, (prefix + _KEY_END,), lo)
+        return lo, hi
+
+    def search(self, prefix: str, limit: int) -> List[_Entry]:
+        lo, hi = self._range(prefix)
+        if hi - lo <= SCAN_LIMIT:
+            return heapq.nsmallest(limit, self.entries[lo:hi], key=_rank)
+        top = self._top.get(prefix)
+        if top is None:
+            top = heapq.nsmallest(
+                MAX_LIMIT, (self.entries[i] for i in range(lo, hi)), key=_rank)
+            self._top[prefix] = top
+        return top[:limit]
+
+    def _forget(self, key: str) -> None:
+        # Memoized results of every prefix of ``key`` may have changed
+        for i in range(len(key) + 1):
+            self._top.pop(key[:i], None)
+
+    def add(self, entry: _Entry) -> None:
+        insort(self.entries, entry)
+        self._forget(entry[0])
+
+    def remove(self, entry: _Entry) -> None:
+        i = bisect_left(self.entries, entry)
+        if i < len(self.entries) and self.entries[i] == entry:
+            del self.entries[i]
+        self._forget(entry[0])
+
+
+class PrefixIndex:
+    """In-process autocomplete over dictionary texts.
+
+    One sorted array per language is searched with bisect, so a lookup is
+    O(log n) plus ranking of the matching range; wide ranges (one or two
+    letter prefixes) have their top results memoized until a write touches
+    them. The index is loaded at startup, kept current by the dictionary
+    write routes and fully reloaded every AUTOCOMPLETE_REFRESH_SECONDS to
+    pick up writes made by other workers.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.ready = False
+        self._languages: Dict[str, _LanguageIndex] = {}
+        # id -> (language, entry), to find the old key on update/delete
+        self._by_id: Dict[int, Tuple[str, _Entry]] = {}
+        # Writes seen while a reload is reading the table; replayed on swap
+        self._pending: Optional[List[tuple]] = None
+        self._load_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @staticmethod
+    def _entry(entry_id: int, text: str, difficulty: Optional[DifficultyLevel]) -> _Entry:
+        rank = DIFFICULTY_RANK.get(difficulty, DIFFICULTY_RANK[DifficultyLevel.MEDIUM])
+        return text.casefold(), entry_id, text, rank
+
+    async def load(self) -> None:
+        """Rebuild the index from the dictionary table and swap it in.
+
+        Loads run one at a time: a load started while another is reading
+        waits for it, then reads the table again.
+        """
+        async with self._load_lock:
+            await self._load()
+
+    async def _load(self) -> None:
+        by_language: Dict[str, List[_Entry]] = {}
+        by_id: Dict[int, Tuple[str, _Entry]] = {}
+        pending: List[tuple] = []
+        self._pending = pending
+        query = (
+            select(Dictionary.id, Dictionary.text, Dictionary.language, Dictionary.difficulty)
+            .order_by(Dictionary.difficulty, Dictionary.id)
+            .limit(self.max_entries)
+            .execution_options(yield_per=5000)
+        )
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.stream(query)
+                async for partition in result.partitions():
+                    for entry_id, text, language, difficulty in partition:
+                        if not text or not language:
+                            continue
+                        entry = self._entry(entry_id, text, difficulty)
+                        by_language.setdefault(language, []).append(entry)
+                        by_id[entry_id] = (language, entry)
+                    # Let other requests run between batches
+                    await asyncio.sleep(0)
+        finally:
+            self._pending = None
+
+        self._languages = {
+            language: _LanguageIndex(entries)
+            for language, entries in by_language.items()
+        }
+        self._by_id = by_id
+        for op, args in pending:
+            op(*args)
+        self.ready = True
+        logger.info("Autocomplete index loaded with %d entries", len(by_id))
+
+    def upsert(self, entry_id: int, text: str, language: str, difficulty: Optional[DifficultyLevel]) -> None:
+        if self._pending is not None:
+            self._pending.append((self.upsert, (entry_id, text, language, difficulty)))
+        self._discard(entry_id)
+        if len(self._by_id) >= self.max_entries:
+            return
+        entry = self._entry(entry_id, text, difficulty)
+        index = self._languages.get(language)
+        if index is None:
+            index = self._languages[language] = _LanguageIndex([])
+        index.add(entry)
+        self._by_id[entry_id] = (language, entry)
+
+    def remove(self, entry_id: int) -> None:
+        if self._pending is not None:
+            self._pending.append((self.remove, (entry_id,)))
+        self._discard(entry_id)
+
+    def _discard(self, entry_id: int) -> None:
+        existing = self._by_id.pop(entry_id, None)
+        if existing:
+            language, entry = existing
+            self._languages[language].remove(entry)
+
+    def search(self, prefix: str, language: Optional[str] = None, limit: int = 10) -> List[Suggestion]:
+        prefix = prefix.casefold()
+        limit = min(limit, MAX_LIMIT)
+        if language:
+            index = self._languages.get(language)
+            candidates = [(language, entry) for entry in index.search(prefix, limit)] if index else []
+        else:
+            candidates = [
+                (lang, entry)
+                for lang, index in self._languages.items()
+                for entry in index.search(prefix, limit)
+            ]
+        best = heapq.nsmallest(limit, candidates, key=lambda item: _rank(item[1]))
+        rank_to_difficulty = {rank: level for level, rank in DIFFICULTY_RANK.items()}
+        return [
+            Suggestion(
+                id=entry[1],
+                text=entry[2],
+                language=lang,
+                difficulty=rank_to_difficulty[entry[3]],
+            )
+            for lang, entry in best
+        ]
+
+
+def prefix_query(prefix: str, language: Optional[str], limit: int) -> Select:
+    """Database fallback for PrefixIndex.search, used until the index is loaded."""
+    # The difficulty enum sorts in declaration order: easy, medium, hard
+    query = (
+        select(Dictionary)
+        .where(Dictionary.text.ilike(f"{escape_like(prefix)}%", escape="\\"))
+        .order_by(Dictionary.difficulty, func.length(Dictionary.text), Dictionary.text, Dictionary.id)
+        .limit(limit)
+    )
+    if language:
+        query = query.where(Dictionary.language == language)
+    return query
+
+
+autocomplete_index = PrefixIndex(max_entries=settings.AUTOCOMPLETE_MAX_ENTRIES)
+
+
+async def refresh_periodically(index: PrefixIndex, interval: int) -> None:
+    """Reload ``index`` every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await index.load()
+        except Exception:
+            logger.exception("Autocomplete index refresh failed")
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # optional dependency, only needed with REDIS_URL
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "dictionary:generation"
+
+# A cached response: {"body": ..., "etag": ..., "last_modified": ..., ...}
+Cached = Dict[str, Any]
+
+
+class DictionaryCache:
+    """Read-through cache for dictionary responses.
+
+    Lookups go to a bounded in-process LRU first, then to an optional
+    Redis-compatible ``remote`` shared by all workers, and only then to the
+    database. Writes delete the entry and bump a generation counter that is
+    part of every list key, so all cached listings are dropped at once.
+    Other workers' local tiers catch up within ``ttl`` seconds.
+
+    ``remote`` may be any client with async ``get``, ``set(key, value,
+    ex=...)``, ``delete`` and ``incr``. Errors from it are logged and the
+    cache falls back to the database.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, remote=None):
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.remote = remote
+        self.remote_errors = 0
+        # Bumped on every write; a load that raced a write is not stored
+        self._generation = 0
+
+    @staticmethod
+    def entry_key(entry_id: int) -> str:
+        return f"dictionary:entry:{entry_id}"
+
+    @staticmethod
+    def list_key(params: Dict[str, Any]) -> str:
+        raw = json.dumps(params, sort_keys=True, default=str)
+        return f"dictionary:list:{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"
+
+    async def _remote_call(self, method: str, *args, **kwargs):
+        try:
+            return await getattr(self.remote, method)(*args, **kwargs)
+        except Exception:
+            self.remote_errors += 1
+            logger.warning("Dictionary cache: remote %s failed", method, exc_info=True)
+            return None
+
+    async def _remote_key(self, key: str, versioned: bool) -> str:
+        if not versioned:
+            return key
+        generation = await self._remote_call("get", GENERATION_KEY)
+        return f"{key}:{int(generation or 0)}"
+
+    async def get(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[Cached]]],
+        versioned: bool = False,
+    ) -> Optional[Cached]:
+        """Return the cached value for ``key``, loading it on a miss.
+
+        ``versioned`` keys (listings) are invalidated by any write.
+        ``loader`` returning None (not found) is not cached.
+        """
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        generation = self._generation
+        remote_key = None
+        if self.remote is not None:
+            remote_key = await self._remote_key(key, versioned)
+            raw = await self._remote_call("get", remote_key)
+            if raw is not None:
+                value = json.loads(raw)
+
+        if value is None:
+            value = await loader()
+            if value is None:
+                return None
+            if remote_key is not None and generation == self._generation:
+                await self._remote_call(
+                    "set", remote_key, json.dumps(value, default=str), ex=self.ttl)
+
+        if generation == self._generation:
+            self.local.set(key, value)
+        return value
+
+    async def invalidate(self, entry_id: Optional[int] = None) -> None:
+        """Drop ``entry_id`` and every cached listing."""
+        self._generation += 1
+        self.local.clear()
+        if self.remote is not None:
+            if entry_id is not None:
+                await self._remote_call("delete", self.entry_key(entry_id))
+            await self._remote_call("incr", GENERATION_KEY)
+
+    def use_remote(self, remote) -> None:
+        """Replace the shared tier, e.g. with an in-memory stand-in in tests.
+        The local tier is emptied so nothing read from the old one stays."""
+        self.remote = remote
+        self._generation += 1
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "local_size": len(self.local),
+            "local_hits": self.local.hits,
+            "local_misses": self.local.misses,
+            "remote": self.remote is not None,
+            "remote_errors": self.remote_errors,
+        }
+
+
+def _remote_client():
+    if not settings.REDIS_URL:
+        return None
+    if redis is None:
+        logger.warning("REDIS_URL is set but the redis package is not installed; "
+                       "dictionary cache runs in-process only")
+        return None
+    return redis.from_url(settings.REDIS_URL)
+
+
+dictionary_cache = DictionaryCache(
+    maxsize=settings.DICTIONARY_CACHE_MAX_SIZE,
+    ttl=settings.DICTIONARY_CACHE_TTL_SECONDS,
+    remote=_remote_client(),
+)
@@ -0,0 +1,255 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import text
+
+from app.db.schemas.word import DictionaryCreate
+from app.db.session import AsyncSessionLocal
+
+IMPORT_BATCH_SIZE = 5000
+# Only the first rejected rows are kept with their reason; all are counted
+MAX_REJECTED_SAMPLES = 100
+STAGE_TABLE = "dictionary_import"
+STAGE_COLUMNS = ("line", "text", "meaning", "example", "pronunciation", "difficulty", "language")
+
+# The stage only lives for one batch transaction, which also keeps it usable
+# behind a transaction-pooling pgbouncer
+CREATE_STAGE_SQL = f"""
+CREATE TEMP TABLE {STAGE_TABLE} (
+    line integer NOT NULL,
+    text varchar NOT NULL,
+    meaning text NOT NULL,
+    example text,
+    pronunciation varchar,
+    difficulty text NOT NULL,
+    language varchar NOT NULL
+) ON COMMIT DROP
+"""
+
+# The last occurrence of a (text, language) pair within a batch wins;
+# ON CONFLICT cannot touch the same row twice in one statement.
+UPSERT_SQL = f"""
+WITH staged AS (
+    SELECT DISTINCT ON (text, language)
+           text, meaning, example, pronunciation, difficulty, language
+    FROM {STAGE_TABLE}
+    ORDER BY text, language, line DESC
+), written AS (
+    INSERT INTO dictionary (text, meaning, example, pronunciation, difficulty, language, updated_at)
+    SELECT text, meaning, example, pronunciation,
+           CAST(difficulty AS difficultylevel), language, timezone('utc', now())
+    FROM staged
+    {{on_conflict}}
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT (SELECT count(*) FROM staged) AS staged,
+       count(*) FILTER (WHERE inserted) AS inserted,
+       count(*) FILTER (WHERE NOT inserted) AS updated
+FROM written
+"""
+
+ON_CONFLICT_UPDATE = """
+    ON CONFLICT (text, language) DO UPDATE SET
+        meaning = EXCLUDED.meaning,
+        example = EXCLUDED.example,
+        pronunciation = EXCLUDED.pronunciation,
+        difficulty = EXCLUDED.difficulty,
+        updated_at = EXCLUDED.updated_at
+    WHERE (dictionary.meaning, dictionary.example, dictionary.pronunciation, dictionary.difficulty)
+          IS DISTINCT FROM (EXCLUDED.meaning, EXCLUDED.example, EXCLUDED.pronunciation, EXCLUDED.difficulty)
+"""
+ON_CONFLICT_SKIP = "ON CONFLICT (text, language) DO NOTHING"
+
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+    # One JSON object per line as in wiktextract/kaikki.org dumps
+    WIKTIONARY = "wiktionary"
+
+
+class ConflictAction(str, Enum):
+    UPDATE = "update"
+    SKIP = "skip"
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    # Existing identical rows, or conflicts with ConflictAction.SKIP
+    unchanged: int = 0
+    # Repeated (text, language) pairs within a batch
+    duplicates: int = 0
+    rejected: int = 0
+    rejected_rows: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    done: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def reject(self, line: int, reason: str) -> None:
+        self.rejected += 1
+        if len(self.rejected_rows) < MAX_REJECTED_SAMPLES:
+            self.rejected_rows.append({"line": line, "reason": reason})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def open_text(stream: BinaryIO) -> TextIO:
+    """Wrap a binary stream for line-by-line reading, gunzipping if needed."""
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    # newline="" keeps quoted newlines intact for the csv module
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def _iter_csv(source: TextIO) -> Iterator[Tuple[int, Any]]:
+    reader = csv.DictReader(source)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_jsonl(source: TextIO) -> Iterator[Tuple[int, Any]]:
+    for line_no, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError:
+            yield line_no, None
+
+
+def _from_wiktionary(entry: Dict[str, Any]) -> Dict[str, Any]:
+    senses = entry.get("senses") or []
+    glosses = [gloss for sense in senses for gloss in sense.get("glosses") or []]
+    examples = [
+        example.get("text")
+        for sense in senses
+        for example in sense.get("examples") or []
+        if example.get("text")
+    ]
+    ipa = [sound["ipa"] for sound in entry.get("sounds") or [] if sound.get("ipa")]
+    return {
+        "text": entry.get("word"),
+        "meaning": "; ".join(glosses[:3]),
+        "example": examples[0] if examples else None,
+        "pronunciation": ipa[0] if ipa else None,
+        "language": entry.get("lang_code"),
+    }
+
+
+def iter_records(source: TextIO, fmt: ImportFormat) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(line, raw record)``; the record is None when unparseable."""
+    if fmt == ImportFormat.CSV:
+        yield from _iter_csv(source)
+        return
+    for line_no, record in _iter_jsonl(source):
+        if fmt == ImportFormat.WIKTIONARY and isinstance(record, dict):
+            record = _from_wiktionary(record)
+        yield line_no, record
+
+
+def _validate(record: Any, default_language: Optional[str]) -> Tuple[str, str, Optional[str], Optional[str], str, str]:
+    if not isinstance(record, dict):
+        raise ValueError("unparseable record")
+    # Blank CSV cells mean "not given"
+    values = {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in record.items()
+        if key and value not in (None, "")
+    }
+    if default_language:
+        values.setdefault("language", default_language)
+    try:
+        entry = DictionaryCreate.model_validate(values)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        raise ValueError(f"{location}: {error['msg']}")
+    if not entry.text or not entry.meaning or not entry.language:
+        raise ValueError("text, meaning and language must not be empty")
+    return (entry.text, entry.meaning, entry.example, entry.pronunciation,
+            entry.difficulty.name, entry.language)
+
+
+def _next_batch(records: Iterator[Tuple[int, Any]], size: int, default_language: Optional[str],
+                report: ImportReport) -> Optional[List[tuple]]:
+    """Parse up to ``size`` records; None once the input is exhausted."""
+    batch = []
+    exhausted = True
+    for line_no, record in islice(records, size):
+        exhausted = False
+        report.rows_read += 1
+        try:
+            batch.append((line_no, *_validate(record, default_language)))
+        except ValueError as exc:
+            report.reject(line_no, str(exc))
+    return None if exhausted else batch
+
+
+async def import_dictionary(
+    source: TextIO,
+    fmt: ImportFormat = ImportFormat.CSV,
+    on_conflict: ConflictAction = ConflictAction.UPDATE,
+    default_language: Optional[str] = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> AsyncIterator[ImportReport]:
+    """Upsert dictionary entries from ``source``, yielding progress per batch.
+
+    Records are parsed on a worker thread ``batch_size`` at a time, staged
+    with COPY into a temp table and merged into ``dictionary`` with one
+    INSERT ... ON CONFLICT per batch, so memory stays bounded whatever the
+    input size. Every batch commits on its own: an interrupted import keeps
+    the batches already written. The last report has ``done`` set.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    upsert = text(UPSERT_SQL.format(
+        on_conflict=ON_CONFLICT_UPDATE if on_conflict == ConflictAction.UPDATE else ON_CONFLICT_SKIP))
+    records = iter_records(source, fmt)
+
+    async with AsyncSessionLocal() as db:
+        while True:
+            batch = await asyncio.to_thread(
+                _next_batch, records, batch_size, default_language, report)
+            if batch is None:
+                break
+            if batch:
+                await db.execute(text(CREATE_STAGE_SQL))
+                connection = await db.connection()
+                raw = await connection.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    STAGE_TABLE, records=batch, columns=STAGE_COLUMNS)
+                staged, inserted, updated = (await db.execute(upsert)).one()
+                await db.commit()
+
+                report.inserted += inserted
+                report.updated += updated
+                report.unchanged += staged - inserted - updated
+                report.duplicates += len(batch) - staged
+            report.elapsed_seconds = time.perf_counter() - started
+            yield report
+
+    report.elapsed_seconds = time.perf_counter() - started
+    report.done = True
+    yield report
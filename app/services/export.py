@@ -0,0 +1,261 @@
+import csv
+import importlib.util
+import io
+import json
+import uuid
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+from sqlalchemy import Boolean, Date, DateTime, Integer, null, select, union_all
+from sqlalchemy.sql import Select
+
+from app.db.models.dictionary import Dictionary
+from app.db.models.practice_rollup import PracticeDailyRollup
+from app.db.models.practice_session import PracticeSession
+from app.db.models.word import Word
+from app.db.session import AsyncSessionLocal
+
+EXPORT_BATCH_SIZE = 2000
+
+WORD_COLUMNS = (
+    "word_id", "dictionary_id", "text", "meaning", "language", "difficulty",
+    "personal_note", "created_at", "ease_factor", "interval_days", "repetitions",
+    "lapses", "due_at", "last_reviewed_at", "total_practices", "correct_answers",
+    "streak", "last_practiced_at",
+)
+SESSION_COLUMNS = ("session_id", "session_correct", "session_created_at")
+# Days whose answers were compacted into a daily rollup
+ROLLUP_COLUMNS = ("rollup_day", "rollup_practices", "rollup_correct_answers")
+
+
+class ExportFormat(str, Enum):
+    # One object per word with its practice sessions and daily rollups nested
+    NDJSON = "ndjson"
+    # Flat formats: one row per practice session and per daily rollup, plus
+    # one per unpractised word
+    CSV = "csv"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+}
+
+
+def needs_arrow(fmt: ExportFormat) -> bool:
+    return fmt in (ExportFormat.PARQUET, ExportFormat.ARROW)
+
+
+def arrow_available() -> bool:
+    # pyarrow is an optional dependency, only needed for parquet/arrow. It
+    # is imported by the first such export, not at startup.
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def history_query(profile_id: uuid.UUID):
+    """Practice history of a profile: the raw answers still kept and the
+    daily rollups older answers were compacted into."""
+    answers = select(
+        PracticeSession.word_id,
+        PracticeSession.id.label("session_id"),
+        PracticeSession.correct.label("session_correct"),
+        PracticeSession.created_at.label("session_created_at"),
+        null().cast(Date).label("rollup_day"),
+        null().cast(Integer).label("rollup_practices"),
+        null().cast(Integer).label("rollup_correct_answers"),
+    ).where(PracticeSession.profile_id == profile_id)
+    rollups = select(
+        PracticeDailyRollup.word_id,
+        null().cast(Integer),
+        null().cast(Boolean),
+        null().cast(DateTime),
+        PracticeDailyRollup.day,
+        PracticeDailyRollup.total_practices,
+        PracticeDailyRollup.correct_answers,
+    ).where(PracticeDailyRollup.profile_id == profile_id)
+    return union_all(answers, rollups).subquery("history")
+
+
+def export_query(profile_id: uuid.UUID) -> Select:
+    """Words of a profile joined with their practice history, grouped by
+    word, oldest first. Rollups come first: they only hold days older than
+    any answer still kept."""
+    history = history_query(profile_id)
+    return (
+        select(
+            Word.id.label("word_id"),
+            Word.dictionary_id,
+            Dictionary.text,
+            Dictionary.meaning,
+            Dictionary.language,
+            Dictionary.difficulty,
+            Word.personal_note,
+            Word.created_at,
+            Word.ease_factor,
+            Word.interval_days,
+            Word.repetitions,
+            Word.lapses,
+            Word.due_at,
+            Word.last_reviewed_at,
+            Word.total_practices,
+            Word.correct_answers,
+            Word.streak,
+            Word.last_practiced_at,
+            history.c.session_id,
+            history.c.session_correct,
+            history.c.session_created_at,
+            history.c.rollup_day,
+            history.c.rollup_practices,
+            history.c.rollup_correct_answers,
+        )
+        .join(Dictionary, Dictionary.id == Word.dictionary_id)
+        .outerjoin(history, history.c.word_id == Word.id)
+        .where(Word.profile_id == profile_id)
+        # NULLS LAST puts the answers after the rollups
+        .order_by(Word.id, history.c.rollup_day, history.c.session_created_at,
+                  history.c.session_id)
+    )
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+async def _partitions(profile_id: uuid.UUID) -> AsyncIterator[Sequence[Any]]:
+    """Stream the export rows in batches from one read-only snapshot.
+
+    Runs on its own session: request-scoped dependencies are closed before
+    a streaming body is sent.
+    """
+    query = export_query(profile_id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    async with AsyncSessionLocal() as db:
+        await db.connection(execution_options={
+            "isolation_level": "REPEATABLE READ",
+            "postgresql_readonly": True,
+        })
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+
+async def export_ndjson(profile_id: uuid.UUID) -> AsyncIterator[bytes]:
+    word: Dict[str, Any] = {}
+    async for partition in _partitions(profile_id):
+        lines = []
+        for row in partition:
+            if row.word_id != word.get("word_id"):
+                if word:
+                    lines.append(json.dumps(word))
+                word = {column: _plain(getattr(row, column)) for column in WORD_COLUMNS}
+                word["daily_rollups"] = []
+                word["practice_sessions"] = []
+            if row.rollup_day is not None:
+                word["daily_rollups"].append({
+                    "day": _plain(row.rollup_day),
+                    "total_practices": row.rollup_practices,
+                    "correct_answers": row.rollup_correct_answers,
+                })
+            elif row.session_id is not None:
+                word["practice_sessions"].append({
+                    "id": row.session_id,
+                    "correct": row.session_correct,
+                    "created_at": _plain(row.session_created_at),
+                })
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+    if word:
+        yield (json.dumps(word) + "\n").encode()
+
+
+async def export_csv(profile_id: uuid.UUID) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(WORD_COLUMNS + SESSION_COLUMNS + ROLLUP_COLUMNS)
+    async for partition in _partitions(profile_id):
+        writer.writerows([_plain(value) for value in row] for row in partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _arrow_schema(pa):
+    timestamp = pa.timestamp("us")
+    return pa.schema([
+        ("word_id", pa.int64()), ("dictionary_id", pa.int64()),
+        ("text", pa.string()), ("meaning", pa.string()), ("language", pa.string()),
+        ("difficulty", pa.string()), ("personal_note", pa.string()),
+        ("created_at", timestamp), ("ease_factor", pa.float64()),
+        ("interval_days", pa.float64()), ("repetitions", pa.int64()),
+        ("lapses", pa.int64()), ("due_at", timestamp), ("last_reviewed_at", timestamp),
+        ("total_practices", pa.int64()), ("correct_answers", pa.int64()),
+        ("streak", pa.int64()), ("last_practiced_at", timestamp),
+        ("session_id", pa.int64()), ("session_correct", pa.bool_()),
+        ("session_created_at", timestamp), ("rollup_day", pa.date32()),
+        ("rollup_practices", pa.int64()), ("rollup_correct_answers", pa.int64()),
+    ])
+
+
+async def export_arrow(profile_id: uuid.UUID, parquet: bool) -> AsyncIterator[bytes]:
+    """Stream an Arrow IPC stream, or Parquet with one row group per batch."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa)
+    columns = WORD_COLUMNS + SESSION_COLUMNS + ROLLUP_COLUMNS
+    sink = _ChunkSink()
+    if parquet:
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    async for partition in _partitions(profile_id):
+        batch = pa.record_batch(
+            [[row[i].value if isinstance(row[i], Enum) else row[i] for row in partition]
+             for i in range(len(columns))],
+            schema=schema,
+        )
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def export_stream(profile_id: uuid.UUID, fmt: ExportFormat) -> AsyncIterator[bytes]:
+    if fmt == ExportFormat.CSV:
+        return export_csv(profile_id)
+    if needs_arrow(fmt):
+        return export_arrow(profile_id, parquet=fmt == ExportFormat.PARQUET)
+    return export_ndjson(profile_id)
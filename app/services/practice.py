@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.practice_session import PracticeSession
+from app.db.models.word import Word
+from app.services.scheduler import grade_for, review_word
+
+
+@dataclass
+class PracticeAnswer:
+    word_id: int
+    correct: bool
+    answered_at: Optional[datetime] = None
+    quality: Optional[int] = None
+
+
+@dataclass
+class PracticeOutcome:
+    recorded: int = 0
+    rejected_word_ids: List[int] = field(default_factory=list)
+    words: Dict[int, Word] = field(default_factory=dict)
+
+
+def _as_utc_naive(value: Optional[datetime], now: datetime) -> datetime:
+    # Columns store naive UTC; never accept answers from the future
+    if value is None:
+        return now
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return min(value, now)
+
+
+def count_answer(word: Word, correct: bool, answered_at: datetime) -> None:
+    """Fold one answer into a word's running practice counters."""
+    word.total_practices = (word.total_practices or 0) + 1
+    if correct:
+        word.correct_answers = (word.correct_answers or 0) + 1
+        word.streak = (word.streak or 0) + 1
+    else:
+        word.streak = 0
+    if word.last_practiced_at is None or answered_at > word.last_practiced_at:
+        word.last_practiced_at = answered_at
+
+
+async def record_practice(
+    db: AsyncSession,
+    profile_id: uuid.UUID,
+    answers: Sequence[PracticeAnswer],
+) -> PracticeOutcome:
+    """Record answers for one profile and update each word's review state
+    and practice counters.
+
+    Ownership of every word is checked with a single locking query and all
+    practice rows go out in one multi-row INSERT. Answers for words the
+    profile does not own are skipped and reported. The caller commits.
+    """
+    outcome = PracticeOutcome()
+    if not answers:
+        return outcome
+
+    word_ids = sorted({answer.word_id for answer in answers})
+    # Lock in id order so concurrent batches cannot deadlock
+    words = await db.scalars(
+        select(Word)
+        .where(Word.id.in_(word_ids), Word.profile_id == profile_id)
+        .order_by(Word.id)
+        .with_for_update()
+    )
+    outcome.words = {word.id: word for word in words}
+
+    now = datetime.utcnow()
+    rows = []
+    ordered = sorted(
+        answers, key=lambda answer: _as_utc_naive(answer.answered_at, now))
+    for answer in ordered:
+        word = outcome.words.get(answer.word_id)
+        if word is None:
+            outcome.rejected_word_ids.append(answer.word_id)
+            continue
+        answered_at = _as_utc_naive(answer.answered_at, now)
+        review_word(word, grade_for(answer.correct, answer.quality), answered_at)
+        count_answer(word, answer.correct, answered_at)
+        rows.append({
+            "word_id": word.id,
+            "profile_id": profile_id,
+            "correct": answer.correct,
+            "created_at": answered_at,
+        })
+
+    if rows:
+        await db.execute(insert(PracticeSession).values(rows))
+    outcome.recorded = len(rows)
+    return outcome
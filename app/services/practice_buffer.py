@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db.models.practice_flush import PracticeFlush
+from app.db.session import AsyncSessionLocal
+from app.services.practice import PracticeAnswer, record_practice
+
+logger = logging.getLogger(__name__)
+
+# Claimed events that are not flushed within this time are taken over by
+# the next flusher, in this or another worker
+LEASE_SECONDS = 60
+# Flush tokens only need to outlive the leases; pruned once an hour
+TOKEN_RETENTION = timedelta(days=1)
+PRUNE_INTERVAL_SECONDS = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS practice_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile_id TEXT NOT NULL,
+    word_id INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    quality INTEGER,
+    answered_at TEXT NOT NULL,
+    token TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS ix_practice_events_token ON practice_events (token);
+"""
+
+Event = Tuple[uuid.UUID, PracticeAnswer]
+
+
+class PracticeBuffer:
+    """Durable write-behind queue for practice answers.
+
+    Answers are appended to a SQLite file in WAL mode that every worker on
+    the host shares. A flusher claims a batch by leasing it under a fresh
+    token, records it with ``record_practice`` in one database transaction
+    that also stores the token, then deletes it locally. A batch whose lease
+    expires (its flusher died, failed or stalled) is retried whole under the
+    same token. The token's primary key lets only one transaction per batch
+    commit, even while the first flusher is still running, so every answer
+    is recorded exactly once.
+
+    WAL with synchronous=NORMAL survives a crash of the process; an OS crash
+    can lose the most recent answers.
+    """
+
+    def __init__(self, path: str, max_events: int, interval: float):
+        self.path = path
+        self.max_events = max_events
+        self.interval = interval
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._wake = asyncio.Event()
+        self._unflushed = 0
+        self._last_prune = 0.0
+        self.flushed = 0
+        self.flushes = 0
+        self.recovered = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def open(self) -> None:
+        if self._db is not None:
+            return
+        # Shared by all workers on the host; safe to open concurrently
+        db = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        self._db = db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _transaction(self, work):
+        self.open()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._db)
+                self._db.execute("COMMIT")
+                return result
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _append(self, rows: List[tuple]) -> None:
+        self._transaction(lambda db: db.executemany(
+            "INSERT INTO practice_events "
+            "(profile_id, word_id, correct, quality, answered_at) VALUES (?, ?, ?, ?, ?)",
+            rows))
+
+    async def enqueue(self, profile_id: uuid.UUID, answers: Sequence[PracticeAnswer]) -> int:
+        """Persist answers locally; they are recorded by the next flush."""
+        now = datetime.utcnow()
+        rows = [
+            (str(profile_id), answer.word_id, int(answer.correct), answer.quality,
+             (answer.answered_at or now).isoformat())
+            for answer in answers
+        ]
+        await asyncio.to_thread(self._append, rows)
+        self._unflushed += len(rows)
+        if self._unflushed >= self.max_events:
+            self._wake.set()
+        return len(rows)
+
+    def _expired_tokens(self) -> List[str]:
+        self.open()
+        with self._lock:
+            return [token for token, in self._db.execute(
+                "SELECT DISTINCT token FROM practice_events "
+                "WHERE token IS NOT NULL AND lease_until < ?", (time.time(),))]
+
+    def _forget(self, tokens: Set[str]) -> None:
+        self._transaction(lambda db: db.executemany(
+            "DELETE FROM practice_events WHERE token = ?", [(token,) for token in tokens]))
+
+    def _claim(self, limit: int) -> Tuple[str, List[Event]]:
+        now = time.time()
+
+        def lease(db):
+            expired = db.execute(
+                "SELECT token FROM practice_events WHERE token IS NOT NULL AND lease_until < ? "
+                "ORDER BY seq LIMIT 1", (now,)).fetchone()
+            if expired:
+                # Taken over whole and under its token: should its first
+                # flusher still commit, this flush fails on the token
+                token = expired[0]
+                db.execute("UPDATE practice_events SET lease_until = ? WHERE token = ?",
+                           (now + LEASE_SECONDS, token))
+            else:
+                token = str(uuid.uuid4())
+                db.execute(
+                    "UPDATE practice_events SET token = ?, lease_until = ? WHERE seq IN ("
+                    "  SELECT seq FROM practice_events WHERE token IS NULL ORDER BY seq LIMIT ?)",
+                    (token, now + LEASE_SECONDS, limit))
+            return token, db.execute(
+                "SELECT profile_id, word_id, correct, quality, answered_at "
+                "FROM practice_events WHERE token = ? ORDER BY seq", (token,)).fetchall()
+
+        token, rows = self._transaction(lease)
+        events = [
+            (uuid.UUID(profile_id), PracticeAnswer(
+                word_id=word_id,
+                correct=bool(correct),
+                quality=quality,
+                answered_at=datetime.fromisoformat(answered_at),
+            ))
+            for profile_id, word_id, correct, quality, answered_at in rows
+        ]
+        return token, events
+
+    async def _recover(self) -> None:
+        # Expired leases: batches whose flusher died or failed
+        tokens = await asyncio.to_thread(self._expired_tokens)
+        if not tokens:
+            return
+        async with AsyncSessionLocal() as db:
+            committed = {str(token) for token in await db.scalars(
+                select(PracticeFlush.token).where(
+                    PracticeFlush.token.in_([uuid.UUID(token) for token in tokens])))}
+        if committed:
+            await asyncio.to_thread(self._forget, committed)
+            self.recovered += len(committed)
+
+    async def flush_once(self) -> int:
+        """Record one batch of buffered answers; returns how many."""
+        await self._recover()
+        self._unflushed = 0
+        token, events = await asyncio.to_thread(self._claim, self.max_events)
+        if not events:
+            return 0
+
+        async with AsyncSessionLocal() as db:
+            try:
+                # First, so a flush of the same batch by a flusher whose
+                # lease expired waits here and fails once that one commits
+                await db.execute(insert(PracticeFlush).values(token=uuid.UUID(token)))
+            except IntegrityError:
+                await db.rollback()
+                recorded = False
+            else:
+                # Profiles in a fixed order so concurrent flushers lock words
+                # in the same order and cannot deadlock
+                events.sort(key=lambda event: event[0])
+                for profile_id, group in groupby(events, key=lambda event: event[0]):
+                    outcome = await record_practice(db, profile_id, [answer for _, answer in group])
+                    if outcome.rejected_word_ids:
+                        self.rejected += len(outcome.rejected_word_ids)
+                        logger.warning(
+                            "Dropped buffered answers for unknown words %s of profile %s",
+                            outcome.rejected_word_ids, profile_id)
+                await db.commit()
+                recorded = True
+
+        await asyncio.to_thread(self._forget, {token})
+        if not recorded:
+            # Recorded by another flusher after this one's lease expired
+            self.recovered += 1
+            return len(events)
+        self.flushed += len(events)
+        self.flushes += 1
+        return len(events)
+
+    async def drain(self) -> None:
+        """Flush until nothing is left that this worker can claim."""
+        while await self.flush_once() == self.max_events:
+            pass
+
+    async def _prune_tokens(self) -> None:
+        if time.monotonic() - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(PracticeFlush).where(
+                PracticeFlush.flushed_at < datetime.utcnow() - TOKEN_RETENTION))
+            await db.commit()
+        self._last_prune = time.monotonic()
+
+    async def run(self) -> None:
+        """Flush now, then on the size or time trigger, until cancelled."""
+        while True:
+            try:
+                await self.drain()
+                await self._prune_tokens()
+            except Exception:
+                # The batch stays leased and is retried once the lease expires
+                self.errors += 1
+                logger.exception("Practice buffer flush failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        pending = 0
+        if self._db is not None:
+            with self._lock:
+                pending = self._db.execute("SELECT count(*) FROM practice_events").fetchone()[0]
+        return {
+            "enabled": settings.PRACTICE_WRITE_BEHIND,
+            "pending": pending,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "recovered_batches": self.recovered,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
+
+
+practice_buffer = PracticeBuffer(
+    settings.PRACTICE_BUFFER_PATH,
+    settings.PRACTICE_FLUSH_MAX_EVENTS,
+    settings.PRACTICE_FLUSH_INTERVAL_MS / 1000,
+)
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.db.models.practice_session import DEFAULT_PARTITION
+from app.db.session import get_async_engine
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PATTERN = re.compile(r"^practice_sessions_p(\d{4})(\d{2})$")
+
+# Held for the whole run so that only one worker maintains the partitions
+MAINTENANCE_LOCK_KEY = 0x70726163  # "prac"
+# SQLSTATE of a statement that gave up waiting after lock_timeout
+LOCK_NOT_AVAILABLE = "55P03"
+
+CHILD_PARTITIONS_SQL = """
+SELECT c.relname
+FROM pg_inherits AS i
+JOIN pg_class AS c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'practice_sessions'::regclass
+"""
+
+SESSION_COLUMNS = "id, word_id, profile_id, correct, created_at"
+
+# Daily per-word summary of the answers in ``source``. The day's last miss
+# and the correct answers after it are kept so streaks can be rebuilt.
+# Merging into an already compacted day (late answers that landed in the
+# default partition) keeps the trailing streak of whichever part holds the
+# later miss.
+ROLLUP_SQL = """
+WITH source AS ({source}),
+answers AS (
+    SELECT word_id, correct, created_at,
+           CAST(created_at AS date) AS day,
+           max(created_at) FILTER (WHERE NOT correct)
+               OVER (PARTITION BY word_id, CAST(created_at AS date)) AS day_last_miss
+    FROM source
+    WHERE word_id IS NOT NULL
+)
+INSERT INTO practice_daily_rollups AS r (
+    profile_id, day, word_id, total_practices, correct_answers,
+    last_practiced_at, last_miss_at, trailing_correct
+)
+SELECT w.profile_id, a.day, a.word_id,
+       count(*),
+       count(*) FILTER (WHERE a.correct),
+       max(a.created_at),
+       max(a.day_last_miss),
+       count(*) FILTER (
+           WHERE a.correct AND a.created_at > COALESCE(a.day_last_miss, '-infinity'::timestamp))
+FROM answers AS a
+JOIN words AS w ON w.id = a.word_id
+GROUP BY w.profile_id, a.day, a.word_id
+ON CONFLICT (profile_id, day, word_id) DO UPDATE SET
+    total_practices = r.total_practices + EXCLUDED.total_practices,
+    correct_answers = r.correct_answers + EXCLUDED.correct_answers,
+    last_practiced_at = GREATEST(r.last_practiced_at, EXCLUDED.last_practiced_at),
+    last_miss_at = GREATEST(r.last_miss_at, EXCLUDED.last_miss_at),
+    trailing_correct = CASE
+        WHEN r.last_miss_at IS NULL AND EXCLUDED.last_miss_at IS NULL
+            THEN r.trailing_correct + EXCLUDED.trailing_correct
+        WHEN COALESCE(EXCLUDED.last_miss_at, '-infinity'::timestamp)
+             > COALESCE(r.last_miss_at, '-infinity'::timestamp)
+            THEN EXCLUDED.trailing_correct
+        ELSE r.trailing_correct
+    END
+"""
+
+
+@dataclass
+class MaintenanceReport:
+    created: List[str] = field(default_factory=list)
+    compacted: List[str] = field(default_factory=list)
+    rollup_rows: int = 0
+    # Partitions left for the next run because dropping them timed out
+    deferred: List[str] = field(default_factory=list)
+    expired_rollups: int = 0
+    # Another worker held the maintenance lock
+    skipped: bool = False
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"practice_sessions_p{month:%Y%m}"
+
+
+def existing_partitions(conn: Connection) -> List[date]:
+    """Months that have their own partition, oldest first."""
+    months = []
+    for name in conn.execute(text(CHILD_PARTITIONS_SQL)).scalars():
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def create_partition(conn: Connection, month: date) -> None:
+    """Create the partition of ``month``.
+
+    Rows of that month already caught by the default partition are moved
+    into the new table before it is attached; attaching would fail otherwise.
+    """
+    name = partition_name(month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    conn.execute(text(
+        f"CREATE TABLE {name} (LIKE practice_sessions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(
+        f"WITH moved AS ("
+        f"  DELETE FROM {DEFAULT_PARTITION}"
+        f"  WHERE created_at >= :start AND created_at < :end"
+        f"  RETURNING {SESSION_COLUMNS}"
+        f") INSERT INTO {name} ({SESSION_COLUMNS}) SELECT {SESSION_COLUMNS} FROM moved"
+    ), {"start": month, "end": add_months(month, 1)})
+    conn.execute(text(
+        f"ALTER TABLE practice_sessions ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"))
+
+
+def ensure_partitions(conn: Connection, months_ahead: int, today: date) -> List[str]:
+    """Create the partitions of the current month and ``months_ahead`` more."""
+    existing = set(existing_partitions(conn))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(month_start(today), offset)
+        if month not in existing:
+            create_partition(conn, month)
+            conn.commit()
+            created.append(partition_name(month))
+    return created
+
+
+def compact(conn: Connection, cutoff: date) -> MaintenanceReport:
+    """Roll up and drop the raw answers from before ``cutoff`` (a month start).
+
+    Each partition is summarized and dropped in one transaction, with writes
+    to it blocked in between so no answer is lost.
+
+    Dropping a partition takes an ACCESS EXCLUSIVE lock on practice_sessions
+    (DETACH ... CONCURRENTLY is not allowed next to the default partition).
+    It is held only for the drop, but while it waits behind a long reader,
+    such as an export, every read and insert of practice history queues
+    behind it. So the wait is capped at PRACTICE_COMPACT_LOCK_TIMEOUT_MS.
+    On timeout the partition's rollup is rolled back and the partition
+    waits for the next run.
+    """
+    report = MaintenanceReport()
+    for month in existing_partitions(conn):
+        if add_months(month, 1) > cutoff:
+            break
+        name = partition_name(month)
+        conn.execute(text(f"LOCK TABLE {name} IN SHARE MODE"))
+        result = conn.execute(text(ROLLUP_SQL.format(
+            source=f"SELECT word_id, correct, created_at FROM {name}")))
+        conn.execute(text(
+            f"SET LOCAL lock_timeout = {int(settings.PRACTICE_COMPACT_LOCK_TIMEOUT_MS)}"))
+        try:
+            conn.execute(text(f"DROP TABLE {name}"))
+        except DBAPIError as exc:
+            if getattr(exc.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            conn.rollback()
+            logger.warning("Practice history: %s is in use, compacting it next run", name)
+            report.deferred.append(name)
+            break
+        conn.commit()
+        report.compacted.append(name)
+        report.rollup_rows += result.rowcount
+
+    result = conn.execute(text(ROLLUP_SQL.format(
+        source=f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff "
+               f"RETURNING word_id, correct, created_at"
+    )), {"cutoff": cutoff})
+    conn.commit()
+    if result.rowcount:
+        report.compacted.append(DEFAULT_PARTITION)
+        report.rollup_rows += result.rowcount
+    return report
+
+
+def expire_rollups(conn: Connection, before: date) -> int:
+    result = conn.execute(
+        text("DELETE FROM practice_daily_rollups WHERE day < :before"), {"before": before})
+    conn.commit()
+    return result.rowcount
+
+
+def maintain(conn: Connection, today: Optional[date] = None) -> MaintenanceReport:
+    """Create upcoming partitions, compact raw answers older than
+    PRACTICE_RAW_RETENTION_MONTHS and expire rollups older than
+    PRACTICE_ROLLUP_RETENTION_DAYS.
+
+    Commits as it goes. Returns a skipped report when another worker is
+    already running it.
+    """
+    today = today or datetime.utcnow().date()
+    if not conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}).scalar():
+        conn.rollback()
+        return MaintenanceReport(skipped=True)
+    try:
+        conn.commit()
+        created = ensure_partitions(conn, settings.PRACTICE_PARTITIONS_AHEAD, today)
+        report = MaintenanceReport(created=created)
+        if settings.PRACTICE_RAW_RETENTION_MONTHS > 0:
+            compacted = compact(conn, add_months(
+                month_start(today), -settings.PRACTICE_RAW_RETENTION_MONTHS))
+            report.compacted = compacted.compacted
+            report.rollup_rows = compacted.rollup_rows
+            report.deferred = compacted.deferred
+        if settings.PRACTICE_ROLLUP_RETENTION_DAYS > 0:
+            report.expired_rollups = expire_rollups(
+                conn, today - timedelta(days=settings.PRACTICE_ROLLUP_RETENTION_DAYS))
+        return report
+    finally:
+        conn.rollback()
+        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+        conn.commit()
+
+
+async def run_maintenance() -> MaintenanceReport:
+    async with get_async_engine().connect() as conn:
+        return await conn.run_sync(maintain)
+
+
+async def maintain_periodically(interval: int) -> None:
+    """Run the partition maintenance now and every ``interval`` seconds until cancelled."""
+    while True:
+        try:
+            report = await run_maintenance()
+            if report.created or report.compacted or report.deferred or report.expired_rollups:
+                logger.info("Practice history maintenance: %s", report)
+        except Exception:
+            logger.exception("Practice history maintenance failed")
+        await asyncio.sleep(interval)
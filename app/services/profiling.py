@@ -0,0 +1,144 @@
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import re
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # optional dependency; cProfile is used without it
+    Profiler = None
+
+# <UTC time>-<random>, so names sort oldest first across workers
+TRACE_ID_PATTERN = re.compile(r"^\d{8}T\d{12}-[0-9a-f]{8}$")
+# Functions listed in the text summary of a cProfile trace
+SUMMARY_FUNCTIONS = 40
+
+
+class RequestProfiler:
+    """Profiles one request with pyinstrument when installed, else cProfile.
+
+    pyinstrument follows the request's task across awaits and leaves out
+    other requests. cProfile hooks the whole thread, so work done for other
+    requests on the event loop while this one is awaiting shows up too.
+    """
+
+    def __init__(self):
+        if Profiler is not None:
+            self.kind = "pyinstrument"
+            self._profiler = Profiler(async_mode="enabled")
+        else:
+            self.kind = "cprofile"
+            self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        if self.kind == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if self.kind == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def output(self) -> Tuple[str, bytes, str]:
+        """Returns (file extension, profile data, text summary)."""
+        if self.kind == "pyinstrument":
+            return "html", self._profiler.output_html().encode(), self._profiler.output_text()
+        summary = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=summary)
+        stats.sort_stats("cumulative").print_stats(SUMMARY_FUNCTIONS)
+        # Same format as Profile.dump_stats; opens in snakeviz or pstats
+        return "prof", marshal.dumps(stats.stats), summary.getvalue()
+
+
+class TraceStore:
+    """Bounded on-disk ring buffer of request profiles.
+
+    Each trace is ``<id>.json`` (request, SQL timeline, text summary) next
+    to the profile itself. Once more than ``max_traces`` are stored, the
+    oldest are deleted. Workers on a host may share the directory.
+    """
+
+    def __init__(self, directory: str, max_traces: int):
+        self.directory = directory
+        self.max_traces = max_traces
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names
+                      if name.endswith(".json") and TRACE_ID_PATTERN.match(name[:-5]))
+
+    def save(self, trace_id: str, meta: dict, extension: str, data: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, f"{trace_id}.{extension}"), "wb") as f:
+            f.write(data)
+        meta = {**meta, "id": trace_id, "file": f"{trace_id}.{extension}"}
+        # The metadata is written last: a trace is listed once it is complete
+        path = os.path.join(self.directory, f"{trace_id}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f, default=str)
+        os.replace(path + ".tmp", path)
+        self._prune()
+
+    def store(self, trace_id: str, meta: dict, profiler: RequestProfiler) -> None:
+        """Render a stopped profiler and save it with its text summary."""
+        extension, data, summary = profiler.output()
+        self.save(trace_id, {**meta, "summary": summary}, extension, data)
+
+    def _prune(self) -> None:
+        ids = self._ids()
+        for trace_id in ids[:max(len(ids) - self.max_traces, 0)]:
+            for name in os.listdir(self.directory):
+                if name.startswith(trace_id + "."):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        # Pruned by another worker
+                        pass
+
+    def list(self) -> List[dict]:
+        """Trace summaries, newest first."""
+        traces = []
+        for trace_id in reversed(self._ids()):
+            meta = self.get(trace_id)
+            if meta is not None:
+                traces.append({key: meta.get(key) for key in (
+                    "id", "method", "path", "route", "status", "duration_ms", "db_ms",
+                    "queries", "trigger", "profiler", "created_at")})
+        return traces
+
+    def get(self, trace_id: str) -> Optional[dict]:
+        if not TRACE_ID_PATTERN.match(trace_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{trace_id}.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def profile_path(self, trace_id: str) -> Optional[str]:
+        meta = self.get(trace_id)
+        if meta is None:
+            return None
+        path = os.path.join(self.directory, meta["file"])
+        return path if os.path.exists(path) else None
+
+
+trace_store = TraceStore(settings.PROFILING_DIR, settings.PROFILING_MAX_TRACES)
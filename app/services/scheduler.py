@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# A failed card comes back within the same session
+RELEARN_STEP = timedelta(minutes=10)
+PASS_GRADE = 3
+CORRECT_GRADE = 4
+INCORRECT_GRADE = 1
+
+
+@dataclass
+class ReviewState:
+    ease_factor: float = DEFAULT_EASE
+    interval_days: float = 0.0
+    repetitions: int = 0
+    lapses: int = 0
+    due_at: Optional[datetime] = None
+
+
+def grade_for(correct: bool, quality: Optional[int] = None) -> int:
+    """SM-2 grade (0-5) for an answer; explicit ``quality`` wins."""
+    if quality is not None:
+        return quality
+    return CORRECT_GRADE if correct else INCORRECT_GRADE
+
+
+def schedule(state: ReviewState, grade: int, reviewed_at: datetime) -> ReviewState:
+    """Return the state after answering a card with ``grade`` at ``reviewed_at``."""
+    ease = state.ease_factor + (0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    ease = max(MIN_EASE, ease)
+
+    if grade < PASS_GRADE:
+        return ReviewState(
+            ease_factor=ease,
+            interval_days=0.0,
+            repetitions=0,
+            lapses=state.lapses + 1,
+            due_at=reviewed_at + RELEARN_STEP,
+        )
+
+    if state.repetitions == 0:
+        interval = 1.0
+    elif state.repetitions == 1:
+        interval = 6.0
+    else:
+        interval = round(max(state.interval_days, 1.0) * state.ease_factor, 2)
+
+    return ReviewState(
+        ease_factor=ease,
+        interval_days=interval,
+        repetitions=state.repetitions + 1,
+        lapses=state.lapses,
+        due_at=reviewed_at + timedelta(days=interval),
+    )
+
+
+def review_word(word, grade: int, reviewed_at: datetime) -> None:
+    """Apply an answer to a ``Word``'s scheduling columns in place."""
+    state = schedule(
+        ReviewState(
+            ease_factor=word.ease_factor if word.ease_factor is not None else DEFAULT_EASE,
+            interval_days=word.interval_days or 0.0,
+            repetitions=word.repetitions or 0,
+            lapses=word.lapses or 0,
+        ),
+        grade,
+        reviewed_at,
+    )
+    word.ease_factor = state.ease_factor
+    word.interval_days = state.interval_days
+    word.repetitions = state.repetitions
+    word.lapses = state.lapses
+    word.due_at = state.due_at
+    word.last_reviewed_at = reviewed_at
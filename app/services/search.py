@@ -0,0 +1,87 @@
+import enum
+from typing import List, Optional
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.dictionary import Dictionary
+from app.db.schemas.word import DictionaryRead, SearchHit, SearchResults
+
+# Must match the configuration of Dictionary.search_vector
+TS_CONFIG = literal_column("'simple'::regconfig")
+SUGGESTION_LIMIT = 5
+
+
+class SearchMode(str, enum.Enum):
+    SUBSTRING = "substring"
+    FULLTEXT = "fulltext"
+    FUZZY = "fuzzy"
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains(column, term: str):
+    """Case-insensitive substring match, served by the pg_trgm GIN index."""
+    return column.ilike(f"%{escape_like(term)}%", escape="\\")
+
+
+def _scoped(query, language: Optional[str]):
+    if language:
+        query = query.where(Dictionary.language == language)
+    return query
+
+
+def search_query(q: str, mode: SearchMode, language: Optional[str], limit: int):
+    if mode == SearchMode.FULLTEXT:
+        ts_query = func.websearch_to_tsquery(TS_CONFIG, q)
+        score = func.ts_rank_cd(Dictionary.search_vector, ts_query)
+        condition = Dictionary.search_vector.op("@@")(ts_query)
+    elif mode == SearchMode.FUZZY:
+        score = func.similarity(Dictionary.text, q)
+        condition = Dictionary.text.op("%")(q)
+    else:
+        score = func.similarity(Dictionary.text, q)
+        condition = contains(Dictionary.text, q)
+
+    query = (
+        select(Dictionary, score.label("score"))
+        .where(condition)
+        .order_by(score.desc(), Dictionary.id)
+        .limit(limit)
+    )
+    return _scoped(query, language)
+
+
+async def suggest(db: AsyncSession, q: str, language: Optional[str], limit: int = SUGGESTION_LIMIT) -> List[str]:
+    """"Did you mean" candidates: closest spellings by trigram similarity."""
+    score = func.similarity(Dictionary.text, q)
+    query = _scoped(
+        select(Dictionary.text)
+        .where(Dictionary.text.op("%")(q))
+        .order_by(score.desc(), Dictionary.text)
+        .limit(limit),
+        language,
+    )
+    return list(await db.scalars(query))
+
+
+async def search_dictionary(
+    db: AsyncSession,
+    q: str,
+    mode: SearchMode = SearchMode.FULLTEXT,
+    language: Optional[str] = None,
+    limit: int = 20,
+) -> SearchResults:
+    """Ranked dictionary search; falls back to suggestions when nothing matches."""
+    rows = (await db.execute(search_query(q, mode, language, limit))).all()
+    items = [
+        SearchHit(**DictionaryRead.model_validate(entry).model_dump(), score=score)
+        for entry, score in rows
+    ]
+    suggestions: List[str] = []
+    if not items and mode != SearchMode.FUZZY:
+        suggestions = await suggest(db, q, language)
+    return SearchResults(mode=mode.value, items=items, suggestions=suggestions)
@@ -0,0 +1,171 @@
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Optional
+import uuid
+
+from sqlalchemy import Date, Integer, cast, func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.db.models.dictionary import Dictionary
+from app.db.models.practice_rollup import PracticeDailyRollup
+from app.db.models.practice_session import PracticeSession
+from app.db.models.word import DifficultyLevel, Word
+from app.db.schemas.word import (
+    DailyActivity,
+    DifficultyStats,
+    ProfileStatsSummary,
+    WordStatsItem,
+)
+from app.db.session import AsyncSessionLocal
+
+STREAM_BATCH_SIZE = 1000
+
+
+def success_rate(total: int, correct: int) -> float:
+    return (correct / total * 100) if total > 0 else 0.0
+
+
+def word_stats_query(profile_id: uuid.UUID, difficulty: Optional[DifficultyLevel] = None) -> Select:
+    """Per-word stats for a profile, read straight from the word counters."""
+    query = (
+        select(
+            Word.id,
+            Word.dictionary_id,
+            Dictionary.text,
+            Dictionary.difficulty,
+            Word.total_practices,
+            Word.correct_answers,
+            Word.streak,
+            Word.last_practiced_at,
+        )
+        .join(Dictionary, Dictionary.id == Word.dictionary_id)
+        .where(Word.profile_id == profile_id)
+        .order_by(Word.id)
+    )
+    if difficulty:
+        query = query.where(Dictionary.difficulty == difficulty)
+    return query
+
+
+def to_word_stats_item(row) -> WordStatsItem:
+    return WordStatsItem(
+        word_id=row.id,
+        dictionary_id=row.dictionary_id,
+        text=row.text,
+        difficulty=row.difficulty,
+        total_practices=row.total_practices,
+        correct_answers=row.correct_answers,
+        success_rate=success_rate(row.total_practices, row.correct_answers),
+        last_practiced=row.last_practiced_at,
+        streak=row.streak,
+    )
+
+
+async def stream_word_stats_ndjson(
+    profile_id: uuid.UUID,
+    difficulty: Optional[DifficultyLevel] = None,
+) -> AsyncIterator[bytes]:
+    """Yield one JSON line per word using a server-side cursor.
+
+    Runs on its own session: request-scoped dependencies are closed before
+    a streaming body is sent.
+    """
+    query = word_stats_query(profile_id, difficulty).execution_options(
+        yield_per=STREAM_BATCH_SIZE)
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield b"".join(
+                to_word_stats_item(row).model_dump_json().encode() + b"\n"
+                for row in partition
+            )
+
+
+def difficulty_rollup_query(profile_id: uuid.UUID) -> Select:
+    """Word count and practice totals of a profile per difficulty."""
+    return (
+        select(
+            Dictionary.difficulty,
+            func.count(Word.id),
+            func.coalesce(func.sum(Word.total_practices), 0),
+            func.coalesce(func.sum(Word.correct_answers), 0),
+        )
+        .join(Dictionary, Dictionary.id == Word.dictionary_id)
+        .where(Word.profile_id == profile_id)
+        .group_by(Dictionary.difficulty)
+    )
+
+
+def daily_activity_query(profile_id: uuid.UUID, since: date) -> Select:
+    """Practice count and correct answers of a profile per day since ``since``.
+
+    Combines the raw answers with the daily rollups they are compacted into;
+    a day is in one or the other.
+    """
+    day = cast(PracticeSession.created_at, Date)
+    raw = (
+        select(
+            day.label("day"),
+            func.count().label("total"),
+            func.count().filter(PracticeSession.correct).label("correct"),
+        )
+        .where(
+            PracticeSession.profile_id == profile_id,
+            PracticeSession.created_at >= since,
+        )
+        .group_by(day)
+    )
+    rolled_up = (
+        select(
+            PracticeDailyRollup.day,
+            func.sum(PracticeDailyRollup.total_practices),
+            func.sum(PracticeDailyRollup.correct_answers),
+        )
+        .where(
+            PracticeDailyRollup.profile_id == profile_id,
+            PracticeDailyRollup.day >= since,
+        )
+        .group_by(PracticeDailyRollup.day)
+    )
+    days = union_all(raw, rolled_up).subquery()
+    return (
+        select(
+            days.c.day,
+            cast(func.sum(days.c.total), Integer),
+            cast(func.sum(days.c.correct), Integer),
+        )
+        .group_by(days.c.day)
+        .order_by(days.c.day)
+    )
+
+
+async def profile_summary(db: AsyncSession, profile_id: uuid.UUID, days: int) -> ProfileStatsSummary:
+    """Profile-level rollups: totals, accuracy by difficulty, daily activity."""
+    by_difficulty_rows = (await db.execute(difficulty_rollup_query(profile_id))).all()
+
+    since = (datetime.utcnow() - timedelta(days=days - 1)).date()
+    daily_rows = (await db.execute(daily_activity_query(profile_id, since))).all()
+
+    by_difficulty = [
+        DifficultyStats(
+            difficulty=difficulty,
+            words=words,
+            total_practices=total,
+            correct_answers=correct,
+            success_rate=success_rate(total, correct),
+        )
+        for difficulty, words, total, correct in by_difficulty_rows
+    ]
+    total = sum(item.total_practices for item in by_difficulty)
+    correct = sum(item.correct_answers for item in by_difficulty)
+    return ProfileStatsSummary(
+        total_words=sum(item.words for item in by_difficulty),
+        total_practices=total,
+        correct_answers=correct,
+        success_rate=success_rate(total, correct),
+        by_difficulty=by_difficulty,
+        daily_activity=[
+            DailyActivity(day=d, total_practices=t, correct_answers=c or 0)
+            for d, t, c in daily_rows
+        ],
+    )
@@ -0,0 +1,86 @@
+import uuid
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from sqlalchemy import delete, literal, select
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.dictionary import Dictionary
+from app.db.models.practice_rollup import PracticeDailyRollup
+from app.db.models.practice_session import PracticeSession
+from app.db.models.word import Word
+
+
+@dataclass
+class AddWordsOutcome:
+    created: List[int]
+    # Already in the vocabulary
+    skipped: List[int]
+    not_found: List[int]
+
+
+@dataclass
+class RemoveWordsOutcome:
+    deleted: List[int]
+    # Not in the vocabulary
+    skipped: List[int]
+
+
+async def add_words(db: AsyncSession, profile_id: uuid.UUID, dictionary_ids: Sequence[int]) -> AddWordsOutcome:
+    """Add dictionary entries to a profile's vocabulary in one statement.
+
+    Unknown entries are filtered by the INSERT ... SELECT and entries already
+    present are skipped by ON CONFLICT on (profile_id, dictionary_id). The
+    caller commits.
+    """
+    requested = list(dict.fromkeys(dictionary_ids))
+    stmt = (
+        insert(Word)
+        .from_select(
+            ["profile_id", "dictionary_id"],
+            select(literal(profile_id, UUID(as_uuid=True)), Dictionary.id)
+            .where(Dictionary.id.in_(requested))
+            .order_by(Dictionary.id),
+        )
+        .on_conflict_do_nothing(index_elements=["profile_id", "dictionary_id"])
+        .returning(Word.dictionary_id)
+    )
+    created = set(await db.scalars(stmt))
+
+    leftover = [dictionary_id for dictionary_id in requested if dictionary_id not in created]
+    existing = set()
+    if leftover:
+        existing = set(await db.scalars(
+            select(Dictionary.id).where(Dictionary.id.in_(leftover))))
+    return AddWordsOutcome(
+        created=[i for i in requested if i in created],
+        skipped=[i for i in leftover if i in existing],
+        not_found=[i for i in leftover if i not in existing],
+    )
+
+
+async def remove_words(db: AsyncSession, profile_id: uuid.UUID, dictionary_ids: Sequence[int]) -> RemoveWordsOutcome:
+    """Remove dictionary entries from a profile's vocabulary, with their history.
+
+    Set-based DELETEs regardless of how many words go. The caller commits.
+    """
+    requested = list(dict.fromkeys(dictionary_ids))
+    doomed = (
+        select(Word.id)
+        .where(Word.profile_id == profile_id, Word.dictionary_id.in_(requested))
+        .scalar_subquery()
+    )
+    await db.execute(
+        delete(PracticeSession).where(PracticeSession.word_id.in_(doomed)))
+    await db.execute(
+        delete(PracticeDailyRollup).where(PracticeDailyRollup.word_id.in_(doomed)))
+    deleted = set(await db.scalars(
+        delete(Word)
+        .where(Word.profile_id == profile_id, Word.dictionary_id.in_(requested))
+        .returning(Word.dictionary_id)
+    ))
+    return RemoveWordsOutcome(
+        deleted=[i for i in requested if i in deleted],
+        skipped=[i for i in requested if i not in deleted],
+    )
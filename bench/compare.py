@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from typing import List
+
+# Below this many requests a scenario is too noisy to judge
+MIN_REQUESTS = 50
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """Scenarios of ``current`` that are more than ``threshold`` worse than
+    ``baseline``: higher p95 latency, lower throughput or new errors."""
+    if baseline["meta"].get("mode") != current["meta"].get("mode"):
+        return [f"baseline was measured {baseline['meta'].get('mode')}, "
+                f"these results {current['meta'].get('mode')}; rerun with the same mode"]
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before or min(before["requests"], result["requests"]) < MIN_REQUESTS:
+            continue
+        if result["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {result['p95_ms']} ms")
+        if result["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {before['rps']} -> {result['rps']} req/s")
+        if result["errors"] and result["errors"] / result["requests"] > \
+                before["errors"] / before["requests"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {result['errors']}")
+    return regressions
+
+
+def _change(before: float, after: float) -> str:
+    return f"{(after - before) / before * 100:+6.1f}%" if before else "     -"
+
+
+def print_report(baseline: dict, current: dict, regressions: List[str]) -> None:
+    print(f"ℹ️ baseline {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}) "
+          f"vs {current['meta'].get('commit')} ({current['meta'].get('timestamp')})")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before or not before["requests"] or not result["requests"]:
+            print(f"   {name:<38} no baseline")
+            continue
+        print(f"   {name:<38} p95 {before['p95_ms']:>7.1f} -> {result['p95_ms']:>7.1f} ms "
+              f"{_change(before['p95_ms'], result['p95_ms'])}   "
+              f"{before['rps']:>8.1f} -> {result['rps']:>8.1f} req/s "
+              f"{_change(before['rps'], result['rps'])}")
+    for regression in regressions:
+        print(f"❌ {regression}")
+    if not regressions:
+        print("✅ no regressions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two run.py result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("results")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Tolerated relative slowdown before a result counts as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.results) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    print_report(baseline, current, regressions)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
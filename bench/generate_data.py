@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+# make sure `app` is on PYTHONPATH
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.session import get_engine  # noqa: E402
+from app.services.practice_history import (  # noqa: E402
+    add_months,
+    create_partition,
+    existing_partitions,
+    month_start,
+)
+from scripts.rebuild_word_stats import REBUILD_SQL  # noqa: E402
+
+# run.py signs in as bench-user-<n>@example.com, n from 1, with this password
+BENCH_PASSWORD = "bench-password"
+LANGUAGES = ("en", "de", "fr", "es")
+SESSION_CHUNK = 500_000
+
+# Every row is derived from generate_series and random() after setseed(),
+# so the same arguments give the same data.
+TRUNCATE_SQL = """
+TRUNCATE practice_flushes, practice_daily_rollups, practice_sessions, words,
+         profiles, users, dictionary RESTART IDENTITY CASCADE
+"""
+
+USERS_SQL = """
+INSERT INTO users (id, email, hashed_password, is_admin)
+SELECT md5('bench-user-' || g)::uuid, 'bench-user-' || g || '@example.com', :hash, false
+FROM generate_series(1, :users) AS g
+"""
+
+PROFILES_SQL = """
+INSERT INTO profiles (id, user_id, name, native_language, target_language, created_at, updated_at)
+SELECT md5('bench-profile-' || g)::uuid, md5('bench-user-' || g)::uuid,
+       'Bench ' || g, 'en', 'de', now(), now()
+FROM generate_series(1, :users) AS g
+"""
+
+# Pronounceable words: the base-40 digits of n, least significant first, one
+# syllable each. Different digit strings can spell the same word; those
+# entries are skipped.
+DICTIONARY_SQL = """
+WITH syllables AS (
+    SELECT ARRAY['ba','ke','li','mo','nu','ra','se','ti','vo','za',
+                 'bre','cla','dri','fo','gu','ha','jo','ku','lan','mer',
+                 'nis','ob','per','qua','ros','sta','tur','ul','ven','wil',
+                 'xe','yo','zen','ast','el','in','or','un','ith','ang'] AS s
+), entries AS (
+    SELECT g,
+           (SELECT string_agg(s[((g / (40 ^ d)::bigint) % 40) + 1], '' ORDER BY d)
+            FROM generate_series(0, :digits - 1) AS d) AS word
+    FROM generate_series(1, :entries) AS g, syllables
+)
+INSERT INTO dictionary (text, meaning, example, pronunciation, difficulty, language, updated_at)
+SELECT word,
+       'meaning of ' || word || ' as in ' || (ARRAY['house','tree','river','light','stone',
+            'friend','table','window','garden','music'])[1 + g % 10],
+       'This is an example sentence with ' || word || '.',
+       '/' || word || '/',
+       (ARRAY['EASY','MEDIUM','HARD'])[1 + g % 3]::difficultylevel,
+       (ARRAY[{languages}])[1 + (g / 7) % {language_count}],
+       now()
+FROM entries
+ON CONFLICT (text, language) DO NOTHING
+"""
+
+WORDS_SQL = """
+INSERT INTO words (dictionary_id, profile_id, personal_note, created_at, updated_at,
+                   ease_factor, interval_days, repetitions, lapses, due_at,
+                   total_practices, correct_answers, streak)
+SELECT :dict_min + floor(random() * :dict_count)::int, p.id, NULL,
+       now() - random() * interval '180 days', now(),
+       2.5, 0, 0, 0, now() + (random() - 0.5) * interval '20 days',
+       0, 0, 0
+FROM profiles AS p, generate_series(1, :per_profile)
+ON CONFLICT (profile_id, dictionary_id) DO NOTHING
+"""
+
+SESSIONS_SQL = """
+INSERT INTO practice_sessions (word_id, profile_id, correct, created_at)
+SELECT w.id, w.profile_id, s.r < 0.75, now() - s.t * CAST(:span AS interval)
+FROM (
+    SELECT :word_min + floor(random() * :word_count)::int AS word_id,
+           random() AS r, random() AS t
+    FROM generate_series(1, :chunk)
+) AS s
+JOIN words AS w ON w.id = s.word_id
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fill the database with a reproducible benchmark data set.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--dictionary", type=int, default=200_000,
+                        help="Dictionary entries")
+    parser.add_argument("--words-per-profile", type=int, default=300)
+    parser.add_argument("--sessions", type=int, default=2_000_000,
+                        help="Practice sessions spread over --months")
+    parser.add_argument("--months", type=int, default=5,
+                        help="History span; keep it below PRACTICE_RAW_RETENTION_MONTHS")
+    parser.add_argument("--seed", type=float, default=0.42, help="setseed() value in [-1, 1]")
+    parser.add_argument("--truncate", action="store_true",
+                        help="Empty every application table first (destroys all data)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+
+    def step(message):
+        print(f"[{time.perf_counter() - started:7.1f}s] {message}", flush=True)
+
+    with get_engine().connect() as conn:
+        if args.truncate:
+            conn.execute(text(TRUNCATE_SQL))
+            conn.commit()
+            step("tables truncated")
+        elif conn.execute(text("SELECT EXISTS (SELECT 1 FROM users)")).scalar():
+            sys.exit("❌ the database is not empty; pass --truncate to replace its data")
+
+        conn.execute(text("SELECT setseed(:seed)"), {"seed": args.seed})
+
+        # One hash for every user: generation stays fast, sign-in still pays
+        # the full bcrypt cost
+        conn.execute(text(USERS_SQL), {"users": args.users, "hash": get_password_hash(BENCH_PASSWORD)})
+        conn.execute(text(PROFILES_SQL), {"users": args.users})
+        conn.commit()
+        step(f"{args.users} users and profiles")
+
+        languages = ", ".join(f"'{language}'" for language in LANGUAGES)
+        digits = 1
+        while 40 ** digits <= args.dictionary:
+            digits += 1
+        result = conn.execute(text(DICTIONARY_SQL.format(
+            languages=languages, language_count=len(LANGUAGES))),
+            {"entries": args.dictionary, "digits": digits})
+        conn.commit()
+        step(f"{result.rowcount} dictionary entries")
+
+        dict_min, dict_max = conn.execute(text("SELECT min(id), max(id) FROM dictionary")).one()
+        conn.execute(text(WORDS_SQL), {
+            "dict_min": dict_min,
+            "dict_count": dict_max - dict_min + 1,
+            "per_profile": args.words_per_profile,
+        })
+        conn.commit()
+        word_min, word_max, words = conn.execute(
+            text("SELECT min(id), max(id), count(*) FROM words")).one()
+        step(f"{words} words")
+
+        this_month = month_start(datetime.utcnow().date())
+        existing = set(existing_partitions(conn))
+        for offset in range(-args.months, 1):
+            month = add_months(this_month, offset)
+            if month not in existing:
+                create_partition(conn, month)
+        conn.commit()
+
+        inserted = 0
+        while inserted < args.sessions:
+            chunk = min(SESSION_CHUNK, args.sessions - inserted)
+            result = conn.execute(text(SESSIONS_SQL), {
+                "word_min": word_min,
+                "word_count": word_max - word_min + 1,
+                "chunk": chunk,
+                "span": f"{args.months * 30} days",
+            })
+            conn.commit()
+            inserted += chunk
+            step(f"{inserted}/{args.sessions} practice sessions ({result.rowcount} in this chunk)")
+
+        conn.execute(text(REBUILD_SQL), {"profile_id": None})
+        conn.commit()
+        step("word counters rebuilt")
+
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM ANALYZE"))
+        step("vacuum analyze")
+
+    print(f"✅ benchmark data ready; sign in as bench-user-<1..{args.users}>@example.com "
+          f"with password {BENCH_PASSWORD!r}")
+
+
+if __name__ == "__main__":
+    main()
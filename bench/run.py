@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from compare import compare, print_report
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Users created by generate_data.py: bench-user-<n>@example.com, n from 1
+BENCH_PASSWORD = "bench-password"
+
+# Search terms that hit the generated dictionary (see generate_data.py)
+QUERIES = ("house", "river", "garden", "music", "stone")
+PREFIXES = ("ba", "ke", "mo", "ra", "st", "za", "lan", "ven")
+SUBSTRINGS = ("ros", "ith", "kul", "ast", "mer")
+
+
+@dataclass
+class User:
+    email: str
+    client: httpx.AsyncClient
+    word_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Scenario:
+    name: str
+    call: Callable[[User, random.Random], Awaitable[httpx.Response]]
+    # Relative share of the requests in --mixed runs
+    weight: int
+
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+
+def _signin(user: User, rng: random.Random):
+    return user.client.post(
+        "/auth/signin", data={"username": user.email, "password": BENCH_PASSWORD})
+
+
+def _practice(user: User, rng: random.Random):
+    return user.client.post(
+        f"/words/{rng.choice(user.word_ids)}/practice",
+        params={"correct": rng.random() < 0.75})
+
+
+def _practice_batch(user: User, rng: random.Random):
+    return user.client.post("/words/practice/batch", json={"items": [
+        {"word_id": word_id, "correct": rng.random() < 0.75}
+        for word_id in rng.sample(user.word_ids, min(10, len(user.word_ids)))
+    ]})
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("GET /words", lambda user, rng: user.client.get("/words", params={"limit": 20}), 15),
+    Scenario("GET /words/due", lambda user, rng: user.client.get("/words/due"), 20),
+    Scenario("GET /words/{id}",
+             lambda user, rng: user.client.get(f"/words/{rng.choice(user.word_ids)}"), 10),
+    Scenario("GET /words/stats/summary",
+             lambda user, rng: user.client.get("/words/stats/summary"), 3),
+    Scenario("POST /words/{id}/practice", _practice, 25),
+    Scenario("POST /words/practice/batch", _practice_batch, 5),
+    Scenario("GET /dictionary", lambda user, rng: user.client.get(
+        "/dictionary", params={"limit": 20, "language": rng.choice(("en", "de", "fr", "es"))}), 5),
+    Scenario("GET /dictionary/search (fulltext)", lambda user, rng: user.client.get(
+        "/dictionary/search", params={"q": rng.choice(QUERIES)}), 5),
+    Scenario("GET /dictionary/search (substring)", lambda user, rng: user.client.get(
+        "/dictionary/search", params={"q": rng.choice(SUBSTRINGS), "mode": "substring"}), 3),
+    Scenario("GET /dictionary/autocomplete", lambda user, rng: user.client.get(
+        "/dictionary/autocomplete", params={"prefix": rng.choice(PREFIXES)}), 8),
+    Scenario("POST /auth/signin", _signin, 1),
+]
+
+
+async def sign_in(base_url: str, users: int, timeout: float) -> List[User]:
+    """Sign in the first ``users`` bench users and load some of their word ids."""
+    async def setup(n: int) -> User:
+        email = f"bench-user-{n}@example.com"
+        client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+        user = User(email, client)
+        response = await _signin(user, random.Random())
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        response = await client.get("/words", params={"limit": 100})
+        response.raise_for_status()
+        user.word_ids = [word["id"] for word in response.json()]
+        if not user.word_ids:
+            raise SystemExit(f"❌ {email} has no words; run generate_data.py first")
+        return user
+
+    # A few at a time: sign-in is deliberately slow
+    semaphore = asyncio.Semaphore(8)
+
+    async def limited(n: int) -> User:
+        async with semaphore:
+            return await setup(n)
+
+    return await asyncio.gather(*(limited(n) for n in range(1, users + 1)))
+
+
+async def drive(users: List[User], scenarios: List[Scenario], concurrency: int,
+                duration: float, seed: int) -> Dict[str, Samples]:
+    """Send requests from ``concurrency`` workers for ``duration`` seconds."""
+    samples = {scenario.name: Samples() for scenario in scenarios}
+    weights = [scenario.weight for scenario in scenarios]
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(scenarios, weights)[0]
+            user = rng.choice(users)
+            sample = samples[scenario.name]
+            started = time.perf_counter()
+            try:
+                response = await scenario.call(user, rng)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            sample.latencies.append(time.perf_counter() - started)
+            sample.statuses[status] = sample.statuses.get(status, 0) + 1
+            if not 200 <= status < 300:
+                sample.errors += 1
+
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return samples
+
+
+def summarize(sample: Samples, elapsed: float) -> dict:
+    latencies = sorted(sample.latencies)
+    if not latencies:
+        return {"requests": 0, "errors": 0, "rps": 0.0}
+    # 99 cut points: index n-1 is the n-th percentile
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") \
+        if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": sample.errors,
+        "statuses": {str(status): count for status, count in sorted(sample.statuses.items())},
+        "rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    scenarios = SCENARIOS
+    if args.scenario:
+        scenarios = [scenario for scenario in SCENARIOS
+                     if any(name.lower() in scenario.name.lower() for name in args.scenario)]
+        if not scenarios:
+            raise SystemExit(f"❌ no scenario matches {args.scenario}")
+
+    users = await sign_in(args.base_url, args.users, args.timeout)
+    print(f"ℹ️ signed in {len(users)} users", flush=True)
+    try:
+        if args.warmup:
+            await drive(users, scenarios, args.concurrency, args.warmup, args.seed)
+
+        results = {}
+        # Each scenario on its own, so its numbers do not depend on the others;
+        # --mixed sends the weighted mix instead, like real traffic
+        runs = [("mixed", scenarios)] if args.mixed else [(s.name, [s]) for s in scenarios]
+        for _, batch in runs:
+            started = time.perf_counter()
+            samples = await drive(users, batch, args.concurrency, args.duration, args.seed)
+            elapsed = time.perf_counter() - started
+            for scenario_name, sample in samples.items():
+                results[scenario_name] = summarize(sample, elapsed)
+                print_result(scenario_name, results[scenario_name])
+            if args.mixed:
+                total = sum(len(sample.latencies) for sample in samples.values())
+                print(f"ℹ️ mixed: {total / elapsed:.1f} requests/s in total", flush=True)
+    finally:
+        await asyncio.gather(*(user.client.aclose() for user in users))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "base_url": args.base_url,
+            "mode": "mixed" if args.mixed else "isolated",
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def print_result(name: str, result: dict) -> None:
+    if not result["requests"]:
+        print(f"   {name:<38} no requests", flush=True)
+        return
+    print(f"{'✅' if not result['errors'] else '❌'} {name:<38} "
+          f"{result['rps']:>8.1f} req/s  p50 {result['p50_ms']:>7.1f} ms  "
+          f"p95 {result['p95_ms']:>7.1f} ms  p99 {result['p99_ms']:>7.1f} ms  "
+          f"errors {result['errors']}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure throughput and latency of the API hot paths.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=50,
+                        help="Bench users to sign in (see generate_data.py)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight")
+    parser.add_argument("--duration", type=float, default=20,
+                        help="Seconds per scenario, or in total with --mixed")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds of unmeasured load first")
+    parser.add_argument("--scenario", action="append",
+                        help="Only scenarios whose name contains this; repeatable")
+    parser.add_argument("--mixed", action="store_true",
+                        help="Send a weighted mix of all scenarios at once")
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against an earlier --output file")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Tolerated relative slowdown before a result counts as a regression")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"ℹ️ results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        print_report(baseline, report, regressions)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import List
+
+# make sure `app` is on PYTHONPATH
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+# Not used directly: importing them registers the mappers that the Word and
+# Dictionary relationships refer to by name
+from app.db.models import practice_session, profile, user  # noqa: E402,F401
+from app.api.routes.words import ENTRY_FIELDS, WORD_FIELDS, WORD_LIST, word_payloads  # noqa: E402
+from app.core.serialization import adapter_response  # noqa: E402
+from app.db.models.dictionary import Dictionary  # noqa: E402
+from app.db.models.word import DifficultyLevel, Word  # noqa: E402
+from app.db.schemas.word import WordRead  # noqa: E402
+
+# Same labels as the rows of select_word_rows()
+WordRow = namedtuple("WordRow", WORD_FIELDS + [f"entry_{name}" for name in ENTRY_FIELDS])
+
+
+def make_page(size: int):
+    """A page of ORM words (what the routes loaded before) and the same
+    data as plain rows (what they load now)."""
+    now = datetime(2026, 1, 1, 12, 0, 0, 123456)
+    profile_id = uuid.uuid4()
+    words, rows = [], []
+    for i in range(size):
+        entry = Dictionary(
+            id=i, text=f"word{i}", meaning=f"meaning of word {i} as in house and garden",
+            example=f"This is an example sentence with word{i}.", pronunciation=f"/word{i}/",
+            difficulty=DifficultyLevel.MEDIUM, language="en", updated_at=now)
+        word = Word(
+            id=i, dictionary_id=i, profile_id=profile_id, personal_note=None,
+            created_at=now, updated_at=now, ease_factor=2.5, interval_days=6.0, repetitions=2,
+            lapses=0, due_at=now + timedelta(days=i), last_reviewed_at=now,
+            dictionary_entry=entry)
+        words.append(word)
+        rows.append(WordRow(
+            *(getattr(word, name) for name in WORD_FIELDS),
+            *(getattr(entry, name) for name in ENTRY_FIELDS)))
+    return words, rows
+
+
+def measure(fn, seconds: float) -> float:
+    """Mean seconds per call, after one warm-up call."""
+    fn()
+    calls, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        fn()
+        calls += 1
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the cost of serializing a page of GET /words.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--seconds", type=float, default=2, help="Time spent per variant")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    field = create_model_field(name="Response", type_=List[WordRead], mode="serialization")
+
+    def response_model(words, response_class):
+        # What FastAPI does with a route's return value and its response_model
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=words, is_coroutine=True))
+        return response_class(content).body
+
+    for size in args.sizes:
+        words, rows = make_page(size)
+        variants = {
+            "ORM + response_model + json (before)": lambda: response_model(words, JSONResponse),
+            "ORM + response_model + orjson": lambda: response_model(words, ORJSONResponse),
+            "rows + TypeAdapter (after)": lambda: adapter_response(WORD_LIST, word_payloads(rows)).body,
+        }
+        bodies = [json.loads(variant()) for variant in variants.values()]
+        if any(body != bodies[0] for body in bodies):
+            sys.exit("❌ the variants produce different JSON")
+
+        print(f"ℹ️ page of {size} words")
+        baseline = None
+        for name, variant in variants.items():
+            seconds = measure(variant, args.seconds)
+            baseline = baseline or seconds
+            print(f"   {name:<40} {seconds * 1000:8.3f} ms  {baseline / seconds:5.2f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import re
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.session import Base, database_url
+from app.db.models import dictionary, practice_flush, practice_rollup, practice_session, profile, user, word  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+DATABASE_URL = database_url()
+
+# Created and dropped at runtime by app.services.practice_history
+PARTITION_PATTERN = re.compile(r"^practice_sessions_(p\d{6}|default)$")
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    return not (type_ == "table" and reflected and PARTITION_PATTERN.match(name))
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL instead of running it (alembic upgrade --sql)."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = create_engine(DATABASE_URL, poolclass=NullPool)
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata,
+                          include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,85 @@
+"""Baseline: the schema as created by scripts/bootstrap_db.py before migrations
+
+Databases that were bootstrapped with create_all before this migration set
+existed should be stamped with this revision (``alembic stamp 0001``) and
+then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "profiles",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), unique=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("native_language", sa.String(), nullable=True),
+        sa.Column("target_language", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "dictionary",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("text", sa.String(), nullable=True),
+        sa.Column("meaning", sa.Text(), nullable=True),
+        sa.Column("example", sa.Text(), nullable=True),
+        sa.Column("pronunciation", sa.String(), nullable=True),
+        sa.Column("difficulty", sa.Enum("EASY", "MEDIUM", "HARD", name="difficultylevel"), nullable=True),
+        sa.Column("language", sa.String(), nullable=True),
+    )
+    op.create_index("ix_dictionary_id", "dictionary", ["id"])
+    op.create_index("ix_dictionary_text", "dictionary", ["text"], unique=True)
+    op.create_index("ix_dictionary_language", "dictionary", ["language"])
+
+    op.create_table(
+        "words",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("dictionary_id", sa.Integer(), sa.ForeignKey("dictionary.id"), nullable=False),
+        sa.Column("profile_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("profiles.id"), nullable=False),
+        sa.Column("personal_note", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_words_id", "words", ["id"])
+
+    op.create_table(
+        "practice_sessions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("word_id", sa.Integer(), sa.ForeignKey("words.id"), nullable=True),
+        sa.Column("profile_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("profiles.id"), nullable=True),
+        sa.Column("correct", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_practice_sessions_id", "practice_sessions", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("practice_sessions")
+    op.drop_table("words")
+    op.drop_table("dictionary")
+    op.drop_table("profiles")
+    op.drop_table("users")
+    sa.Enum(name="difficultylevel").drop(op.get_bind(), checkfirst=True)
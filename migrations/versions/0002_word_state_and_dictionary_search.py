@@ -0,0 +1,120 @@
+"""Columns added since the baseline: review state and counters on words,
+dictionary search document and updated_at, users.is_admin
+
+Also merges duplicate (profile_id, dictionary_id) words so that 0003 can
+make the pair unique, and backfills the word counters from
+practice_sessions.
+
+Adding the generated search_vector column rewrites the dictionary table
+under an exclusive lock; the other columns are metadata-only changes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(text, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(meaning, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(example, '')), 'C')"
+)
+
+# Keep the oldest word of each (profile, entry) pair: move the practice
+# history of the others onto it, then delete them
+DUPLICATE_WORDS = """
+SELECT id, min(id) OVER (PARTITION BY profile_id, dictionary_id) AS keep_id
+FROM words
+"""
+MOVE_DUPLICATE_HISTORY = f"""
+UPDATE practice_sessions AS p
+SET word_id = d.keep_id
+FROM ({DUPLICATE_WORDS}) AS d
+WHERE p.word_id = d.id AND d.id <> d.keep_id
+"""
+DELETE_DUPLICATE_WORDS = f"""
+DELETE FROM words AS w
+USING ({DUPLICATE_WORDS}) AS d
+WHERE w.id = d.id AND d.id <> d.keep_id
+"""
+
+# Same as scripts/rebuild_word_stats.py, for every profile
+BACKFILL_COUNTERS = """
+UPDATE words AS w
+SET total_practices = s.total,
+    correct_answers = s.correct,
+    streak = s.streak,
+    last_practiced_at = s.last_practiced
+FROM (
+    SELECT p.word_id,
+           count(*) AS total,
+           count(*) FILTER (WHERE p.correct) AS correct,
+           max(p.created_at) AS last_practiced,
+           count(*) FILTER (
+               WHERE p.correct
+                 AND p.created_at > COALESCE(m.last_miss, '-infinity'::timestamp)
+           ) AS streak
+    FROM practice_sessions AS p
+    LEFT JOIN (
+        SELECT word_id, max(created_at) AS last_miss
+        FROM practice_sessions
+        WHERE NOT correct
+        GROUP BY word_id
+    ) AS m ON m.word_id = p.word_id
+    GROUP BY p.word_id
+) AS s
+WHERE w.id = s.word_id
+"""
+
+
+def _add_not_null(table: str, column: sa.Column, server_default) -> None:
+    # The temporary default fills existing rows without a table rewrite;
+    # new rows get their value from the model defaults
+    column.server_default = sa.DefaultClause(server_default)
+    op.add_column(table, column)
+    op.alter_column(table, column.name, server_default=None)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    _add_not_null("users", sa.Column("is_admin", sa.Boolean(), nullable=False), sa.false())
+
+    _add_not_null("words", sa.Column("ease_factor", sa.Float(), nullable=False), "2.5")
+    _add_not_null("words", sa.Column("interval_days", sa.Float(), nullable=False), "0")
+    _add_not_null("words", sa.Column("repetitions", sa.Integer(), nullable=False), "0")
+    _add_not_null("words", sa.Column("lapses", sa.Integer(), nullable=False), "0")
+    _add_not_null("words", sa.Column("due_at", sa.DateTime(), nullable=False),
+                  sa.text("timezone('utc', now())"))
+    op.add_column("words", sa.Column("last_reviewed_at", sa.DateTime(), nullable=True))
+    _add_not_null("words", sa.Column("total_practices", sa.Integer(), nullable=False), "0")
+    _add_not_null("words", sa.Column("correct_answers", sa.Integer(), nullable=False), "0")
+    _add_not_null("words", sa.Column("streak", sa.Integer(), nullable=False), "0")
+    op.add_column("words", sa.Column("last_practiced_at", sa.DateTime(), nullable=True))
+
+    op.add_column("dictionary", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.add_column("dictionary", sa.Column(
+        "search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True)))
+
+    op.execute(MOVE_DUPLICATE_HISTORY)
+    op.execute(DELETE_DUPLICATE_WORDS)
+    op.execute(BACKFILL_COUNTERS)
+
+
+def downgrade() -> None:
+    op.drop_column("dictionary", "search_vector")
+    op.drop_column("dictionary", "updated_at")
+    for column in ("last_practiced_at", "streak", "correct_answers", "total_practices",
+                   "last_reviewed_at", "due_at", "lapses", "repetitions",
+                   "interval_days", "ease_factor"):
+        op.drop_column("words", column)
+    op.drop_column("users", "is_admin")
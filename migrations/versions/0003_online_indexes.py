@@ -0,0 +1,102 @@
+"""Indexes for the route queries, built online
+
+Every index is built with CREATE INDEX CONCURRENTLY outside a transaction,
+so reads and writes continue while it runs. An interrupted build leaves an
+INVALID index behind; it is dropped and rebuilt when the migration is run
+again. The two unique constraints are attached to concurrently built
+unique indexes. The single-column indexes they supersede, and the indexes
+that duplicated primary keys, are dropped last.
+
+scripts/check_query_plans.py verifies the resulting plans.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name, table, columns, create_index options
+INDEXES = [
+    ("uq_dictionary_text_language", "dictionary", ["text", "language"], {"unique": True}),
+    ("uq_words_profile_dictionary", "words", ["profile_id", "dictionary_id"], {"unique": True}),
+    ("ix_dictionary_text_id", "dictionary", ["text", "id"], {}),
+    ("ix_dictionary_language_text_id", "dictionary", ["language", "text", "id"], {}),
+    ("ix_dictionary_text_trgm", "dictionary", ["text"],
+     {"postgresql_using": "gin", "postgresql_ops": {"text": "gin_trgm_ops"}}),
+    ("ix_dictionary_search_vector", "dictionary", ["search_vector"], {"postgresql_using": "gin"}),
+    ("ix_words_profile_due", "words", ["profile_id", "due_at"], {}),
+    ("ix_words_profile_created", "words", ["profile_id", "created_at", "id"], {}),
+    ("ix_practice_sessions_word_created", "practice_sessions", ["word_id", "created_at"], {}),
+    ("ix_practice_sessions_profile_created", "practice_sessions", ["profile_id", "created_at"],
+     {"postgresql_include": ["correct"]}),
+    ("ix_practice_sessions_word_misses", "practice_sessions", ["word_id", "created_at"],
+     {"postgresql_where": sa.text("NOT correct")}),
+]
+
+UNIQUE_CONSTRAINTS = [
+    ("dictionary", "uq_dictionary_text_language"),
+    ("words", "uq_words_profile_dictionary"),
+]
+
+# Superseded by the composite indexes above or duplicating a primary key
+REDUNDANT_INDEXES = [
+    ("ix_dictionary_text", "dictionary", ["text"], {"unique": True}),
+    ("ix_dictionary_language", "dictionary", ["language"], {}),
+    ("ix_dictionary_id", "dictionary", ["id"], {}),
+    ("ix_words_id", "words", ["id"], {}),
+    ("ix_practice_sessions_id", "practice_sessions", ["id"], {}),
+]
+
+
+def _offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _drop_invalid(name: str) -> None:
+    # Left behind by an interrupted CREATE INDEX CONCURRENTLY
+    invalid = op.get_bind().scalar(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index AS i "
+        "JOIN pg_class AS c ON c.oid = i.indexrelid WHERE c.relname = :name"
+    ), {"name": name})
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def _create_indexes(indexes) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in indexes:
+            if not _offline():
+                _drop_invalid(name)
+            op.create_index(name, table, columns, postgresql_concurrently=True,
+                            if_not_exists=True, **options)
+
+
+def _drop_indexes(indexes) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in indexes:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    _create_indexes(INDEXES)
+    for table, name in UNIQUE_CONSTRAINTS:
+        exists = not _offline() and op.get_bind().scalar(sa.text(
+            "SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": name})
+        if not exists:
+            op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
+    _drop_indexes(REDUNDANT_INDEXES)
+
+
+def downgrade() -> None:
+    _create_indexes(REDUNDANT_INDEXES)
+    for table, name in UNIQUE_CONSTRAINTS:
+        op.drop_constraint(name, table, type_="unique")
+    _drop_indexes(INDEXES)
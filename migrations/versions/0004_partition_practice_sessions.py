@@ -0,0 +1,142 @@
+"""Partition practice_sessions by month and add the daily rollups
+
+The table is rebuilt as a range-partitioned table on created_at: the rows
+are copied into monthly partitions under an exclusive lock, so plan a
+maintenance window for large tables. The id sequence is kept. Rows without
+created_at are dated to the epoch and land in the default partition, from
+where the next maintenance run compacts them.
+
+Later partitions are created by app.services.practice_history (run in the
+API process or by scripts/maintain_practice_history.py).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as PRACTICE_PARTITIONS_AHEAD's default
+MONTHS_AHEAD = 2
+
+COLUMNS = "id, word_id, profile_id, correct, created_at"
+
+INDEXES = [
+    ("ix_practice_sessions_word_created", ["word_id", "created_at"], {}),
+    ("ix_practice_sessions_profile_created", ["profile_id", "created_at"],
+     {"postgresql_include": ["correct"]}),
+    ("ix_practice_sessions_word_misses", ["word_id", "created_at"],
+     {"postgresql_where": sa.text("NOT correct")}),
+]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _months(first: date, last: date):
+    month = date(first.year, first.month, 1)
+    while month <= last:
+        yield month
+        month = _add_months(month, 1)
+
+
+def _detach_old_table() -> None:
+    # Free the names the partitioned table takes over
+    op.rename_table("practice_sessions", "practice_sessions_old")
+    op.execute("ALTER TABLE practice_sessions_old "
+               "RENAME CONSTRAINT practice_sessions_pkey TO practice_sessions_old_pkey")
+    op.execute("ALTER SEQUENCE practice_sessions_id_seq OWNED BY NONE")
+    for name, _, _ in INDEXES:
+        op.drop_index(name, table_name="practice_sessions_old")
+
+
+def _session_columns():
+    return [
+        sa.Column("id", sa.Integer(), nullable=False,
+                  server_default=sa.text("nextval('practice_sessions_id_seq')")),
+        # Named explicitly: generated names dodge the ones still held by the
+        # old table and its partitions
+        sa.Column("word_id", sa.Integer(),
+                  sa.ForeignKey("words.id", name="practice_sessions_word_id_fkey"), nullable=True),
+        sa.Column("profile_id", postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey("profiles.id", name="practice_sessions_profile_id_fkey"),
+                  nullable=True),
+        sa.Column("correct", sa.Boolean(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    _detach_old_table()
+    op.create_table(
+        "practice_sessions",
+        *_session_columns(),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", "created_at", name="practice_sessions_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute("CREATE TABLE practice_sessions_default PARTITION OF practice_sessions DEFAULT")
+
+    today = datetime.utcnow().date()
+    first = today
+    if not op.get_context().as_sql:
+        first = op.get_bind().scalar(sa.text(
+            "SELECT CAST(min(created_at) AS date) FROM practice_sessions_old")) or today
+    for month in _months(first, _add_months(today, MONTHS_AHEAD)):
+        op.execute(
+            f"CREATE TABLE practice_sessions_p{month:%Y%m} PARTITION OF practice_sessions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')")
+
+    op.execute(
+        f"INSERT INTO practice_sessions ({COLUMNS}) "
+        f"SELECT id, word_id, profile_id, correct, "
+        f"COALESCE(created_at, '1970-01-01'::timestamp) FROM practice_sessions_old")
+    op.execute("ALTER SEQUENCE practice_sessions_id_seq OWNED BY practice_sessions.id")
+    op.drop_table("practice_sessions_old")
+    # Built after the copy; partitioned indexes cannot be built concurrently
+    for name, columns, options in INDEXES:
+        op.create_index(name, "practice_sessions", columns, **options)
+
+    op.create_table(
+        "practice_daily_rollups",
+        sa.Column("profile_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("profiles.id"),
+                  primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("word_id", sa.Integer(), sa.ForeignKey("words.id"), primary_key=True),
+        sa.Column("total_practices", sa.Integer(), nullable=False),
+        sa.Column("correct_answers", sa.Integer(), nullable=False),
+        sa.Column("last_practiced_at", sa.DateTime(), nullable=False),
+        sa.Column("last_miss_at", sa.DateTime(), nullable=True),
+        sa.Column("trailing_correct", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_practice_daily_rollups_word_day", "practice_daily_rollups",
+                    ["word_id", "day"])
+
+
+def downgrade() -> None:
+    # Compacted history is lost: the rollups cannot be turned back into answers
+    op.drop_table("practice_daily_rollups")
+
+    _detach_old_table()
+    op.create_table(
+        "practice_sessions",
+        *_session_columns(),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="practice_sessions_pkey"),
+    )
+    op.execute(f"INSERT INTO practice_sessions ({COLUMNS}) "
+               f"SELECT {COLUMNS} FROM practice_sessions_old")
+    op.execute("ALTER SEQUENCE practice_sessions_id_seq OWNED BY practice_sessions.id")
+    op.drop_table("practice_sessions_old")
+    for name, columns, options in INDEXES:
+        op.create_index(name, "practice_sessions", columns, **options)
@@ -0,0 +1,29 @@
+"""Flush tokens of the practice write-behind buffer
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "practice_flushes",
+        sa.Column("token", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("flushed_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_practice_flushes_flushed_at", "practice_flushes", ["flushed_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("practice_flushes")
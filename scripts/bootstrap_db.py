@@ -1,8 +1,4 @@
 #!/usr/bin/env python3
-from app.core.security import get_password_hash
-from app.db.models.user import User
-from app.db.session import engine, Base
-from sqlalchemy.orm import Session
 import os
 import sys
 
@@ -10,19 +6,32 @@ import sys
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
 
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.models import dictionary, practice_flush, practice_rollup, practice_session, profile, word  # noqa: E402,F401
+from app.db.models.user import User  # noqa: E402
+from app.db.session import Base, get_engine  # noqa: E402
+from app.services.practice_history import maintain  # noqa: E402
+
 
 def main():
-    # 1) Create the table if needed
+    engine = get_engine()
+    # 1) Create the tables if needed
     Base.metadata.create_all(bind=engine)
-    print("✅ users table created")
+    print("✅ tables created")
+    with engine.connect() as conn:
+        maintain(conn)
+    print("✅ practice_sessions partitions created")
 
-    # 2) Seed an initial user (if not already present)
+    # 2) Seed an initial admin user (if not already present)
     with Session(engine) as session:
         email = "admin@example.com"
         if not session.query(User).filter_by(email=email).first():
             user = User(
                 email=email,
-                hashed_password=get_password_hash("ChangeMe123!")
+                hashed_password=get_password_hash("ChangeMe123!"),
+                is_admin=True
             )
             session.add(user)
             session.commit()
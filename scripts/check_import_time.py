@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded by the app's lifespan or on demand; importing them at module level
+# would slow every worker boot again
+LAZY_MODULES = ["asyncpg", "psycopg2", "pyarrow", "uvicorn"]
+
+# import time:  self [us] | cumulative | imported package
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+BUILD_APP = (
+    "import time; import app.main; started = time.perf_counter(); app.main.create_app(); "
+    "print(time.perf_counter() - started)"
+)
+
+
+def measure() -> Tuple[Dict[str, Tuple[int, int]], float]:
+    """Import app.main in a fresh interpreter. Returns the self and
+    cumulative microseconds of each top-level import, keyed by module, and
+    the seconds create_app() took."""
+    # The app must import without database settings
+    env = {key: value for key, value in os.environ.items() if not key.startswith("DATABASE_")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BUILD_APP],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    if result.returncode:
+        sys.exit(f"❌ importing app.main failed:\n{result.stderr}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us))
+    return modules, float(result.stdout.strip().splitlines()[-1])
+
+
+def slowest(modules: Dict[str, Tuple[int, int]], count: int) -> List[Tuple[str, int]]:
+    """Modules with the highest self time."""
+    ranked = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+    return [(name, self_us) for name, (self_us, _) in ranked[:count]]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that importing the API stays within a time budget "
+                    "(python -X importtime).")
+    parser.add_argument("--budget-ms", type=float, default=1500,
+                        help="Longest acceptable cumulative import time of app.main")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="Imports to run; the fastest counts, the others absorb disk caches")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    args = parser.parse_args()
+
+    modules, build_seconds = min(
+        (measure() for _ in range(args.runs)), key=lambda run: run[0]["app.main"][1])
+    total_ms = modules["app.main"][1] / 1000
+
+    print("ℹ️  slowest modules by self time:")
+    for name, self_us in slowest(modules, args.top):
+        print(f"   {self_us / 1000:8.1f} ms  {name}")
+    print(f"ℹ️  create_app() took {build_seconds * 1000:.1f} ms")
+
+    failures = 0
+    eager = [name for name in LAZY_MODULES if name in modules]
+    for name in eager:
+        print(f"❌ {name} is imported by app.main; it should be imported on first use")
+    failures += len(eager)
+    ok = total_ms <= args.budget_ms
+    failures += not ok
+    print(f"{'✅' if ok else '❌'} app.main imported in {total_ms:.1f} ms "
+          f"(budget {args.budget_ms:.0f} ms)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
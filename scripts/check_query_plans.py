@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Dict, FrozenSet, List, Set, Tuple
+
+# make sure `app` is on PYTHONPATH
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from sqlalchemy import delete, func, select, text  # noqa: E402
+
+from app.api.routes.words import select_word_rows, select_words_with_entry  # noqa: E402
+from app.core.pagination import Cursor, Keyset  # noqa: E402
+from app.db.models.dictionary import Dictionary  # noqa: E402
+from app.db.models.practice_session import PracticeSession  # noqa: E402
+from app.db.models.word import Word  # noqa: E402
+from app.db.session import get_engine  # noqa: E402
+from app.services.autocomplete import prefix_query  # noqa: E402
+from app.services.export import export_query  # noqa: E402
+from app.services.search import SearchMode, search_query  # noqa: E402
+from app.services.stats import daily_activity_query, difficulty_rollup_query, word_stats_query  # noqa: E402
+
+PROFILE_ID = uuid.UUID(int=1)
+WORDS_BY_PROFILE = frozenset({
+    "ix_words_profile_created", "ix_words_profile_due", "uq_words_profile_dictionary"})
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    build: Callable
+    # The plan must use at least one of these indexes
+    expected: FrozenSet[str]
+
+
+def _words_page(cursor=None):
+    keyset = Keyset("created_at", Word.created_at, Word.id)
+    return keyset.apply(
+        select_word_rows().where(Word.profile_id == PROFILE_ID), cursor, 10)
+
+
+def _dictionary_page(language=None):
+    query = select(Dictionary)
+    if language:
+        query = query.where(Dictionary.language == language)
+    return Keyset("text", Dictionary.text, Dictionary.id).apply(query, None, 10)
+
+
+CHECKS: List[PlanCheck] = [
+    PlanCheck("GET /words (first page)", _words_page,
+              frozenset({"ix_words_profile_created"})),
+    PlanCheck("GET /words (cursor page)",
+              lambda: _words_page(Cursor("created_at", False, datetime(2024, 1, 1), 1, False)),
+              frozenset({"ix_words_profile_created"})),
+    PlanCheck("GET /words/due",
+              lambda: select_word_rows()
+              .where(Word.profile_id == PROFILE_ID, Word.due_at <= datetime(2024, 1, 1))
+              .order_by(Word.due_at, Word.id).limit(20),
+              frozenset({"ix_words_profile_due"})),
+    PlanCheck("GET /words/{id}",
+              lambda: select_words_with_entry().where(Word.id == 1, Word.profile_id == PROFILE_ID),
+              frozenset({"words_pkey"})),
+    PlanCheck("GET /words/stats", lambda: word_stats_query(PROFILE_ID).limit(100),
+              WORDS_BY_PROFILE),
+    PlanCheck("GET /words/stats/summary (by difficulty)",
+              lambda: difficulty_rollup_query(PROFILE_ID), WORDS_BY_PROFILE),
+    PlanCheck("GET /words/stats/summary (daily activity)",
+              lambda: daily_activity_query(PROFILE_ID, date(2024, 1, 1)),
+              frozenset({"ix_practice_sessions_profile_created"})),
+    PlanCheck("GET /words/stats/summary (daily activity, rolled up)",
+              lambda: daily_activity_query(PROFILE_ID, date(2024, 1, 1)),
+              frozenset({"practice_daily_rollups_pkey"})),
+    PlanCheck("GET /words/export", lambda: export_query(PROFILE_ID),
+              frozenset({"ix_practice_sessions_word_created", "ix_practice_sessions_profile_created"})),
+    PlanCheck("POST /words/practice/batch (lock)",
+              lambda: select(Word).where(Word.id.in_([1, 2, 3]), Word.profile_id == PROFILE_ID)
+              .order_by(Word.id).with_for_update(),
+              WORDS_BY_PROFILE | {"words_pkey"}),
+    PlanCheck("DELETE /words/{id} (history)",
+              lambda: delete(PracticeSession).where(PracticeSession.word_id == 1),
+              frozenset({"ix_practice_sessions_word_created", "ix_practice_sessions_word_misses"})),
+    PlanCheck("GET /dictionary (by text)", _dictionary_page,
+              frozenset({"ix_dictionary_text_id"})),
+    PlanCheck("GET /dictionary (by language and text)", lambda: _dictionary_page("en"),
+              frozenset({"ix_dictionary_language_text_id"})),
+    PlanCheck("GET /dictionary/search (fulltext)",
+              lambda: search_query("house", SearchMode.FULLTEXT, None, 20),
+              frozenset({"ix_dictionary_search_vector"})),
+    PlanCheck("GET /dictionary/search (substring)",
+              lambda: search_query("ous", SearchMode.SUBSTRING, None, 20),
+              frozenset({"ix_dictionary_text_trgm"})),
+    PlanCheck("GET /dictionary/search (fuzzy)",
+              lambda: search_query("hause", SearchMode.FUZZY, None, 20),
+              frozenset({"ix_dictionary_text_trgm"})),
+    PlanCheck("GET /dictionary/autocomplete (fallback)",
+              lambda: prefix_query("hou", None, 10),
+              frozenset({"ix_dictionary_text_trgm"})),
+    PlanCheck("rebuild_word_stats.py (last miss)",
+              lambda: select(PracticeSession.word_id, func.max(PracticeSession.created_at))
+              .where(~PracticeSession.correct).group_by(PracticeSession.word_id),
+              frozenset({"ix_practice_sessions_word_misses"})),
+]
+
+
+# Indexes of a partition, by the partitioned index they belong to
+PARTITION_INDEXES_SQL = """
+SELECT child.relname, parent.relname
+FROM pg_inherits AS i
+JOIN pg_class AS child ON child.oid = i.inhrelid
+JOIN pg_class AS parent ON parent.oid = i.inhparent
+WHERE child.relkind = 'i'
+"""
+
+
+def _walk(node: dict, parents: Dict[str, str], indexes: Set[str], seq_scans: Set[str]) -> None:
+    if "Index Name" in node:
+        indexes.add(parents.get(node["Index Name"], node["Index Name"]))
+    if node.get("Node Type") == "Seq Scan":
+        seq_scans.add(node.get("Relation Name", "?"))
+    for child in node.get("Plans", []):
+        _walk(child, parents, indexes, seq_scans)
+
+
+def explain(conn, statement, parents: Dict[str, str]) -> Tuple[dict, Set[str], Set[str]]:
+    compiled = statement.compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    plan = conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()[0]["Plan"]
+    indexes, seq_scans = set(), set()
+    _walk(plan, parents, indexes, seq_scans)
+    return plan, indexes, seq_scans
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that the route queries are planned with the expected indexes.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    failures = 0
+    with get_engine().connect() as conn:
+        # Development databases are too small for the planner to prefer an
+        # index; with sequential scans priced out, a Seq Scan in the plan
+        # means no usable index exists.
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        parents = dict(conn.execute(text(PARTITION_INDEXES_SQL)).all())
+        for check in CHECKS:
+            plan, indexes, seq_scans = explain(conn, check.build(), parents)
+            ok = bool(indexes & check.expected) and not seq_scans
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} {check.name}")
+            if not ok or args.verbose:
+                print(f"    expected one of: {', '.join(sorted(check.expected))}")
+                print(f"    indexes used:    {', '.join(sorted(indexes)) or '-'}")
+                if seq_scans:
+                    print(f"    seq scans on:    {', '.join(sorted(seq_scans))}")
+            if args.verbose:
+                print(json.dumps(plan, indent=2, default=str))
+        conn.rollback()
+
+    print(f"{len(CHECKS) - failures}/{len(CHECKS)} plans as expected")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import os
+import sys
+
+# make sure `app` is on PYTHONPATH
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from app.services.dictionary_cache import dictionary_cache  # noqa: E402
+from app.services.dictionary_import import (  # noqa: E402
+    IMPORT_BATCH_SIZE,
+    ConflictAction,
+    ImportFormat,
+    import_dictionary,
+    open_text,
+)
+
+
+def guess_format(path: str) -> ImportFormat:
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith((".jsonl", ".json", ".ndjson")):
+        return ImportFormat.JSONL
+    return ImportFormat.CSV
+
+
+async def run(args) -> None:
+    fmt = ImportFormat(args.format) if args.format else guess_format(args.path)
+    with open(args.path, "rb") as raw, open_text(raw) as source:
+        async for report in import_dictionary(
+                source, fmt, ConflictAction(args.on_conflict), args.language, args.batch_size):
+            if report.done:
+                continue
+            print(
+                f"… {report.rows_read} read, {report.inserted} inserted, "
+                f"{report.updated} updated, {report.unchanged} unchanged, "
+                f"{report.rejected} rejected ({report.rows_per_second:,.0f} rows/s)",
+                flush=True,
+            )
+    # Running servers pick the changes up once their local caches expire
+    await dictionary_cache.invalidate()
+
+    for rejected in report.rejected_rows:
+        print(f"  line {rejected['line']}: {rejected['reason']}")
+    if report.rejected > len(report.rejected_rows):
+        print(f"  … and {report.rejected - len(report.rejected_rows)} more rejected rows")
+    print(f"✅ imported {report.inserted + report.updated} entries in "
+          f"{report.elapsed_seconds:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bulk upsert dictionary entries from CSV, JSONL or a Wiktionary dump.")
+    parser.add_argument("path", help="Input file, optionally gzipped")
+    parser.add_argument(
+        "--format", choices=[f.value for f in ImportFormat],
+        help="Input format (default: from the file extension)")
+    parser.add_argument(
+        "--on-conflict", choices=[a.value for a in ConflictAction],
+        default=ConflictAction.UPDATE.value,
+        help="What to do with entries whose (text, language) already exists")
+    parser.add_argument(
+        "--language", help="Language for records that do not name one")
+    parser.add_argument(
+        "--batch-size", type=int, default=IMPORT_BATCH_SIZE,
+        help="Rows per COPY batch and transaction")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
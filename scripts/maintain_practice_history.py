@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+
+# make sure `app` is on PYTHONPATH
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from app.db.session import get_engine  # noqa: E402
+from app.services.practice_history import maintain  # noqa: E402
+
+
+def main():
+    argparse.ArgumentParser(
+        description="Create upcoming practice_sessions partitions, compact old answers "
+                    "into daily rollups and apply the rollup retention.").parse_args()
+
+    with get_engine().connect() as conn:
+        report = maintain(conn)
+    if report.skipped:
+        print("ℹ️  maintenance is already running elsewhere")
+        return
+    print(f"✅ partitions created: {', '.join(report.created) or '-'}")
+    print(f"✅ compacted: {', '.join(report.compacted) or '-'} ({report.rollup_rows} rollup rows)")
+    if report.deferred:
+        print(f"ℹ️  in use, left for the next run: {', '.join(report.deferred)}")
+    print(f"✅ expired rollups: {report.expired_rollups}")
+
+
+if __name__ == "__main__":
+    main()
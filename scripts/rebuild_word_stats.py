@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+
+# make sure `app` is on PYTHONPATH
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.db.session import get_engine  # noqa: E402
+
+# Recompute every counter from practice_sessions and the daily rollups of
+# the answers already compacted, in one set-based pass.
+# streak = correct answers after the most recent miss. When that miss is in
+# a rolled-up day, the day's trailing_correct counts the answers after it.
+REBUILD_SQL = """
+WITH raw AS (
+    SELECT word_id,
+           count(*) AS total,
+           count(*) FILTER (WHERE correct) AS correct,
+           max(created_at) AS last_practiced,
+           max(created_at) FILTER (WHERE NOT correct) AS last_miss
+    FROM practice_sessions
+    WHERE CAST(:profile_id AS uuid) IS NULL OR profile_id = CAST(:profile_id AS uuid)
+    GROUP BY word_id
+), rolled_up AS (
+    SELECT word_id,
+           sum(total_practices) AS total,
+           sum(correct_answers) AS correct,
+           max(last_practiced_at) AS last_practiced,
+           max(last_miss_at) AS last_miss
+    FROM practice_daily_rollups
+    WHERE CAST(:profile_id AS uuid) IS NULL OR profile_id = CAST(:profile_id AS uuid)
+    GROUP BY word_id
+), combined AS (
+    SELECT word_id,
+           sum(total) AS total,
+           sum(correct) AS correct,
+           max(last_practiced) AS last_practiced,
+           max(last_miss) AS last_miss
+    FROM (SELECT * FROM raw UNION ALL SELECT * FROM rolled_up) AS both_sources
+    GROUP BY word_id
+), streaks AS (
+    SELECT word_id, sum(streak) AS streak
+    FROM (
+        SELECT p.word_id, count(*) AS streak
+        FROM practice_sessions AS p
+        JOIN combined AS c ON c.word_id = p.word_id
+        WHERE p.correct
+          AND p.created_at > COALESCE(c.last_miss, '-infinity'::timestamp)
+        GROUP BY p.word_id
+        UNION ALL
+        SELECT r.word_id, sum(CASE
+            WHEN c.last_miss IS NULL OR r.day > CAST(c.last_miss AS date) THEN r.correct_answers
+            WHEN r.last_miss_at = c.last_miss THEN r.trailing_correct
+            ELSE 0
+        END)
+        FROM practice_daily_rollups AS r
+        JOIN combined AS c ON c.word_id = r.word_id
+        GROUP BY r.word_id
+    ) AS parts
+    GROUP BY word_id
+)
+UPDATE words AS w
+SET total_practices = COALESCE(c.total, 0),
+    correct_answers = COALESCE(c.correct, 0),
+    streak = COALESCE(s.streak, 0),
+    last_practiced_at = c.last_practiced
+FROM words AS target
+LEFT JOIN combined AS c ON c.word_id = target.id
+LEFT JOIN streaks AS s ON s.word_id = target.id
+WHERE w.id = target.id
+  AND (CAST(:profile_id AS uuid) IS NULL OR target.profile_id = CAST(:profile_id AS uuid))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild the materialized practice counters on words.")
+    parser.add_argument(
+        "--profile-id", help="Only rebuild words of this profile")
+    args = parser.parse_args()
+
+    with get_engine().begin() as conn:
+        result = conn.execute(text(REBUILD_SQL), {"profile_id": args.profile_id})
+    print(f"✅ rebuilt practice stats for {result.rowcount} words")
+
+
+if __name__ == "__main__":
+    main()
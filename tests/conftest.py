@@ -0,0 +1,99 @@
+import os
+import sys
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+# make sure `app` is on PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read when the settings are imported, so set before any `app` import.
+# Tests run against their own database: the schema is dropped and recreated.
+os.environ["DATABASE_NAME"] = os.getenv(
+    "TEST_DATABASE_NAME", f"{os.getenv('DATABASE_NAME', 'word_trainer')}_test")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ["DB_QUERY_BUDGET_ENFORCE"] = "true"
+os.environ["REDIS_URL"] = ""
+os.environ["PRACTICE_WRITE_BEHIND"] = "false"
+
+from app.db.models import (  # noqa: E402,F401  registers every table on Base.metadata
+    dictionary, practice_flush, practice_rollup, practice_session, profile, user, word)
+from app.db.session import Base, database_url, dispose_engines, get_engine  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.services.dictionary_cache import dictionary_cache  # noqa: E402
+from app.services.practice_history import maintain  # noqa: E402
+
+PASSWORD = "test-password"
+
+
+def _create_database() -> None:
+    url = database_url()
+    server, name = url.rsplit("/", 1)
+    admin = create_engine(f"{server}/postgres", isolation_level="AUTOCOMMIT")
+    try:
+        with admin.connect() as conn:
+            if not conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                                {"name": name}).scalar():
+                conn.execute(text(f'CREATE DATABASE "{name}"'))
+    finally:
+        admin.dispose()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The test database with a fresh schema; skips when PostgreSQL is not
+    reachable with the DATABASE_* settings."""
+    try:
+        _create_database()
+        engine = get_engine()
+        engine.connect().close()
+    except (ValueError, OperationalError) as exc:
+        pytest.skip(f"PostgreSQL is not available: {exc}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        maintain(conn)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(database):
+    """The sync engine, with every table emptied before the test."""
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with database.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    dictionary_cache.local.clear()
+    return database
+
+
+@pytest.fixture
+async def client(db):
+    app = create_app()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                                 base_url="http://test") as client:
+        yield client
+    # Pooled connections belong to this test's event loop
+    await dispose_engines()
+
+
+@pytest.fixture
+async def auth_headers(client):
+    """Authorization header of a new user with a profile."""
+    email = "learner@example.com"
+    response = await client.post("/auth/signup", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 201, response.text
+    response = await client.post("/auth/signin", data={"username": email, "password": PASSWORD})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    response = await client.post("/profile", json={"name": "Learner"}, headers=headers)
+    assert response.status_code == 201, response.text
+    return headers
@@ -0,0 +1,58 @@
+import json
+import tempfile
+import threading
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+import app.api.routes.admin as admin_routes
+from app.core.security import invalidate_principal
+from app.db.models.dictionary import Dictionary
+from app.db.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+ROWS = 200
+
+
+@pytest.fixture
+def admin_headers(db, auth_headers):
+    with Session(db) as session:
+        user_id = session.execute(update(User).values(is_admin=True).returning(User.id)).scalar_one()
+        session.commit()
+    invalidate_principal(user_id)
+    return auth_headers
+
+
+def csv_body() -> bytes:
+    lines = ["text,meaning,language"] + [f"word{i},meaning {i},en" for i in range(ROWS)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def test_spooled_upload_is_written_off_the_event_loop(client, db, admin_headers,
+                                                           monkeypatch):
+    writers = set()
+
+    class RecordingFile(tempfile.SpooledTemporaryFile):
+        def write(self, data):
+            writers.add(threading.current_thread())
+            return super().write(data)
+
+    # Spill to disk after the first kilobyte
+    monkeypatch.setattr(admin_routes, "UPLOAD_SPOOL_BYTES", 1024)
+    monkeypatch.setattr(admin_routes.tempfile, "SpooledTemporaryFile", RecordingFile)
+
+    async def chunks():
+        body = csv_body()
+        for start in range(0, len(body), 512):
+            yield body[start:start + 512]
+
+    response = await client.post("/admin/dictionary/import?format=csv",
+                                 headers=admin_headers, content=chunks())
+    assert response.status_code == 200, response.text
+    report = json.loads(response.text.splitlines()[-1])
+    assert report["inserted"] == ROWS
+    assert writers and threading.main_thread() not in writers
+    with Session(db) as session:
+        assert len(session.execute(select(Dictionary.id)).all()) == ROWS
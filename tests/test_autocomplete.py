@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+import app.services.autocomplete as autocomplete_module
+from app.db.models.word import DifficultyLevel
+from app.services.autocomplete import PrefixIndex
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeSession:
+    """Streams a snapshot of ``table`` taken when the query starts; the
+    first stream waits for ``release`` before returning rows."""
+
+    def __init__(self, table, release):
+        self.table = table
+        self.release = release
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, query):
+        rows = list(self.table)
+        release = self.release
+
+        class Result:
+            async def partitions(self):
+                if not release.is_set():
+                    await release.wait()
+                yield rows
+
+        return Result()
+
+
+@pytest.fixture
+def table(monkeypatch):
+    rows = [(1, "apple", "en", DifficultyLevel.EASY), (2, "apricot", "en", DifficultyLevel.EASY)]
+    release = asyncio.Event()
+    monkeypatch.setattr(autocomplete_module, "AsyncSessionLocal",
+                        lambda: FakeSession(rows, release))
+    return rows, release
+
+
+def texts(index: PrefixIndex):
+    return [suggestion.text for suggestion in index.search("ap")]
+
+
+async def test_load_and_search(table):
+    _, release = table
+    release.set()
+    index = PrefixIndex(max_entries=100)
+    await index.load()
+    assert texts(index) == ["apple", "apricot"]
+
+
+async def test_overlapping_loads_keep_writes_made_meanwhile(table):
+    rows, release = table
+    index = PrefixIndex(max_entries=100)
+    first = asyncio.create_task(index.load())
+    await asyncio.sleep(0)
+    second = asyncio.create_task(index.load())
+    await asyncio.sleep(0)
+
+    # Deleted while the first load is reading the table
+    rows.remove((1, "apple", "en", DifficultyLevel.EASY))
+    index.remove(1)
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert texts(index) == ["apricot"]
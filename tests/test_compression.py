@@ -0,0 +1,96 @@
+import gzip
+import zlib
+
+import pytest
+
+from app.core.compression import CompressionMiddleware, brotli_available, choose_encoding
+
+LINES = [b'{"processed": %d}\n' % i for i in range(5)]
+
+
+def streaming_app(lines):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")]})
+        for line in lines:
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    return app
+
+
+def body_app(body):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def call(app, accept_encoding: str):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "query_string": b"",
+             "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    await CompressionMiddleware(app, minimum_size=1)(scope, receive, send)
+    return messages[0], [m.get("body", b"") for m in messages[1:]]
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+    ("br", "br" if brotli_available() else None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.anyio
+async def test_gzip_streams_each_chunk():
+    start, bodies = await call(streaming_app(LINES), "gzip")
+    assert dict(start["headers"])[b"content-encoding"] == b"gzip"
+
+    # Every chunk decodes on arrival to exactly the line the app sent, so
+    # nothing is held back until the end of the stream
+    decompressor = zlib.decompressobj(31)
+    received = [decompressor.decompress(body) for body in bodies]
+    assert received[:-1] == LINES
+    assert decompressor.decompress(bodies[-1]) + decompressor.flush() == b""
+    assert decompressor.eof
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not brotli_available(), reason="brotli is not installed")
+async def test_brotli_streams_each_chunk():
+    import brotli
+
+    start, bodies = await call(streaming_app(LINES), "br")
+    assert dict(start["headers"])[b"content-encoding"] == b"br"
+    decompressor = brotli.Decompressor()
+    assert [decompressor.process(body) for body in bodies[:-1]] == LINES
+
+
+@pytest.mark.anyio
+async def test_gzip_whole_body():
+    body = b'{"text": "apple"}' * 100
+    start, bodies = await call(body_app(body), "gzip")
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert int(headers[b"content-length"]) == len(bodies[0])
+    assert gzip.decompress(bodies[0]) == body
+
+
+@pytest.mark.anyio
+async def test_identity_when_not_accepted():
+    body = b'{"text": "apple"}' * 100
+    start, bodies = await call(body_app(body), "identity")
+    assert b"content-encoding" not in dict(start["headers"])
+    assert bodies == [body]
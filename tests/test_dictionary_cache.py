@@ -0,0 +1,218 @@
+import pytest
+from starlette.requests import Request
+
+from app.core.conditional import etag_for, is_not_modified
+from app.db.query_counter import count_queries
+from app.services.dictionary_cache import GENERATION_KEY, DictionaryCache, dictionary_cache
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the redis client the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+class BrokenRedis(FakeRedis):
+    async def get(self, key):
+        raise ConnectionError("redis is down")
+
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def make_cache(remote=None) -> DictionaryCache:
+    return DictionaryCache(maxsize=16, ttl=60, remote=remote)
+
+
+def request(**headers: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"",
+                    "headers": [(k.replace("_", "-").encode(), v.encode())
+                                for k, v in headers.items()]})
+
+
+async def test_miss_loads_then_hits_locally():
+    cache, loader = make_cache(), Loader({"body": 1})
+    assert await cache.get("dictionary:entry:1", loader) == {"body": 1}
+    assert await cache.get("dictionary:entry:1", loader) == {"body": 1}
+    assert loader.calls == 1
+    assert cache.stats()["local_hits"] == 1
+
+
+async def test_not_found_is_not_cached():
+    cache, loader = make_cache(), Loader(None)
+    assert await cache.get("dictionary:entry:1", loader) is None
+    assert await cache.get("dictionary:entry:1", loader) is None
+    assert loader.calls == 2
+
+
+async def test_remote_tier_is_shared_between_workers():
+    remote = FakeRedis()
+    first, second = make_cache(remote), make_cache(remote)
+    loader = Loader({"body": [1, 2]})
+    await first.get("dictionary:list:a", loader, versioned=True)
+    assert await second.get("dictionary:list:a", loader, versioned=True) == {"body": [1, 2]}
+    assert loader.calls == 1
+
+
+async def test_write_invalidates_listings_and_entry_everywhere():
+    remote = FakeRedis()
+    writer, reader = make_cache(remote), make_cache(remote)
+    await writer.get("dictionary:list:a", Loader({"body": "old"}), versioned=True)
+    await writer.get(DictionaryCache.entry_key(1), Loader({"body": "old"}))
+
+    await writer.invalidate(1)
+
+    assert remote.data[GENERATION_KEY] == "1"
+    assert DictionaryCache.entry_key(1) not in remote.data
+    # Another worker with an empty local tier reloads both
+    new = Loader({"body": "new"})
+    assert await reader.get("dictionary:list:a", new, versioned=True) == {"body": "new"}
+    assert await reader.get(DictionaryCache.entry_key(1), new) == {"body": "new"}
+    assert new.calls == 2
+
+
+async def test_load_racing_a_write_is_not_stored():
+    cache = make_cache(FakeRedis())
+
+    async def load_during_write():
+        await cache.invalidate()
+        return {"body": "stale"}
+
+    await cache.get("dictionary:list:a", load_during_write, versioned=True)
+    fresh = Loader({"body": "fresh"})
+    assert await cache.get("dictionary:list:a", fresh, versioned=True) == {"body": "fresh"}
+
+
+async def test_remote_errors_fall_back_to_the_loader():
+    cache, loader = make_cache(BrokenRedis()), Loader({"body": 1})
+    assert await cache.get("dictionary:entry:1", loader) == {"body": 1}
+    assert loader.calls == 1
+    assert cache.stats()["remote_errors"] == 1
+
+
+def test_if_none_match():
+    etag = etag_for({"id": 1})
+    assert is_not_modified(request(if_none_match=etag), etag, None)
+    # Weak comparison, lists and wildcards
+    assert is_not_modified(request(if_none_match=etag.removeprefix("W/")), etag, None)
+    assert is_not_modified(request(if_none_match=f'"other", {etag}'), etag, None)
+    assert is_not_modified(request(if_none_match="*"), etag, None)
+    assert not is_not_modified(request(if_none_match=etag_for({"id": 2})), etag, None)
+    assert not is_not_modified(request(), etag, None)
+
+
+def test_if_modified_since():
+    last_modified = "Sun, 18 Oct 2026 12:00:00 GMT"
+    assert is_not_modified(request(if_modified_since=last_modified), "x", last_modified)
+    assert not is_not_modified(
+        request(if_modified_since="Sat, 17 Oct 2026 12:00:00 GMT"), "x", last_modified)
+    # If-None-Match takes precedence
+    assert not is_not_modified(
+        request(if_none_match='"y"', if_modified_since=last_modified), '"x"', last_modified)
+
+
+@pytest.fixture
+def shared_tier():
+    remote = FakeRedis()
+    dictionary_cache.use_remote(remote)
+    yield remote
+    dictionary_cache.use_remote(None)
+
+
+async def test_entry_etag_round_trip(client, auth_headers, shared_tier):
+    response = await client.post("/dictionary", headers=auth_headers, json={
+        "text": "apple", "meaning": "a fruit", "language": "en"})
+    entry_id = response.json()["id"]
+
+    response = await client.get(f"/dictionary/{entry_id}")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert DictionaryCache.entry_key(entry_id) in shared_tier.data
+
+    # Answered from the cache: 304 without touching the database
+    with count_queries() as counter:
+        response = await client.get(f"/dictionary/{entry_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert counter.count == 0
+
+    response = await client.put(f"/dictionary/{entry_id}", headers=auth_headers, json={
+        "text": "apple", "meaning": "a round fruit", "language": "en"})
+    assert response.status_code == 200
+
+    response = await client.get(f"/dictionary/{entry_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["meaning"] == "a round fruit"
+    assert response.headers["etag"] != etag
+
+
+async def test_listing_304_and_invalidation(client, auth_headers, shared_tier):
+    await client.post("/dictionary", headers=auth_headers, json={
+        "text": "apple", "meaning": "a fruit", "language": "en"})
+    response = await client.get("/dictionary")
+    etag = response.headers["etag"]
+
+    response = await client.get("/dictionary", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    generation = int(shared_tier.data[GENERATION_KEY])
+    await client.post("/dictionary", headers=auth_headers, json={
+        "text": "banana", "meaning": "a fruit", "language": "en"})
+    assert int(shared_tier.data[GENERATION_KEY]) == generation + 1
+    response = await client.get("/dictionary", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [entry["text"] for entry in response.json()] == ["apple", "banana"]
+
+
+async def test_listing_key_ignores_field_order(client, auth_headers, db):
+    await client.post("/dictionary", headers=auth_headers, json={
+        "text": "apple", "meaning": "a fruit", "language": "en"})
+    response = await client.get("/dictionary?fields=text,meaning")
+    assert response.json() == [{"text": "apple", "meaning": "a fruit"}]
+
+    with count_queries() as counter:
+        response = await client.get("/dictionary?fields=meaning,text")
+    assert response.json() == [{"text": "apple", "meaning": "a fruit"}]
+    assert counter.count == 0
+
+
+async def test_listing_has_no_last_modified(client, auth_headers, db):
+    for text in ("apple", "banana"):
+        response = await client.post("/dictionary", headers=auth_headers, json={
+            "text": text, "meaning": "a fruit", "language": "en"})
+    banana_id = response.json()["id"]
+    response = await client.get("/dictionary")
+    assert "last-modified" not in response.headers
+    since = "Sun, 18 Oct 2099 12:00:00 GMT"
+
+    response = await client.delete(f"/dictionary/{banana_id}", headers=auth_headers)
+    assert response.status_code in (200, 204), response.text
+    # A deletion leaves the newest remaining updated_at unchanged; a date
+    # must not make the changed page look current
+    response = await client.get("/dictionary", headers={"If-Modified-Since": since})
+    assert response.status_code == 200
+    assert [entry["text"] for entry in response.json()] == ["apple"]
@@ -0,0 +1,33 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.hashing import HashingPool
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_shutdown_waits_for_running_hashes():
+    pool = HashingPool(workers=1, max_queue=4)
+    started, release, finished = threading.Event(), threading.Event(), threading.Event()
+
+    def slow_hash():
+        started.set()
+        release.wait(5)
+        finished.set()
+        return "hash"
+
+    job = asyncio.ensure_future(pool.run(slow_hash))
+    await asyncio.to_thread(started.wait, 5)
+    shutdown = asyncio.ensure_future(asyncio.to_thread(pool.shutdown))
+    await asyncio.sleep(0.1)
+    assert not shutdown.done()
+
+    release.set()
+    await shutdown
+    assert finished.is_set()
+    assert await job == "hash"
+    # The next app lifespan can hash again
+    assert await pool.run(lambda: "again") == "again"
+    pool.shutdown()
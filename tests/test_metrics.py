@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.core.metrics import render
+
+pytestmark = pytest.mark.anyio
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import sys
+from app.api.middleware import requests_in_progress
+from app.core.metrics import worker_stopped
+from app.db.query_timing import slow_queries
+
+slow_queries.labels("/words").inc()
+requests_in_progress.labels("GET").inc()
+if sys.argv[1] == "stop":
+    worker_stopped()
+"""
+
+
+def run_worker(multiprocess_dir: str, action: str) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": multiprocess_dir}
+    subprocess.run([sys.executable, "-c", WORKER, action], cwd=ROOT_DIR, env=env, check=True)
+
+
+def test_workers_share_their_metrics(tmp_path, monkeypatch):
+    for action in ("keep", "keep", "stop"):
+        run_worker(str(tmp_path), action)
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    text = render().decode()
+    # Counters add up over every worker, stopped ones included
+    assert 'db_slow_queries_total{route="/words"} 3.0' in text
+    # Live gauges drop the worker that stopped
+    assert 'http_requests_in_progress{method="GET"} 2.0' in text
+
+
+async def test_metrics_endpoint(client):
+    await client.get("/health")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
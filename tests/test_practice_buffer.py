@@ -0,0 +1,130 @@
+import asyncio
+import uuid
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import app.services.practice_buffer as practice_buffer_module
+from app.db.models.dictionary import Dictionary
+from app.db.models.practice_session import PracticeSession
+from app.db.models.profile import Profile
+from app.db.models.word import Word
+from app.services.practice import PracticeAnswer
+from app.services.practice_buffer import PracticeBuffer
+
+pytestmark = pytest.mark.anyio
+
+ANSWERS = 5
+
+
+@pytest.fixture
+def words(db, auth_headers) -> Tuple[uuid.UUID, List[int]]:
+    """The user's profile id and words to answer."""
+    with Session(db) as session:
+        profile_id = session.execute(select(Profile.id)).scalar_one()
+        entries = [Dictionary(text=f"word{i}", meaning="m", language="en") for i in range(ANSWERS)]
+        session.add_all(entries)
+        session.flush()
+        words = [Word(dictionary_id=entry.id, profile_id=profile_id) for entry in entries]
+        session.add_all(words)
+        session.commit()
+        return profile_id, [word.id for word in words]
+
+
+@pytest.fixture
+def buffers(tmp_path):
+    """Two workers sharing one buffer file."""
+    path = str(tmp_path / "practice_buffer.sqlite3")
+    workers = [PracticeBuffer(path, max_events=100, interval=1) for _ in range(2)]
+    yield workers
+    for buffer in workers:
+        buffer.close()
+
+
+async def enqueue(buffer: PracticeBuffer, words) -> None:
+    profile_id, word_ids = words
+    await buffer.enqueue(profile_id, [PracticeAnswer(word_id=word_id, correct=True)
+                                      for word_id in word_ids])
+
+
+def recorded(db) -> int:
+    with Session(db) as session:
+        return session.execute(select(func.count()).select_from(PracticeSession)).scalar_one()
+
+
+def pending(buffer: PracticeBuffer) -> int:
+    return buffer.stats()["pending"]
+
+
+def expire_leases(buffer: PracticeBuffer) -> None:
+    buffer.open()
+    buffer._db.execute("UPDATE practice_events SET lease_until = 0 WHERE token IS NOT NULL")
+
+
+async def test_flush_records_and_empties_the_buffer(db, words, buffers):
+    buffer = buffers[0]
+    await enqueue(buffer, words)
+    assert await buffer.flush_once() == ANSWERS
+    assert recorded(db) == ANSWERS
+    assert pending(buffer) == 0
+
+
+async def test_crash_before_commit_is_flushed_again(db, words, buffers):
+    first, second = buffers
+    await enqueue(first, words)
+    # The first worker leased the batch and died before recording it
+    first._claim(first.max_events)
+    assert await second.flush_once() == 0
+
+    expire_leases(second)
+    assert await second.flush_once() == ANSWERS
+    assert recorded(db) == ANSWERS
+    assert pending(second) == 0
+
+
+async def test_crash_after_commit_is_not_recorded_twice(db, words, buffers, monkeypatch):
+    first, second = buffers
+    await enqueue(first, words)
+    # The first worker committed the batch and died before deleting it
+    monkeypatch.setattr(first, "_forget", lambda tokens: None)
+    await first.flush_once()
+    assert recorded(db) == ANSWERS
+    assert pending(first) == ANSWERS
+
+    expire_leases(second)
+    await second.flush_once()
+    assert recorded(db) == ANSWERS
+    assert pending(second) == 0
+    assert second.stats()["recovered_batches"] == 1
+
+
+async def test_stalled_flusher_and_takeover_record_once(db, words, buffers, monkeypatch):
+    first, second = buffers
+    await enqueue(first, words)
+    stalled, release = asyncio.Event(), asyncio.Event()
+    record_practice = practice_buffer_module.record_practice
+
+    async def stall_first_call(*args, **kwargs):
+        if not stalled.is_set():
+            stalled.set()
+            await release.wait()
+        return await record_practice(*args, **kwargs)
+
+    monkeypatch.setattr(practice_buffer_module, "record_practice", stall_first_call)
+
+    # The first flusher stalls, e.g. on the database, past its lease
+    slow = asyncio.create_task(first.flush_once())
+    await stalled.wait()
+    expire_leases(second)
+    takeover = asyncio.create_task(second.flush_once())
+    # The takeover waits on the first flusher's uncommitted token
+    await asyncio.sleep(0.5)
+    assert not takeover.done()
+
+    release.set()
+    await asyncio.gather(slow, takeover)
+    assert recorded(db) == ANSWERS
+    assert pending(first) == 0
+    assert second.stats()["recovered_batches"] == 1
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.dictionary import Dictionary
+from app.db.models.practice_rollup import PracticeDailyRollup
+from app.db.models.practice_session import PracticeSession
+from app.db.models.profile import Profile
+from app.db.models.word import Word
+from app.services.practice_history import (
+    compact, create_partition, existing_partitions, partition_name)
+
+pytestmark = pytest.mark.anyio
+
+OLD_MONTH = date(2020, 1, 1)
+CUTOFF = date(2020, 2, 1)
+
+
+@pytest.fixture
+def old_partition(db, auth_headers):
+    """A partition of an old month holding three answers to one word."""
+    with db.connect() as conn:
+        create_partition(conn, OLD_MONTH)
+        conn.commit()
+    with Session(db) as session:
+        profile_id = session.execute(select(Profile.id)).scalar_one()
+        entry = Dictionary(text="apple", meaning="a fruit", language="en")
+        session.add(entry)
+        session.flush()
+        word = Word(dictionary_id=entry.id, profile_id=profile_id)
+        session.add(word)
+        session.flush()
+        session.add_all([
+            PracticeSession(word_id=word.id, profile_id=profile_id, correct=correct,
+                            created_at=datetime(2020, 1, 15, 12, minute))
+            for minute, correct in enumerate([True, False, True])
+        ])
+        session.commit()
+    return partition_name(OLD_MONTH)
+
+
+def rollups(db):
+    with Session(db) as session:
+        return session.execute(
+            select(PracticeDailyRollup.total_practices, PracticeDailyRollup.correct_answers)
+        ).all()
+
+
+async def test_compact_rolls_up_and_drops_the_partition(db, old_partition):
+    with db.connect() as conn:
+        report = compact(conn, CUTOFF)
+        assert OLD_MONTH not in existing_partitions(conn)
+    assert report.compacted == [old_partition]
+    assert report.deferred == []
+    assert rollups(db) == [(3, 2)]
+
+
+async def test_compact_does_not_queue_behind_a_long_reader(db, old_partition, monkeypatch):
+    monkeypatch.setattr(settings, "PRACTICE_COMPACT_LOCK_TIMEOUT_MS", 100)
+    with db.connect() as reader:
+        # e.g. an export streaming practice history
+        reader.execute(text("BEGIN ISOLATION LEVEL REPEATABLE READ"))
+        reader.execute(select(func.count()).select_from(PracticeSession)).scalar()
+
+        with db.connect() as conn:
+            report = compact(conn, CUTOFF)
+            assert OLD_MONTH in existing_partitions(conn)
+        assert report.compacted == []
+        assert report.deferred == [old_partition]
+        # The rollup was undone with the drop
+        assert rollups(db) == []
+        reader.rollback()
+
+    with db.connect() as conn:
+        report = compact(conn, CUTOFF)
+    assert report.compacted == [old_partition]
+    assert rollups(db) == [(3, 2)]
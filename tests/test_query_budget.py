@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models.dictionary import Dictionary
+from app.db.models.practice_session import PracticeSession
+from app.db.models.profile import Profile
+from app.db.models.word import Word
+from app.db.query_counter import count_queries
+from app.services.dictionary_cache import dictionary_cache
+
+pytestmark = pytest.mark.anyio
+
+# Statements a list request may issue, whatever its page size: the page,
+# its count/cursor lookups and the principal
+QUERY_BUDGET = 5
+
+LIST_ENDPOINTS = [
+    "/words?limit=100",
+    "/words/due?limit=100",
+    "/words/stats?limit=100",
+    "/dictionary?limit=100",
+    "/dictionary/search?q=common&limit=100",
+]
+
+
+def seed(engine, numbers: range) -> None:
+    """Dictionary entries in the user's vocabulary, each due and practised once."""
+    now = datetime.utcnow()
+    with Session(engine) as db:
+        profile_id = db.execute(select(Profile.id)).scalar_one()
+        for i in numbers:
+            entry = Dictionary(text=f"word{i}", meaning=f"common meaning {i}", language="en")
+            db.add(entry)
+            db.flush()
+            word = Word(dictionary_id=entry.id, profile_id=profile_id,
+                        due_at=now - timedelta(days=1))
+            db.add(word)
+            db.flush()
+            db.add(PracticeSession(word_id=word.id, profile_id=profile_id,
+                                   correct=True, created_at=now))
+        db.commit()
+
+
+async def count_list_queries(client, url: str, headers: dict) -> int:
+    # A cached listing would answer without any query at all
+    dictionary_cache.local.clear()
+    with count_queries(QUERY_BUDGET) as counter:
+        response = await client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return counter.count
+
+
+@pytest.mark.parametrize("url", LIST_ENDPOINTS)
+async def test_list_queries_do_not_grow_with_rows(client, auth_headers, db, url):
+    seed(db, range(1))
+    # Warms the principal cache, which would otherwise save a query later
+    await client.get(url, headers=auth_headers)
+    one_row = await count_list_queries(client, url, auth_headers)
+
+    seed(db, range(1, 100))
+    hundred_rows = await count_list_queries(client, url, auth_headers)
+
+    assert hundred_rows == one_row
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.scheduler import (
+    CORRECT_GRADE, INCORRECT_GRADE, MIN_EASE, RELEARN_STEP, ReviewState, grade_for, schedule)
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+@pytest.mark.parametrize("grade, ease", [
+    (2, 2.18),
+    (1, 1.96),
+    (0, 1.7),
+])
+def test_failed_answer_resets_repetitions(grade, ease):
+    state = ReviewState(ease_factor=2.5, interval_days=15.0, repetitions=4, lapses=1)
+    after = schedule(state, grade, NOW)
+    assert after.repetitions == 0
+    assert after.interval_days == 0.0
+    assert after.lapses == 2
+    assert after.due_at == NOW + RELEARN_STEP
+    assert after.ease_factor == pytest.approx(ease)
+
+
+@pytest.mark.parametrize("ease, grade, expected", [
+    (2.5, 5, 2.6),
+    (2.5, 4, 2.5),
+    (2.5, 3, 2.36),
+    (1.3, 3, MIN_EASE),
+    (1.4, 0, MIN_EASE),
+    (1.3, 5, 1.4),
+])
+def test_ease_changes_with_grade_and_never_drops_below_floor(ease, grade, expected):
+    after = schedule(ReviewState(ease_factor=ease, interval_days=6.0, repetitions=2), grade, NOW)
+    assert after.ease_factor == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("repetitions, interval, ease, grade, expected", [
+    (0, 0.0, 2.5, 4, 1.0),
+    (1, 1.0, 2.5, 4, 6.0),
+    (2, 6.0, 2.5, 4, 15.0),
+    (3, 15.0, 2.5, 4, 37.5),
+    # Uses the ease before this answer, rounded to hundredths of a day
+    (2, 7.0, 2.36, 3, 16.52),
+    (2, 6.0, 1.3, 3, 7.8),
+    # Shorter intervals count as one day
+    (5, 0.5, 2.0, 4, 2.0),
+])
+def test_interval_progression(repetitions, interval, ease, grade, expected):
+    state = ReviewState(ease_factor=ease, interval_days=interval, repetitions=repetitions)
+    after = schedule(state, grade, NOW)
+    assert after.interval_days == expected
+    assert after.repetitions == repetitions + 1
+    assert after.lapses == 0
+    assert after.due_at == NOW + timedelta(days=expected)
+
+
+def test_consecutive_correct_answers():
+    state, intervals = ReviewState(), []
+    for _ in range(4):
+        state = schedule(state, grade_for(True), NOW)
+        intervals.append(state.interval_days)
+    assert intervals == [1.0, 6.0, 15.0, 37.5]
+
+
+@pytest.mark.parametrize("correct, quality, grade", [
+    (True, None, CORRECT_GRADE),
+    (False, None, INCORRECT_GRADE),
+    # An explicit quality wins over correct
+    (True, 5, 5),
+    (True, 2, 2),
+    (False, 3, 3),
+    (True, 0, 0),
+])
+def test_grade_for(correct, quality, grade):
+    assert grade_for(correct, quality) == grade
+
+
+@pytest.mark.parametrize("correct, repetitions", [(True, 3), (False, 0)])
+def test_correct_answers_pass_and_incorrect_ones_fail(correct, repetitions):
+    state = ReviewState(interval_days=6.0, repetitions=2)
+    after = schedule(state, grade_for(correct), NOW)
+    assert after.repetitions == repetitions
+    # A plain correct answer keeps the ease
+    assert after.ease_factor == pytest.approx(2.5 if correct else 1.96)
@@ -0,0 +1,25 @@
+import pytest
+from fastapi import HTTPException
+
+from app.db.schemas.word import WordRead
+from app.core.serialization import fields_key, parse_fields
+
+
+@pytest.mark.parametrize("fields", [
+    "id,dictionary_entry.text,dictionary_entry.meaning",
+    "dictionary_entry.meaning, id ,dictionary_entry.text",
+    "dictionary_entry.text,id,dictionary_entry.meaning,id",
+])
+def test_fields_key_ignores_order_and_repeats(fields):
+    assert fields_key(parse_fields(fields, WordRead)) == \
+        "dictionary_entry.meaning,dictionary_entry.text,id"
+
+
+def test_fields_key_of_all_fields_is_empty():
+    assert fields_key(parse_fields(None, WordRead)) == ""
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        parse_fields("id,nope", WordRead)
+    assert error.value.status_code == 400
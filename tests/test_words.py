@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models.dictionary import Dictionary
+from app.db.models.profile import Profile
+from app.db.models.word import Word
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def entry_id(db, auth_headers) -> int:
+    with Session(db) as session:
+        entry = Dictionary(text="apple", meaning="a fruit", language="en")
+        session.add(entry)
+        session.commit()
+        return entry.id
+
+
+def words(db) -> int:
+    with Session(db) as session:
+        return session.execute(select(func.count()).select_from(Word)).scalar_one()
+
+
+async def test_create_word_twice_is_rejected(client, auth_headers, db, entry_id):
+    response = await client.post("/words", headers=auth_headers, json={"dictionary_id": entry_id})
+    assert response.status_code == 201, response.text
+
+    response = await client.post("/words", headers=auth_headers, json={"dictionary_id": entry_id})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Word is already in your vocabulary"
+    assert words(db) == 1
+
+
+async def test_create_word_racing_a_concurrent_add_is_rejected(client, auth_headers, db,
+                                                               entry_id):
+    added = []
+
+    def concurrent_add(session, flush_context, instances):
+        # Another request commits the same word between the check and the insert
+        if added:
+            return
+        added.append(True)
+        with Session(db) as other:
+            profile_id = other.execute(select(Profile.id)).scalar_one()
+            other.add(Word(dictionary_id=entry_id, profile_id=profile_id))
+            other.commit()
+
+    event.listen(Session, "before_flush", concurrent_add)
+    try:
+        response = await client.post("/words", headers=auth_headers,
+                                     json={"dictionary_id": entry_id})
+    finally:
+        event.remove(Session, "before_flush", concurrent_add)
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Word is already in your vocabulary"
+    assert words(db) == 1